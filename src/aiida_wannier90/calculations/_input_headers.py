@@ -0,0 +1,197 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Check the headers of the input matrices of Wannier90 against the input parameters."""
+from collections import OrderedDict
+import os
+
+from aiida.common.escaping import escape_for_bash
+
+__all__ = ("get_input_headers", "get_header_mismatches")
+
+# Number of bytes read from the beginning and the end of the input files: enough for
+# the header of the `.amn`/`.mmn` files, the last line of the `.eig` file and the
+# first blocks of the `.nnkp` file.
+HEADER_BYTES = 4096
+# Maximum number of headers kept in `_HEADER_CACHE`
+HEADER_CACHE_SIZE = 1024
+
+# Headers already parsed, by checksum of the file (or by size and modification
+# time for remote files, that cannot be hashed without reading them whole).
+_HEADER_CACHE = OrderedDict()
+
+# The suffixes of the files that are checked, and whether the end of the file is needed
+_HEADER_SUFFIXES = {".amn": False, ".mmn": False, ".eig": True, ".nnkp": False}
+
+
+def _parse_header(suffix, head, tail):
+    """Return the dimensions found in the beginning (and end) of an input file.
+
+    :param suffix: the suffix of the file, one of the keys of ``_HEADER_SUFFIXES``.
+    :param head: the first bytes of the file.
+    :param tail: the last bytes of the file, for the suffixes that need them.
+    :return: a dictionary with (some of) the keys ``num_bands``, ``num_kpts``,
+        ``num_proj`` and ``nntot``.
+    :raise ValueError, IndexError: if the dimensions cannot be parsed.
+    """
+    lines = head.decode("utf-8", errors="replace").splitlines()
+    if suffix in (".amn", ".mmn"):
+        # A comment line, and `num_bands num_kpts num_wann` (`nntot` for the .mmn file)
+        num_bands, num_kpts, last = (int(value) for value in lines[1].split()[:3])
+        # The .amn file has one column per projection, that can be more than num_wann
+        # with `select_projections`
+        key = "num_proj" if suffix == ".amn" else "nntot"
+        return {"num_bands": num_bands, "num_kpts": num_kpts, key: last}
+    if suffix == ".eig":
+        # The last line is `num_bands num_kpts energy`
+        last_line = tail.decode("utf-8", errors="replace").splitlines()[-1]
+        num_bands, num_kpts = (int(value) for value in last_line.split()[:2])
+        return {"num_bands": num_bands, "num_kpts": num_kpts}
+    # .nnkp: the number of k-points is the first line of the `kpoints` block
+    words = [line.split() for line in lines]
+    for index, line in enumerate(words[:-1]):
+        if [word.lower() for word in line] == ["begin", "kpoints"]:
+            return {"num_kpts": int(words[index + 1][0])}
+    raise ValueError("No kpoints block found in the first bytes of the file")
+
+
+def _cached_header(key, suffix, read_head_tail):
+    """Return the header of a file from the cache, or parse it and add it to the cache.
+
+    :param key: a key identifying the content of the file.
+    :param suffix: the suffix of the file.
+    :param read_head_tail: a function returning the first and last bytes of the file.
+    """
+    if key in _HEADER_CACHE:
+        _HEADER_CACHE.move_to_end(key)
+        return _HEADER_CACHE[key]
+    header = _parse_header(suffix, *read_head_tail())
+    _HEADER_CACHE[key] = header
+    if len(_HEADER_CACHE) > HEADER_CACHE_SIZE:
+        _HEADER_CACHE.popitem(last=False)
+    return header
+
+
+def _skip_header(logger, filename, exception):
+    """Log that the header of a file could not be read, so that it is not checked."""
+    if logger is not None:
+        logger.warning(
+            "Could not check the header of the input file %s: %s", filename, exception
+        )
+
+
+def _get_local_headers(folder, seedname, logger=None):
+    """Return the headers of the input files in a ``FolderData``."""
+    filenames = folder.base.repository.list_object_names()
+    headers = {}
+    for suffix, needs_tail in _HEADER_SUFFIXES.items():
+        filename = seedname + suffix
+        if filename not in filenames:
+            continue
+
+        def read_head_tail(filename=filename, needs_tail=needs_tail):
+            with folder.base.repository.open(filename, "rb") as handle:
+                head = handle.read(HEADER_BYTES)
+                if not needs_tail:
+                    return head, b""
+                handle.seek(0, os.SEEK_END)
+                handle.seek(max(handle.tell() - HEADER_BYTES, 0))
+                return head, handle.read()
+
+        key = ("local", folder.base.repository.get_object(filename).key)
+        try:
+            headers[suffix] = _cached_header(key, suffix, read_head_tail)
+        except (ValueError, IndexError, OSError) as exception:
+            _skip_header(logger, filename, exception)
+    return headers
+
+
+def _get_remote_headers(remote_folder, seedname, logger=None):
+    """Return the headers of the input files in a ``RemoteData``, reading them through the transport."""
+    with remote_folder.get_authinfo().get_transport() as transport:
+        headers = {}
+        for suffix, needs_tail in _HEADER_SUFFIXES.items():
+            path = os.path.join(remote_folder.get_remote_path(), seedname + suffix)
+            if not transport.isfile(path):
+                continue
+
+            def read_head_tail(path=path, needs_tail=needs_tail):
+                commands = [f"head -c {HEADER_BYTES} {escape_for_bash(path)}"]
+                if needs_tail:
+                    commands.append(f"tail -c {HEADER_BYTES} {escape_for_bash(path)}")
+                outputs = []
+                for command in commands:
+                    retval, stdout, stderr = transport.exec_command_wait_bytes(command)
+                    if retval != 0:
+                        raise ValueError(
+                            f"Could not read {path}: {stderr.decode(errors='replace')}"
+                        )
+                    outputs.append(stdout)
+                return outputs[0], outputs[1] if needs_tail else b""
+
+            try:
+                attributes = transport.get_attribute(path)
+                key = (
+                    "remote",
+                    remote_folder.computer.uuid,
+                    path,
+                    attributes.st_size,
+                    attributes.st_mtime,
+                )
+                headers[suffix] = _cached_header(key, suffix, read_head_tail)
+            except (ValueError, IndexError, OSError) as exception:
+                _skip_header(logger, path, exception)
+    return headers
+
+
+def get_input_headers(seedname, local_folder=None, remote_folder=None, logger=None):
+    """Return the dimensions in the headers of the ``.amn``, ``.mmn``, ``.eig`` and ``.nnkp`` files.
+
+    Only the first (and, for the ``.eig`` file, the last) ``HEADER_BYTES`` of each file
+    are read, and the results are cached by the checksum of the file. The files whose
+    header cannot be read or parsed are skipped, and reported to the ``logger``.
+
+    :param seedname: the seedname of the files.
+    :param local_folder: a ``FolderData`` with the files.
+    :param remote_folder: a ``RemoteData`` with the files, read through its transport.
+    :param logger: a logger to report the files that are skipped.
+    :return: a dictionary with the dimensions of the files that are present, by suffix.
+    :raise OSError: if the transport to the ``remote_folder`` cannot be opened.
+    """
+    if local_folder is not None:
+        return _get_local_headers(local_folder, seedname, logger)
+    if remote_folder is not None:
+        return _get_remote_headers(remote_folder, seedname, logger)
+    return {}
+
+
+def get_header_mismatches(headers, expected):
+    """Return the list of the dimensions in the headers that differ from the expected ones.
+
+    :param headers: the headers returned by ``get_input_headers``.
+    :param expected: a dictionary with the expected dimensions (the keys of the headers),
+        and optionally the ``mp_grid``, whose product must be the number of k-points;
+        dimensions that are missing or ``None`` are not checked.
+    :return: a list of strings describing the mismatches.
+    """
+    mismatches = []
+    for suffix, header in headers.items():
+        for name, value in header.items():
+            if expected.get(name) is not None and value != expected[name]:
+                mismatches.append(
+                    f"{name} is {expected[name]} in the inputs, but {value} in the {suffix} file"
+                )
+        mp_grid = expected.get("mp_grid")
+        if mp_grid is not None and "num_kpts" in header:
+            num_kpts = mp_grid[0] * mp_grid[1] * mp_grid[2]
+            if num_kpts != header["num_kpts"]:
+                mismatches.append(
+                    f"mp_grid {list(mp_grid)} has {num_kpts} k-points, "
+                    f"but the {suffix} file has {header['num_kpts']}"
+                )
+    return mismatches
@@ -12,18 +12,32 @@ from .wannier90 import _InputFileLists, _InputFileSpec
 
 __all__ = ("Postw90Calculation",)
 
+# The layouts of the BoltzWann output arrays, that can be chosen with the
+# `boltzwann_layout` of the `parser_options` settings
+BOLTZWANN_LAYOUTS = ("flat", "tensor")
+
 
 def validate_inputs(  # pylint: disable=inconsistent-return-statements,unused-argument
     inputs, ctx=None
 ):
     """Validate the inputs of the entire input namespace."""
     if "settings" in inputs:
-        pp_setup = inputs["settings"].get_dict().pop("postproc_setup", False)
+        settings = inputs["settings"].get_dict()
     else:
-        pp_setup = False
-    if pp_setup:
+        settings = {}
+    if settings.get("postproc_setup", False):
         return "Can not run postw90.x with the 'postproc_setup' option."
 
+    parser_options = settings.get("parser_options", {})
+    layout = parser_options.get("boltzwann_layout", "flat")
+    if layout not in BOLTZWANN_LAYOUTS:
+        return (
+            f"Invalid `boltzwann_layout` '{layout}', must be one of {BOLTZWANN_LAYOUTS}"
+        )
+    num_workers = parser_options.get("boltzwann_workers", 1)
+    if not isinstance(num_workers, int) or num_workers < 1:
+        return f"Invalid `boltzwann_workers` {num_workers}, must be a positive integer"
+
     # Check bands_plot and kpoint_path, bands_kpoints
     bands_plot = inputs["parameters"].get_dict().get("bands_plot", False)
     if bands_plot:
@@ -90,6 +104,13 @@ class Postw90Calculation(CalcJob):
         "_seebeck.dat",
         "_sigmas.dat",
         "_tdf.dat",
+        # berry and gyrotropic related files
+        "-ahc-fermiscan.dat",
+        "-morb-fermiscan.dat",
+        "-kubo_*.dat",
+        "-jdos.dat",
+        "-shc-*.dat",
+        "-gyrotropic-*.dat",
     )
 
     @classmethod
@@ -207,6 +228,47 @@ class Postw90Calculation(CalcJob):
             help="The tdf by postw90.x BoltzWann module (if any).",
         )
 
+        spec.output(
+            "berry.ahc",
+            valid_type=orm.ArrayData,
+            required=False,
+            help="The anomalous Hall conductivity vs. Fermi energy by postw90.x berry module (if any).",
+        )
+        spec.output(
+            "berry.morb",
+            valid_type=orm.ArrayData,
+            required=False,
+            help="The orbital magnetisation vs. Fermi energy by postw90.x berry module (if any).",
+        )
+        spec.output(
+            "berry.kubo",
+            valid_type=orm.ArrayData,
+            required=False,
+            help="The optical conductivity (and joint DOS) by postw90.x berry module (if any).",
+        )
+        spec.output(
+            "berry.shc_fermiscan",
+            valid_type=orm.ArrayData,
+            required=False,
+            help="The spin Hall conductivity vs. Fermi energy by postw90.x berry module (if any).",
+        )
+        spec.output(
+            "berry.shc_freqscan",
+            valid_type=orm.ArrayData,
+            required=False,
+            help="The spin Hall conductivity vs. frequency by postw90.x berry module (if any).",
+        )
+        spec.output_namespace(
+            "gyrotropic",
+            valid_type=orm.ArrayData,
+            required=False,
+            dynamic=True,
+            help=(
+                "The tensors by postw90.x gyrotropic module (if any), with the link labels "
+                "of the quantities in the file names, e.g. `D`, `K_orb`, `NOA_spin`."
+            ),
+        )
+
         spec.input(
             "metadata.options.input_filename",
             valid_type=str,
@@ -383,6 +445,7 @@ class Postw90Calculation(CalcJob):
 
         # pop input keys not used here
         settings_dict.pop("seedname", None)
+        settings_dict.pop("parser_options", None)
         if settings_dict:
             raise exceptions.InputValidationError(
                 f"The following keys in settings are unrecognized: {list(settings_dict.keys())}"
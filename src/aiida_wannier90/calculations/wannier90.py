@@ -15,6 +15,7 @@ from aiida.common import datastructures
 from aiida.common import exceptions as exc
 from aiida.engine import CalcJob
 from aiida.orm import (
+    ArrayData,
     BandsData,
     Dict,
     FolderData,
@@ -27,6 +28,7 @@ from aiida.orm import (
 )
 
 from ..io import write_win
+from ._input_headers import get_header_mismatches, get_input_headers
 
 __all__ = ("Wannier90Calculation",)
 
@@ -108,6 +110,9 @@ class Wannier90Calculation(CalcJob):
         ".bxsf",
         "_w.xsf",
         "_w.cube",
+        # Plots of the Wannier functions, `{seedname}_{index:05d}.xsf/.cube`
+        "_[0-9]*.xsf",
+        "_[0-9]*.cube",
         "_centres.xyz",
         "_hr.dat",
         "_tb.dat",
@@ -205,12 +210,130 @@ class Wannier90Calculation(CalcJob):
             required=False,
             help="The interpolated band structure by Wannier90 (if any).",
         )
+        spec.output(
+            "band_projections",
+            valid_type=ArrayData,
+            required=False,
+            help=(
+                "The projections of the interpolated bands onto the Wannier functions in "
+                "`bands_plot_project`, parsed from the `_band_proj.dat` file."
+            ),
+        )
         spec.output(
             "nnkp_file",
             valid_type=SinglefileData,
             required=False,
             help="The ``.nnkp`` file, produced only in -pp (postproc) mode.",
         )
+        spec.output(
+            "nnkp",
+            valid_type=ArrayData,
+            required=False,
+            help=(
+                "The blocks of the ``.nnkp`` file (lattices, k-points, projections, `nnkpts` "
+                "and `exclude_bands`) as arrays, produced only in -pp (postproc) mode."
+            ),
+        )
+        spec.output(
+            "real_space_hamiltonian",
+            valid_type=ArrayData,
+            required=False,
+            help=(
+                "The real-space Hamiltonian parsed from the `_hr.dat` file, with the arrays "
+                "`r_vectors`, `degeneracies` and `hamiltonian`."
+            ),
+        )
+        spec.output(
+            "tight_binding",
+            valid_type=ArrayData,
+            required=False,
+            help=(
+                "The tight-binding model parsed from the `_tb.dat` file, with the arrays "
+                "`lattice`, `r_vectors`, `degeneracies`, `hamiltonian` and `position`."
+            ),
+        )
+        spec.output(
+            "ws_vectors",
+            valid_type=ArrayData,
+            required=False,
+            help=(
+                "The Wigner-Seitz shifts parsed from the `_wsvec.dat` file, with the arrays "
+                "`r_vectors`, `wf_indices`, `multiplicities` and `shifts`."
+            ),
+        )
+        spec.output(
+            "u_matrix",
+            valid_type=ArrayData,
+            required=False,
+            help=(
+                "The gauge matrices parsed from the `_u.mat` file, with the arrays "
+                "`kpoints` and `u_matrix` (nk x num_wann x num_wann)."
+            ),
+        )
+        spec.output(
+            "u_dis_matrix",
+            valid_type=ArrayData,
+            required=False,
+            help=(
+                "The disentanglement matrices parsed from the `_u_dis.mat` file, with the arrays "
+                "`kpoints` and `u_matrix` (nk x num_bands x num_wann)."
+            ),
+        )
+        spec.output(
+            "wannier_centres",
+            valid_type=ArrayData,
+            required=False,
+            help=(
+                "The centres of the Wannier functions and the atomic positions parsed from "
+                "the `_centres.xyz` file, in the arrays `centres` and `atom_positions`."
+            ),
+        )
+        spec.output(
+            "fermi_surface",
+            valid_type=ArrayData,
+            required=False,
+            help=(
+                "The band energies on the Fermi-surface grid parsed from the `.bxsf` file, "
+                "with the arrays `energies`, `origin`, `reciprocal_vectors` and `fermi_energy`."
+            ),
+        )
+        spec.output_namespace(
+            "wannier_plots",
+            valid_type=ArrayData,
+            required=False,
+            dynamic=True,
+            help=(
+                "The plots of the Wannier functions parsed from the `.xsf` or `.cube` files, "
+                "with link labels `wf_00001`, `wf_00002`, ..."
+            ),
+        )
+        spec.output(
+            "checkpoint",
+            valid_type=ArrayData,
+            required=False,
+            help=(
+                "The gauge matrices, lattice, k-points, centres and spreads parsed from the "
+                "`.chk` file, produced only if `retrieve_checkpoint` is set in the settings."
+            ),
+        )
+        spec.output(
+            "convergence",
+            valid_type=ArrayData,
+            required=False,
+            help=(
+                "The iterations of the disentanglement and of the wannierisation, "
+                "as printed in the `<-- DIS` and `<-- CONV` lines of the output."
+            ),
+        )
+        spec.output(
+            "wannier_functions",
+            valid_type=ArrayData,
+            required=False,
+            help=(
+                "The initial and final centres, spreads and Im/Re ratios of the Wannier functions, "
+                "produced only if `wannier_functions_as_array` is set in the `parser_options` settings."
+            ),
+        )
         spec.default_output_node = "output_parameters"
 
         spec.input(
@@ -345,6 +468,15 @@ class Wannier90Calculation(CalcJob):
         ############################################################
         random_projections = settings_dict.pop("random_projections", False)
 
+        check_input_headers = settings_dict.pop("check_input_headers", True)
+        check_remote_input_headers = settings_dict.pop(
+            "check_remote_input_headers", False
+        )
+        if has_remote_input:
+            check_input_headers = check_input_headers and check_remote_input_headers
+        if check_input_headers and not pp_setup:
+            self._check_input_headers(param_dict)
+
         write_win(
             filename=folder.get_abs_path(f"{self._SEEDNAME}.win"),
             parameters=param_dict,
@@ -393,11 +525,27 @@ class Wannier90Calculation(CalcJob):
             )
         ]
 
-        calcinfo.retrieve_list = retrieve_list
-        calcinfo.retrieve_temporary_list = []
+        # Files that are only parsed into output nodes, and then discarded
+        temporary_retrieve_list = settings_dict.pop("temporary_retrieve_list", [])
+        calcinfo.retrieve_list = [
+            filename
+            for filename in retrieve_list
+            if not any(
+                fnmatch.fnmatch(filename, pattern)
+                for pattern in temporary_retrieve_list
+            )
+        ]
+        calcinfo.retrieve_temporary_list = [
+            filename
+            for filename in retrieve_list
+            if filename not in calcinfo.retrieve_list
+        ]
         if pp_setup:
             # The parser will then put this in a SinglefileData (if present)
             calcinfo.retrieve_temporary_list.append(f"{self._SEEDNAME}.nnkp")
+        if settings_dict.pop("retrieve_checkpoint", False):
+            # The parser will then put its arrays in an ArrayData (if present)
+            calcinfo.retrieve_temporary_list.append(f"{self._SEEDNAME}.chk")
 
         # Retrieves bands automatically, if they are calculated
 
@@ -405,6 +553,7 @@ class Wannier90Calculation(CalcJob):
 
         # pop input keys not used here
         settings_dict.pop("seedname", None)
+        settings_dict.pop("parser_options", None)
         if settings_dict:
             raise exc.InputValidationError(
                 f"The following keys in settings are unrecognized: {list(settings_dict.keys())}"
@@ -473,6 +622,56 @@ class Wannier90Calculation(CalcJob):
                 f'The following blocked keys were found in the parameters: {", ".join(existing_blocked_keys)}'
             )
 
+    def _check_input_headers(self, parameters):
+        """Check the headers of the input matrices against the parameters and the k-points.
+
+        Only the first bytes of the ``.amn``, ``.mmn``, ``.eig`` and ``.nnkp`` files in the
+        ``local_input_folder`` or ``remote_input_folder`` are read, so that a calculation
+        with inconsistent inputs fails before being submitted. The files whose header
+        cannot be read are not checked.
+
+        :param parameters: a dictionary with the input parameters
+        :raises InputValidationError: if the dimensions in the headers do not match
+        """
+        try:
+            headers = get_input_headers(
+                self._SEEDNAME,
+                local_folder=self.inputs.get("local_input_folder"),
+                remote_folder=self.inputs.get("remote_input_folder"),
+                logger=self.logger,
+            )
+        except OSError as exception:
+            self.logger.warning(
+                "Could not check the headers of the input files: %s", exception
+            )
+            return
+
+        kpoints = self.inputs.kpoints
+        try:
+            mp_grid = kpoints.get_kpoints_mesh()[0]
+            num_kpts = len(kpoints.get_kpoints_mesh(print_list=True))
+        except AttributeError:
+            mp_grid = None
+            num_kpts = len(kpoints.get_kpoints())
+        mp_grid = parameters.get("mp_grid", mp_grid)
+        if isinstance(mp_grid, str):
+            mp_grid = [int(value) for value in mp_grid.split()]
+        num_wann = parameters.get("num_wann")
+        expected = {
+            "num_bands": parameters.get("num_bands", num_wann),
+            "num_kpts": num_kpts,
+            "mp_grid": mp_grid,
+        }
+        if "select_projections" not in parameters:
+            expected["num_proj"] = num_wann
+
+        mismatches = get_header_mismatches(headers, expected)
+        if mismatches:
+            raise exc.InputValidationError(
+                "The input files are inconsistent with the inputs: "
+                + "; ".join(mismatches)
+            )
+
     def _get_input_file_lists(self, pp_setup):
         """Generate the lists of files to copy and link from the 'local_input_folder' and 'remote_input_folder'."""
         if pp_setup:
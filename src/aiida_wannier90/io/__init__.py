@@ -6,11 +6,40 @@
 # The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
 # For further information on the license, see the LICENSE.txt file             #
 ################################################################################
-"""Writing input files.
+"""Writing input files and reading output files.
 
-This submodule contains helper functions to create input files.
+This submodule contains helper functions to create input files,
+and to read the input and output files of Wannier90 into numpy arrays.
 """
 
-from ._write_win import write_win
+from ._read_amn_mmn import iter_amn, iter_mmn
+from ._read_bxsf import read_bxsf
+from ._read_centres_xyz import read_centres_xyz
+from ._read_chk import read_chk
+from ._read_eig import read_eig
+from ._read_hr import read_hr
+from ._read_nnkp import read_nnkp
+from ._read_tb import read_tb
+from ._read_u_mat import read_u_mat
+from ._read_volumetric import read_cube, read_xsf
+from ._read_wsvec import read_wsvec
+from ._write_win import clear_win_block_cache, win_block_cache_info, write_win
 
-__all__ = ("write_win",)
+__all__ = (
+    "write_win",
+    "win_block_cache_info",
+    "clear_win_block_cache",
+    "iter_amn",
+    "iter_mmn",
+    "read_bxsf",
+    "read_centres_xyz",
+    "read_chk",
+    "read_cube",
+    "read_eig",
+    "read_hr",
+    "read_nnkp",
+    "read_tb",
+    "read_u_mat",
+    "read_wsvec",
+    "read_xsf",
+)
@@ -0,0 +1,88 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Read the overlap (``.mmn``) and projection (``.amn``) matrices, one k-point at a time."""
+import numpy as np
+
+from ._read_utils import read_lines_numbers
+
+__all__ = ("iter_amn", "iter_mmn")
+
+
+def _read_header(handle):
+    """Skip the comment line and return the three integers of the header line."""
+    handle.readline()
+    header = read_lines_numbers(handle, 1, dtype=int)
+    if len(header) != 3:
+        raise ValueError(f"Invalid header line: {header}")
+    return (int(value) for value in header)
+
+
+def _read_block(handle, num_lines, num_values):
+    """Read the numbers in the next ``num_lines`` lines, checking that they are ``num_values``."""
+    values = read_lines_numbers(handle, num_lines)
+    if len(values) != num_values:
+        raise ValueError(f"Found {len(values)} values instead of {num_values}")
+    return values
+
+
+def iter_amn(handle, dtype=complex):
+    """Iterate over the projection matrices of a ``.amn`` file, one k-point at a time.
+
+    After a comment line and the line ``num_bands num_kpts num_wann``, the file contains
+    a line ``m n k Re Im`` for each element, with the band index ``m`` running fastest
+    and the k-point index ``k`` slowest. Only the lines of one k-point are read and
+    parsed at a time, so that the memory used is bounded also for very large files.
+
+    :param handle: the ``.amn`` file, opened in text mode.
+    :param dtype: the dtype of the matrices, e.g. ``numpy.complex64`` to halve their size.
+    :return: a generator of the complex projection matrices ``A_mn`` at each k-point,
+        of shape (num_bands x num_wann).
+    :raise ValueError: if the file cannot be parsed.
+    """
+    num_bands, num_kpts, num_wann = _read_header(handle)
+    num_lines = num_bands * num_wann
+    for _ in range(num_kpts):
+        rows = _read_block(handle, num_lines, num_lines * 5).reshape(
+            num_wann, num_bands, 5
+        )
+        matrix = np.empty((num_bands, num_wann), dtype=dtype)
+        matrix.real = rows[:, :, 3].T
+        matrix.imag = rows[:, :, 4].T
+        yield matrix
+
+
+def iter_mmn(handle, dtype=complex):
+    """Iterate over the overlap matrices of a ``.mmn`` file, one k-point at a time.
+
+    After a comment line and the line ``num_bands num_kpts nntot``, the file contains,
+    for each k-point and each of its ``nntot`` neighbours, a line ``k kb G1 G2 G3``
+    followed by a line ``Re Im`` for each element of the overlap matrix, in column-major
+    order. Only the lines of one k-point are read and parsed at a time, so that the
+    memory used is bounded also for multi-GB files.
+
+    :param handle: the ``.mmn`` file, opened in text mode.
+    :param dtype: the dtype of the matrices, e.g. ``numpy.complex64`` to halve their size.
+    :return: a generator of tuples ``(neighbours, overlaps)`` for each k-point, where
+        ``neighbours`` (nntot x 4) contains the 1-based index of each neighbour ``kb``
+        and the reciprocal lattice vector ``G`` to add to it, and ``overlaps``
+        (nntot x num_bands x num_bands) the complex matrices ``M_mn = <u_mk|u_nk+b>``.
+    :raise ValueError: if the file cannot be parsed.
+    """
+    num_bands, num_kpts, nntot = _read_header(handle)
+    row_size = 5 + 2 * num_bands**2
+    for _ in range(num_kpts):
+        rows = _read_block(
+            handle, nntot * (1 + num_bands**2), nntot * row_size
+        ).reshape(nntot, row_size)
+        # The row index `m` runs fastest
+        values = rows[:, 5:].reshape(nntot, num_bands, num_bands, 2)
+        overlaps = np.empty((nntot, num_bands, num_bands), dtype=dtype)
+        overlaps.real = values[..., 0].transpose(0, 2, 1)
+        overlaps.imag = values[..., 1].transpose(0, 2, 1)
+        yield rows[:, 1:5].astype(int), overlaps
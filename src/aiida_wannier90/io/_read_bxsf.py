@@ -0,0 +1,65 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Read the Fermi-surface grid from a ``.bxsf`` file."""
+import numpy as np
+
+from ._read_utils import read_lines_numbers, read_next_numbers
+
+__all__ = ("read_bxsf",)
+
+
+def read_bxsf(handle, dtype=float):
+    """Read the band energies on a grid of k-points from a ``.bxsf`` file.
+
+    The file is in the XCrySDen band-grid format: after an info block with the Fermi
+    energy, the ``BEGIN_BANDGRID_3D`` block contains the number of bands, the number of
+    grid points along each direction, the origin, the three spanning reciprocal
+    vectors and then, for each band, a ``BAND:`` line followed by its energies.
+    The bands are read one at a time.
+
+    :param handle: the ``.bxsf`` file, opened in text mode.
+    :param dtype: the dtype of the array of energies, e.g. ``numpy.float32``
+        to halve its size.
+    :return: a dictionary with the numpy arrays ``fermi_energy`` (a scalar, in eV),
+        ``origin`` (3), ``reciprocal_vectors`` (3 x 3, one vector per row, in inverse
+        angstrom) and ``energies`` (num_bands x n1 x n2 x n3, in eV). The grid is a
+        general grid, i.e. it includes the k-points on both sides of the cell.
+    :raise ValueError: if the file cannot be parsed.
+    """
+    fermi_energy = None
+    for line in handle:
+        if "Fermi Energy:" in line:
+            fermi_energy = float(line.split(":")[1])
+        if line.strip().startswith("BEGIN_BANDGRID_3D"):
+            break
+    else:
+        raise ValueError("No BEGIN_BANDGRID_3D block found")
+    if fermi_energy is None:
+        raise ValueError("No Fermi energy found")
+
+    num_bands = int(handle.readline())
+    grid = read_lines_numbers(handle, 1, dtype=int)
+    if len(grid) != 3:
+        raise ValueError(f"Invalid grid dimensions: {grid}")
+    vectors = read_lines_numbers(handle, 4).reshape(4, 3)
+
+    num_points = int(np.prod(grid))
+    energies = np.empty((num_bands, num_points), dtype=dtype)
+    for band_idx in range(num_bands):
+        band_line = handle.readline()
+        if not band_line.strip().startswith("BAND:"):
+            raise ValueError(f"Expected a BAND: line, found: {band_line.strip()}")
+        energies[band_idx] = read_next_numbers(handle, num_points, dtype=dtype)
+
+    return {
+        "fermi_energy": np.array(fermi_energy),
+        "origin": vectors[0],
+        "reciprocal_vectors": vectors[1:],
+        "energies": energies.reshape(num_bands, *grid.tolist()),
+    }
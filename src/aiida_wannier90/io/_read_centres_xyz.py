@@ -0,0 +1,40 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Read the centres of the Wannier functions from a ``_centres.xyz`` file."""
+import numpy as np
+
+from ._read_utils import parse_numbers
+
+__all__ = ("read_centres_xyz",)
+
+
+def read_centres_xyz(handle):
+    """Read the centres of the Wannier functions from a ``_centres.xyz`` file.
+
+    The file is in the XYZ format: the number of lines, a comment line, and then
+    a line ``X x y z`` for each Wannier function followed by a line ``symbol x y z``
+    for each atom.
+
+    :param handle: the ``_centres.xyz`` file, opened in text mode.
+    :return: a dictionary with the numpy arrays ``centres`` (num_wann x 3) and
+        ``atom_positions`` (num_atoms x 3), with cartesian coordinates in angstrom.
+    :raise ValueError: if the file cannot be parsed.
+    """
+    num_lines = int(handle.readline())
+    handle.readline()
+    lines = [handle.readline() for _ in range(num_lines)]
+    labels = np.array([line.split(None, 1)[0] for line in lines])
+    positions = parse_numbers(
+        "\n".join(line.split(None, 1)[1] for line in lines), float
+    ).reshape(num_lines, 3)
+    is_centre = labels == "X"
+    return {
+        "centres": positions[is_centre],
+        "atom_positions": positions[~is_centre],
+    }
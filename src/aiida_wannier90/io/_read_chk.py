@@ -0,0 +1,238 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Read a Wannier90 checkpoint (``.chk``) file."""
+import itertools
+import struct
+
+import numpy as np
+
+from ._read_utils import read_next_numbers
+
+__all__ = ("read_chk",)
+
+
+def read_chk(filepath, formatted=None, read_m_matrix=False):
+    """Read a Wannier90 checkpoint file.
+
+    Both the unformatted ``.chk`` file written by Wannier90 and the formatted
+    ``.chk.fmt`` file written by ``w90chk2chk.x -export`` are supported.
+    For unformatted files, the large matrices are memory-mapped rather than loaded in
+    memory, so only the parts that are accessed are read from disk.
+
+    :param filepath: the path of the checkpoint file.
+    :param formatted: whether the file is formatted; if ``None``, this is decided from
+        the content of the file.
+    :param read_m_matrix: whether to return also the overlap matrices ``m_matrix``, that
+        are usually the largest part of the file.
+    :return: a dictionary with the numpy arrays:
+
+        * ``exclude_bands`` (1-based indices of the excluded bands);
+        * ``real_lattice`` and ``recip_lattice`` (3 x 3, one vector per row);
+        * ``mp_grid`` (3) and ``kpoints`` (nk x 3, in fractional coordinates);
+        * ``u_matrix`` (nk x num_wann x num_wann, complex);
+        * if the disentanglement was performed, ``lwindow`` (nk x num_bands, bool),
+          ``ndimwin`` (nk), ``u_matrix_opt`` (nk x num_bands x num_wann, complex) and
+          ``omega_invariant`` (a scalar);
+        * ``wannier_centres`` (num_wann x 3) and ``wannier_spreads`` (num_wann);
+        * if ``read_m_matrix``, ``m_matrix`` (nk x nntot x num_wann x num_wann, complex);
+
+        and the integers ``num_bands``, ``num_wann``, ``nntot`` and the string ``checkpoint``.
+    :raise ValueError: if the file cannot be parsed.
+    """
+    if formatted is None:
+        with open(filepath, "rb") as handle:
+            formatted = _is_formatted(handle.read(4))
+    if formatted:
+        with open(filepath, encoding="utf-8") as handle:
+            return _read_chk_formatted(handle, read_m_matrix)
+    return _read_chk_unformatted(filepath, read_m_matrix)
+
+
+def _is_formatted(first_bytes):
+    """Guess whether the file is formatted, from its first bytes.
+
+    An unformatted file starts with the 4-byte length of the header record, i.e. 33.
+    """
+    return len(first_bytes) < 4 or struct.unpack("<i", first_bytes)[0] != 33
+
+
+def _complex_matrices(values, shape):
+    """Reshape the complex values of Fortran matrices, returning the k-point index first.
+
+    E.g. the values of ``u_matrix(i, j, nkp)`` are returned with shape ``(nk, i, j)``.
+
+    :param values: the complex values, in Fortran order
+    :param shape: the shape of the Fortran array, with the matrix indices first
+        and the k-point index last
+    """
+    return np.swapaxes(values.reshape(shape[::-1]), -1, -2)
+
+
+def _read_chk_formatted(handle, read_m_matrix):  # pylint: disable=too-many-locals
+    """Read a formatted checkpoint file, written by ``w90chk2chk.x -export``."""
+
+    def read_int():
+        return int(handle.readline())
+
+    def read_values(num_values, dtype=float):
+        return read_next_numbers(handle, num_values, dtype=dtype)
+
+    def read_complex(num_values):
+        values = read_values(2 * num_values)
+        return values[0::2] + 1j * values[1::2]
+
+    handle.readline()
+    num_bands = read_int()
+    exclude_bands = read_values(read_int(), dtype=int)
+    out = {
+        "num_bands": num_bands,
+        "exclude_bands": exclude_bands,
+        "real_lattice": read_values(9).reshape(3, 3).T,
+        "recip_lattice": read_values(9).reshape(3, 3).T,
+    }
+    num_kpts = read_int()
+    out["mp_grid"] = read_values(3, dtype=int)
+    out["kpoints"] = read_values(3 * num_kpts).reshape(num_kpts, 3)
+    nntot = out["nntot"] = read_int()
+    num_wann = out["num_wann"] = read_int()
+    out["checkpoint"] = handle.readline().strip()
+
+    if read_int():
+        out["omega_invariant"] = np.array(read_values(1)[0])
+        out["lwindow"] = (
+            read_values(num_bands * num_kpts, dtype=int)
+            .reshape(num_kpts, num_bands)
+            .astype(bool)
+        )
+        out["ndimwin"] = read_values(num_kpts, dtype=int)
+        out["u_matrix_opt"] = _complex_matrices(
+            read_complex(num_bands * num_wann * num_kpts),
+            (num_bands, num_wann, num_kpts),
+        )
+
+    out["u_matrix"] = _complex_matrices(
+        read_complex(num_wann * num_wann * num_kpts), (num_wann, num_wann, num_kpts)
+    )
+    num_m_values = num_wann * num_wann * nntot * num_kpts
+    if read_m_matrix:
+        out["m_matrix"] = _complex_matrices(
+            read_complex(num_m_values), (num_wann, num_wann, nntot, num_kpts)
+        )
+    else:
+        # One line per complex value
+        for _ in itertools.islice(handle, num_m_values):
+            pass
+
+    out["wannier_centres"] = read_values(3 * num_wann).reshape(num_wann, 3)
+    out["wannier_spreads"] = read_values(num_wann)
+    return out
+
+
+class _UnformattedFile:
+    """Reader of the records of a Fortran sequential unformatted file."""
+
+    def __init__(self, filepath, handle):
+        self.filepath = filepath
+        self.handle = handle
+
+    def _record_segments(self):
+        """Return the (offset, length) of the segments of the next record, and skip it.
+
+        Records longer than 2 GiB are split by gfortran into subrecords, where a negative
+        leading marker means that the record continues in the next subrecord.
+        """
+        segments = []
+        while True:
+            marker = self.handle.read(4)
+            if len(marker) < 4:
+                raise ValueError("Unexpected end of the file")
+            (length,) = struct.unpack("<i", marker)
+            segments.append((self.handle.tell(), abs(length)))
+            self.handle.seek(abs(length) + 4, 1)
+            if length >= 0:
+                return segments
+
+    def read(self, dtype):
+        """Read the next record into memory, as an array of the given dtype."""
+        data = b""
+        for offset, length in self._record_segments():
+            end = self.handle.tell()
+            self.handle.seek(offset)
+            data += self.handle.read(length)
+            self.handle.seek(end)
+        return np.frombuffer(data, dtype=dtype)
+
+    def map(self, dtype):
+        """Memory-map the next record as an array of the given dtype, if it has no subrecords."""
+        segments = self._record_segments()
+        if len(segments) > 1:
+            end = self.handle.tell()
+            self.handle.seek(segments[0][0] - 4)
+            array = self.read(dtype)
+            self.handle.seek(end)
+            return array
+        offset, length = segments[0]
+        return np.memmap(
+            self.filepath,
+            dtype=dtype,
+            mode="r",
+            offset=offset,
+            shape=(length // np.dtype(dtype).itemsize,),
+        )
+
+    def skip(self):
+        """Skip the next record."""
+        self._record_segments()
+
+
+def _read_chk_unformatted(filepath, read_m_matrix):  # pylint: disable=too-many-locals
+    """Read an unformatted checkpoint file, as written by Wannier90."""
+    int_type, float_type, complex_type = "<i4", "<f8", "<c16"
+
+    with open(filepath, "rb") as handle:
+        records = _UnformattedFile(filepath, handle)
+        records.skip()  # header
+        num_bands = int(records.read(int_type)[0])
+        records.skip()  # num_exclude_bands
+        out = {
+            "num_bands": num_bands,
+            "exclude_bands": records.read(int_type).astype(int),
+            "real_lattice": records.read(float_type).reshape(3, 3).T,
+            "recip_lattice": records.read(float_type).reshape(3, 3).T,
+        }
+        num_kpts = int(records.read(int_type)[0])
+        out["mp_grid"] = records.read(int_type).astype(int)
+        out["kpoints"] = records.read(float_type).reshape(num_kpts, 3)
+        nntot = out["nntot"] = int(records.read(int_type)[0])
+        num_wann = out["num_wann"] = int(records.read(int_type)[0])
+        out["checkpoint"] = records.read("S20")[0].decode().strip()
+
+        if records.read(int_type)[0]:
+            out["omega_invariant"] = np.array(records.read(float_type)[0])
+            out["lwindow"] = (
+                records.read(int_type).reshape(num_kpts, num_bands).astype(bool)
+            )
+            out["ndimwin"] = records.read(int_type).astype(int)
+            out["u_matrix_opt"] = _complex_matrices(
+                records.map(complex_type), (num_bands, num_wann, num_kpts)
+            )
+
+        out["u_matrix"] = _complex_matrices(
+            records.map(complex_type), (num_wann, num_wann, num_kpts)
+        )
+        if read_m_matrix:
+            out["m_matrix"] = _complex_matrices(
+                records.map(complex_type), (num_wann, num_wann, nntot, num_kpts)
+            )
+        else:
+            records.skip()
+
+        out["wannier_centres"] = records.read(float_type).reshape(num_wann, 3)
+        out["wannier_spreads"] = records.read(float_type).copy()
+    return out
@@ -0,0 +1,40 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Read the band energies from a ``.eig`` file."""
+import numpy as np
+
+from ._read_utils import read_numbers
+
+__all__ = ("read_eig",)
+
+
+def read_eig(handle, dtype=float):
+    """Read the band energies at each k-point from a ``.eig`` file.
+
+    The file contains a line ``n k E`` for each band ``n`` and k-point ``k``.
+    The file is read and parsed in chunks, see :func:`~aiida_wannier90.io._read_utils.read_numbers`.
+
+    :param handle: the ``.eig`` file, opened in text mode.
+    :param dtype: the dtype of the returned energies.
+    :return: the numpy array of the energies in eV, of shape (nk x num_bands).
+    :raise ValueError: if the file cannot be parsed, or if some energy is missing.
+    """
+    rows = read_numbers(handle).reshape(-1, 3)
+    if rows.size == 0:
+        return np.empty((0, 0), dtype=dtype)
+    bands = rows[:, 0].astype(int) - 1
+    kpoints = rows[:, 1].astype(int) - 1
+    num_bands, num_kpts = bands.max() + 1, kpoints.max() + 1
+    if len(rows) != num_bands * num_kpts:
+        raise ValueError(
+            f"Found {len(rows)} energies instead of {num_kpts} k-points x {num_bands} bands"
+        )
+    energies = np.empty((num_kpts, num_bands), dtype=dtype)
+    energies[kpoints, bands] = rows[:, 2]
+    return energies
@@ -0,0 +1,55 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Read the real-space Hamiltonian from a ``_hr.dat`` file."""
+import numpy as np
+
+from ._read_utils import read_lines_numbers, read_numbers
+
+__all__ = ("read_hr",)
+
+# Number of degeneracies per line in the header of the _hr.dat file
+_NUM_DEGENERACIES_PER_LINE = 15
+
+
+def read_hr(handle):
+    """Read the real-space Hamiltonian from a ``_hr.dat`` file.
+
+    The file contains a comment line, the number of Wannier functions, the number
+    of R-vectors and their degeneracies, followed by a line
+    ``R1 R2 R3 m n Re(H) Im(H)`` for each matrix element.
+
+    :param handle: the ``_hr.dat`` file, opened in text mode.
+    :return: a dictionary with the numpy arrays ``r_vectors`` (nrpts x 3, in units of
+        the lattice vectors), ``degeneracies`` (nrpts) and the complex ``hamiltonian``
+        (nrpts x num_wann x num_wann, in eV), where ``hamiltonian[i, m, n]`` is the
+        element ``<m, 0|H|n, R_i>``.
+    :raise ValueError: if the file cannot be parsed.
+    """
+    handle.readline()
+    num_wann = int(handle.readline())
+    nrpts = int(handle.readline())
+    degeneracies = read_lines_numbers(
+        handle, -(-nrpts // _NUM_DEGENERACIES_PER_LINE), dtype=int
+    )
+    if len(degeneracies) != nrpts:
+        raise ValueError(f"Found {len(degeneracies)} degeneracies instead of {nrpts}")
+
+    rows = read_numbers(handle, num_values=nrpts * num_wann**2 * 7).reshape(-1, 7)
+    indices = rows[:, :5].astype(int)
+    r_vectors = indices[:: num_wann**2, :3]
+    hamiltonian = np.zeros((nrpts, num_wann, num_wann), dtype=complex)
+    hamiltonian[
+        np.repeat(np.arange(nrpts), num_wann**2), indices[:, 3] - 1, indices[:, 4] - 1
+    ] = (rows[:, 5] + 1j * rows[:, 6])
+
+    return {
+        "r_vectors": r_vectors,
+        "degeneracies": degeneracies,
+        "hamiltonian": hamiltonian,
+    }
@@ -0,0 +1,104 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Read the blocks of a ``.nnkp`` file."""
+import numpy as np
+
+from ._read_utils import parse_numbers
+
+__all__ = ("read_nnkp",)
+
+_BLOCK_NAMES = (
+    "real_lattice",
+    "recip_lattice",
+    "kpoints",
+    "projections",
+    "spinor_projections",
+    "nnkpts",
+    "exclude_bands",
+)
+
+
+def read_nnkp(handle):
+    """Read the blocks of a ``.nnkp`` file, written by ``wannier90 -pp``.
+
+    :param handle: the ``.nnkp`` file, opened in text mode.
+    :return: a dictionary with the numpy arrays of the blocks found in the file:
+
+        * ``real_lattice`` and ``recip_lattice`` (3 x 3, one vector per row, in angstrom
+          and inverse angstrom);
+        * ``kpoints`` (nk x 3, in fractional coordinates);
+        * for the ``projections`` or ``spinor_projections`` block, ``projection_centres``
+          (nproj x 3, fractional), ``projection_l``, ``projection_mr``,
+          ``projection_r`` (nproj), ``projection_zaxis``, ``projection_xaxis`` (nproj x 3)
+          and ``projection_zona`` (nproj); for spinor projections also ``projection_spin``
+          (nproj) and ``projection_spin_axis`` (nproj x 3);
+        * ``nnkpts`` (nk x nntot x 4), where ``nnkpts[ik, inn]`` contains the 1-based
+          index of the neighbour of the k-point ``ik`` and the reciprocal lattice vector
+          ``G`` to add to it;
+        * ``exclude_bands`` (the 1-based indices of the excluded bands).
+
+    :raise ValueError: if the file cannot be parsed.
+    """
+    out = {}
+    for name, text in _iter_blocks(handle):
+        if name not in _BLOCK_NAMES:
+            continue
+        values = parse_numbers(text, float)
+        if name in ("real_lattice", "recip_lattice"):
+            out[name] = values.reshape(3, 3)
+        elif name == "kpoints":
+            out["kpoints"] = values[1:].reshape(int(values[0]), 3)
+        elif name in ("projections", "spinor_projections"):
+            out.update(_get_projections(values, spinor=name == "spinor_projections"))
+        elif name == "nnkpts":
+            nntot = int(values[0])
+            nnkpts = values[1:].astype(int).reshape(-1, nntot, 5)
+            out["nnkpts"] = np.ascontiguousarray(nnkpts[:, :, 1:])
+        elif name == "exclude_bands":
+            out["exclude_bands"] = values[1 : 1 + int(values[0])].astype(int)
+    return out
+
+
+def _iter_blocks(handle):
+    """Yield the name and the content of each ``begin name ... end name`` block."""
+    name = None
+    lines = []
+    for line in handle:
+        words = line.split()
+        if not words:
+            continue
+        if words[0].lower() == "begin":
+            name = words[1].lower()
+            lines = []
+        elif words[0].lower() == "end":
+            if name is not None:
+                yield name, "".join(lines)
+            name = None
+        elif name is not None:
+            lines.append(line)
+
+
+def _get_projections(values, spinor):
+    """Return the arrays of the projections, from the values of the (spinor_)projections block."""
+    num_projections = int(values[0])
+    # centre, l, mr, r, zaxis, xaxis, zona (+ spin, spin_axis for spinors)
+    rows = values[1:].reshape(num_projections, 17 if spinor else 13)
+    out = {
+        "projection_centres": rows[:, 0:3],
+        "projection_l": rows[:, 3].astype(int),
+        "projection_mr": rows[:, 4].astype(int),
+        "projection_r": rows[:, 5].astype(int),
+        "projection_zaxis": rows[:, 6:9],
+        "projection_xaxis": rows[:, 9:12],
+        "projection_zona": rows[:, 12],
+    }
+    if spinor:
+        out["projection_spin"] = rows[:, 13].astype(int)
+        out["projection_spin_axis"] = rows[:, 14:17]
+    return out
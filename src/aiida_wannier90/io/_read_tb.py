@@ -0,0 +1,81 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Read the tight-binding model from a ``_tb.dat`` file."""
+import numpy as np
+
+from ._read_utils import read_lines_numbers, read_numbers
+
+__all__ = ("read_tb",)
+
+# Number of degeneracies per line in the header of the _tb.dat file
+_NUM_DEGENERACIES_PER_LINE = 15
+
+
+def read_tb(handle):
+    """Read the Hamiltonian and the position operator from a ``_tb.dat`` file.
+
+    After a comment line, the file contains the real-space lattice vectors, the number
+    of Wannier functions, the number of R-vectors and their degeneracies. Then, for each
+    R-vector, a line ``R1 R2 R3`` followed by a line ``m n Re(H) Im(H)`` for each matrix
+    element of the Hamiltonian; and finally the same for the position operator, with
+    lines ``m n Re(x) Im(x) Re(y) Im(y) Re(z) Im(z)``.
+
+    :param handle: the ``_tb.dat`` file, opened in text mode.
+    :return: a dictionary with the numpy arrays ``lattice`` (3 x 3, in angstrom, one
+        vector per row), ``r_vectors`` (nrpts x 3, in units of the lattice vectors),
+        ``degeneracies`` (nrpts), the complex ``hamiltonian`` (nrpts x num_wann x num_wann,
+        in eV) and the complex ``position`` (nrpts x num_wann x num_wann x 3, in angstrom),
+        where ``hamiltonian[i, m, n]`` is the element ``<m, 0|H|n, R_i>``.
+    :raise ValueError: if the file cannot be parsed.
+    """
+    handle.readline()
+    lattice = read_lines_numbers(handle, 3).reshape(3, 3)
+    num_wann = int(handle.readline())
+    nrpts = int(handle.readline())
+    degeneracies = read_lines_numbers(
+        handle, -(-nrpts // _NUM_DEGENERACIES_PER_LINE), dtype=int
+    )
+    if len(degeneracies) != nrpts:
+        raise ValueError(f"Found {len(degeneracies)} degeneracies instead of {nrpts}")
+
+    # For each R-vector, its three components followed by the rows of the matrix elements
+    ham_block_size = 3 + num_wann**2 * 4
+    pos_block_size = 3 + num_wann**2 * 8
+    values = read_numbers(handle, num_values=nrpts * (ham_block_size + pos_block_size))
+    ham_blocks = values[: nrpts * ham_block_size].reshape(nrpts, ham_block_size)
+    pos_blocks = values[nrpts * ham_block_size :].reshape(nrpts, pos_block_size)
+    r_vectors = ham_blocks[:, :3].astype(int)
+    if not np.array_equal(r_vectors, pos_blocks[:, :3]):
+        raise ValueError("The R-vectors of the Hamiltonian and positions differ")
+
+    ham_rows = ham_blocks[:, 3:].reshape(nrpts, num_wann**2, 4)
+    pos_rows = pos_blocks[:, 3:].reshape(nrpts, num_wann**2, 8)
+    irpt = np.repeat(np.arange(nrpts), num_wann**2)
+
+    hamiltonian = np.zeros((nrpts, num_wann, num_wann), dtype=complex)
+    m_idx = ham_rows[:, :, 0].astype(int).ravel() - 1
+    n_idx = ham_rows[:, :, 1].astype(int).ravel() - 1
+    hamiltonian[irpt, m_idx, n_idx] = (
+        ham_rows[:, :, 2] + 1j * ham_rows[:, :, 3]
+    ).ravel()
+
+    position = np.zeros((nrpts, num_wann, num_wann, 3), dtype=complex)
+    m_idx = pos_rows[:, :, 0].astype(int).ravel() - 1
+    n_idx = pos_rows[:, :, 1].astype(int).ravel() - 1
+    position[irpt, m_idx, n_idx] = (
+        pos_rows[:, :, 2:8:2] + 1j * pos_rows[:, :, 3:8:2]
+    ).reshape(-1, 3)
+
+    return {
+        "lattice": lattice,
+        "r_vectors": r_vectors,
+        "degeneracies": degeneracies,
+        "hamiltonian": hamiltonian,
+        "position": position,
+    }
@@ -0,0 +1,45 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Read the gauge matrices from a ``_u.mat`` or ``_u_dis.mat`` file."""
+import numpy as np
+
+from ._read_utils import read_lines_numbers, read_numbers
+
+__all__ = ("read_u_mat",)
+
+
+def read_u_mat(handle):
+    """Read the gauge matrices at each k-point from a ``_u.mat`` or ``_u_dis.mat`` file.
+
+    After a comment line, the file contains the number of k-points and the two dimensions
+    of the matrices (``num_wann num_wann`` for ``_u.mat``, ``num_wann num_bands`` for
+    ``_u_dis.mat``). Then, for each k-point, its fractional coordinates followed by a
+    line ``Re Im`` for each element of the matrix, in column-major order.
+
+    :param handle: the ``_u.mat`` or ``_u_dis.mat`` file, opened in text mode.
+    :return: a dictionary with the numpy arrays ``kpoints`` (nk x 3, in fractional
+        coordinates) and the complex ``u_matrix``, of shape (nk x num_wann x num_wann)
+        for ``_u.mat`` and (nk x num_bands x num_wann) for ``_u_dis.mat``.
+    :raise ValueError: if the file cannot be parsed.
+    """
+    handle.readline()
+    num_kpts, num_cols, num_rows = read_lines_numbers(handle, 1, dtype=int)
+
+    block_size = 3 + num_rows * num_cols * 2
+    blocks = read_numbers(handle, num_values=num_kpts * block_size).reshape(
+        num_kpts, block_size
+    )
+    # The matrices are written in column-major order, with the row index running fastest
+    u_matrix = blocks[:, 3:].reshape(num_kpts, num_cols, num_rows, 2)
+    u_matrix = (u_matrix[..., 0] + 1j * u_matrix[..., 1]).transpose(0, 2, 1)
+
+    return {
+        "kpoints": blocks[:, :3],
+        "u_matrix": np.ascontiguousarray(u_matrix),
+    }
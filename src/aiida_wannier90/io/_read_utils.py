@@ -0,0 +1,133 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Helper functions to read numbers from the text files written by Wannier90."""
+import warnings
+
+import numpy as np
+
+__all__ = ("parse_numbers", "read_numbers", "read_lines_numbers", "read_next_numbers")
+
+# Size (in characters) of the chunks read from the files: each chunk is parsed
+# with a single call to ``np.fromstring``, so that the memory used in addition
+# to the output array is bounded.
+READ_CHUNK_SIZE = 1024 * 1024
+# Maximum number of lines parsed at a time by `read_next_numbers`
+READ_BATCH_LINES = 65536
+
+
+def read_numbers(handle, num_values=None, dtype=float, chunk_size=READ_CHUNK_SIZE):
+    """Read all the whitespace-separated numbers from the current position to the end of the file.
+
+    The file is read in chunks, cut at the end of a line, and each chunk is parsed in bulk.
+
+    :param handle: a file handle opened in text mode
+    :param num_values: the expected number of values. If given, the output array is
+        allocated once and a ``ValueError`` is raised if the file contains a different number
+        of values.
+    :param dtype: the dtype of the returned array
+    :param chunk_size: the number of characters read at a time
+    :return: a 1D numpy array with the values
+    :raise ValueError: if some value cannot be parsed as a number
+    """
+    if num_values is None:
+        chunks = [
+            parse_numbers(chunk, dtype) for chunk in _iter_chunks(handle, chunk_size)
+        ]
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
+
+    values = np.empty(num_values, dtype=dtype)
+    num_read = 0
+    for chunk in _iter_chunks(handle, chunk_size):
+        chunk_values = parse_numbers(chunk, dtype)
+        if num_read + len(chunk_values) > num_values:
+            raise ValueError(f"Found more than the {num_values} expected values")
+        values[num_read : num_read + len(chunk_values)] = chunk_values
+        num_read += len(chunk_values)
+    if num_read != num_values:
+        raise ValueError(f"Found {num_read} values instead of {num_values}")
+    return values
+
+
+def read_lines_numbers(handle, num_lines, dtype=float):
+    """Read the numbers in the next ``num_lines`` lines of the file.
+
+    :param handle: a file handle opened in text mode
+    :param num_lines: the number of lines to read
+    :param dtype: the dtype of the returned array
+    :return: a 1D numpy array with the values
+    :raise ValueError: if some value cannot be parsed as a number
+    """
+    return parse_numbers("".join(handle.readline() for _ in range(num_lines)), dtype)
+
+
+def read_next_numbers(handle, num_values, dtype=float, batch_lines=READ_BATCH_LINES):
+    """Read exactly ``num_values`` numbers from the next lines of the file.
+
+    Useful for blocks of numbers followed by other content (e.g. the bands of a
+    ``.bxsf`` file). The number of values per line is taken from the first line, so that
+    the lines are read and parsed in batches, without reading past the block.
+
+    :param handle: a file handle opened in text mode
+    :param num_values: the number of values to read
+    :param dtype: the dtype of the returned array
+    :param batch_lines: the maximum number of lines parsed at a time
+    :return: a 1D numpy array with the values
+    :raise ValueError: if some value cannot be parsed as a number, if the file ends
+        before ``num_values`` values are read, or if the last line read contains more
+        values than needed
+    """
+    values = np.empty(num_values, dtype=dtype)
+    num_read = 0
+    values_per_line = None
+    while num_read < num_values:
+        if values_per_line is None:
+            num_lines = 1
+        else:
+            num_lines = min(-(-(num_values - num_read) // values_per_line), batch_lines)
+        text = "".join(handle.readline() for _ in range(num_lines))
+        if not text:
+            raise ValueError(f"Found {num_read} values instead of {num_values}")
+        chunk_values = parse_numbers(text, dtype)
+        if values_per_line is None and len(chunk_values):
+            values_per_line = len(chunk_values)
+        if num_read + len(chunk_values) > num_values:
+            raise ValueError(f"Found more than the {num_values} expected values")
+        values[num_read : num_read + len(chunk_values)] = chunk_values
+        num_read += len(chunk_values)
+    return values
+
+
+def _iter_chunks(handle, chunk_size):
+    """Yield the content of the file in chunks that end at the end of a line."""
+    remainder = ""
+    while True:
+        chunk = handle.read(chunk_size)
+        if not chunk:
+            break
+        chunk = remainder + chunk
+        cut = chunk.rfind("\n") + 1
+        if cut == 0:
+            remainder = chunk
+            continue
+        remainder = chunk[cut:]
+        yield chunk[:cut]
+    if remainder.strip():
+        yield remainder
+
+
+def parse_numbers(text, dtype):
+    """Parse whitespace-separated numbers, raising a ``ValueError`` on unparsable data."""
+    with warnings.catch_warnings():
+        # Older numpy versions only emit a DeprecationWarning for unparsable data
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(text, sep=" ")
+        except DeprecationWarning as exception:
+            raise ValueError(str(exception)) from exception
+    return values.astype(dtype, copy=False)
@@ -0,0 +1,89 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Read the volumetric data of the Wannier functions from ``.xsf`` and ``.cube`` files."""
+import numpy as np
+
+from ._read_utils import read_lines_numbers, read_next_numbers
+
+__all__ = ("read_xsf", "read_cube")
+
+
+def read_xsf(handle, dtype=float, stride=1):
+    """Read the first 3D data grid of a ``.xsf`` file, e.g. a Wannier function.
+
+    :param handle: the ``.xsf`` file, opened in text mode.
+    :param dtype: the dtype of the returned grid, e.g. ``numpy.float32`` or
+        ``numpy.float16`` to reduce its size.
+    :param stride: keep only one every ``stride`` points along each direction.
+    :return: a dictionary with the numpy arrays ``origin`` (3), ``spanning_vectors``
+        (3 x 3, one vector per row, spanning the whole grid) and ``data`` (n1 x n2 x n3,
+        where n1, n2, n3 are the numbers of points after the downsampling).
+        The grid is a general grid, i.e. it includes the points on both sides of the cell.
+        Lengths are in angstrom.
+    :raise ValueError: if the file cannot be parsed.
+    """
+    for line in handle:
+        if line.strip().startswith("BEGIN_DATAGRID_3D"):
+            break
+    else:
+        raise ValueError("No BEGIN_DATAGRID_3D block found")
+
+    grid = read_lines_numbers(handle, 1, dtype=int)
+    if len(grid) != 3:
+        raise ValueError(f"Invalid grid dimensions: {grid}")
+    vectors = read_lines_numbers(handle, 4).reshape(4, 3)
+    # The first index runs fastest
+    data = read_next_numbers(handle, int(np.prod(grid)), dtype=dtype)
+    data = data.reshape(grid[::-1]).transpose(2, 1, 0)
+    data = np.ascontiguousarray(data[::stride, ::stride, ::stride])
+    # The last point along a direction is dropped by the downsampling if not a multiple of `stride`
+    spanned = (np.array(data.shape) - 1) / np.maximum(grid - 1, 1) * stride
+
+    return {
+        "origin": vectors[0],
+        "spanning_vectors": vectors[1:] * spanned[:, None],
+        "data": data,
+    }
+
+
+def read_cube(handle, dtype=float, stride=1):
+    """Read the volumetric data of a Gaussian ``.cube`` file, e.g. a Wannier function.
+
+    :param handle: the ``.cube`` file, opened in text mode.
+    :param dtype: the dtype of the returned grid, e.g. ``numpy.float32`` or
+        ``numpy.float16`` to reduce its size.
+    :param stride: keep only one every ``stride`` points along each direction.
+    :return: a dictionary with the numpy arrays ``origin`` (3), ``voxel_vectors``
+        (3 x 3, one vector per row, i.e. the displacement between two points along each
+        direction, already multiplied by ``stride``), ``atomic_numbers`` (num_atoms),
+        ``atom_positions`` (num_atoms x 3) and ``data`` (n1 x n2 x n3, where n1, n2, n3
+        are the numbers of points after the downsampling). Lengths are in the units
+        of the file, i.e. bohr for the files written by Wannier90.
+    :raise ValueError: if the file cannot be parsed.
+    """
+    handle.readline()
+    handle.readline()
+    header = read_lines_numbers(handle, 4).reshape(4, 4)
+    num_atoms = int(header[0, 0])
+    if num_atoms < 0:
+        raise ValueError("Cube files with multiple orbitals are not supported")
+    # Negative numbers of points mean that the lengths are in angstrom
+    grid = np.abs(header[1:, 0].astype(int))
+    atoms = read_lines_numbers(handle, num_atoms).reshape(num_atoms, 5)
+    # The last index runs fastest
+    data = read_next_numbers(handle, int(np.prod(grid)), dtype=dtype)
+    data = data.reshape(grid)
+
+    return {
+        "origin": header[0, 1:],
+        "voxel_vectors": header[1:, 1:] * stride,
+        "atomic_numbers": atoms[:, 0].astype(int),
+        "atom_positions": atoms[:, 2:],
+        "data": np.ascontiguousarray(data[::stride, ::stride, ::stride]),
+    }
@@ -0,0 +1,58 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Read the Wigner-Seitz shifts from a ``_wsvec.dat`` file."""
+import numpy as np
+
+from ._read_utils import read_numbers
+
+__all__ = ("read_wsvec",)
+
+
+def read_wsvec(handle):
+    """Read the Wigner-Seitz shifts of each pair of Wannier functions from a ``_wsvec.dat`` file.
+
+    The file is written with ``use_ws_distance = .true.``. After a comment line, it
+    contains, for each R-vector and pair of Wannier functions, a line ``R1 R2 R3 m n``,
+    a line with the number of shift vectors and a line ``T1 T2 T3`` for each shift.
+
+    :param handle: the ``_wsvec.dat`` file, opened in text mode.
+    :return: a dictionary with the numpy arrays ``r_vectors`` (N x 3),
+        ``wf_indices`` (N x 2, the 1-based indices ``m, n`` of the Wannier functions),
+        ``multiplicities`` (N) and ``shifts`` (N x max(multiplicities) x 3, padded with zeros),
+        where N is the number of entries in the file and all the vectors are in units of
+        the lattice vectors.
+    :raise ValueError: if the file cannot be parsed.
+    """
+    handle.readline()
+    values = read_numbers(handle, dtype=int)
+
+    # The entries have a variable length, so only their offsets are found in Python
+    offsets = []
+    position = 0
+    while position < len(values):
+        offsets.append(position)
+        position += 6 + 3 * values[position + 5]
+    if position != len(values):
+        raise ValueError("The file ends in the middle of an entry")
+    offsets = np.array(offsets, dtype=int)
+
+    multiplicities = values[offsets + 5] if len(offsets) else np.empty(0, dtype=int)
+    shifts = np.zeros((len(offsets), multiplicities.max(initial=0), 3), dtype=int)
+    for idx in range(shifts.shape[1]):
+        # The entries that have at least `idx + 1` shifts
+        mask = multiplicities > idx
+        starts = offsets[mask] + 6 + 3 * idx
+        shifts[mask, idx] = values[starts[:, None] + np.arange(3)]
+
+    return {
+        "r_vectors": values[offsets[:, None] + np.arange(3)].reshape(-1, 3),
+        "wf_indices": values[offsets[:, None] + np.arange(3, 5)].reshape(-1, 2),
+        "multiplicities": multiplicities,
+        "shifts": shifts,
+    }
@@ -7,16 +7,146 @@
 # For further information on the license, see the LICENSE.txt file             #
 ################################################################################
 """Write input to a ``.win`` file."""
+from collections import OrderedDict, namedtuple
 import copy
+import itertools
+import threading
 import typing as ty
 
+import numpy as np
+
 from aiida import orm
 from aiida.common import InputValidationError
 
 from ..utils import conv_to_fortran_withlists
 from ._group_list import list_to_grouped_string
 
-__all__ = ("write_win",)
+__all__ = ("write_win", "win_block_cache_info", "clear_win_block_cache")
+
+# Number of rows of the long blocks (k-points, atoms) formatted at a time
+FORMAT_CHUNK_ROWS = 4096
+
+# Version of the formatting of the blocks, that is part of the keys of the block cache:
+# increase it whenever the format of a block changes.
+BLOCK_FORMAT_VERSION = 1
+# Maximum total size (in characters) of the blocks kept in the block cache
+BLOCK_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Maximum size (in characters) of a single cached block: larger blocks (e.g. dense
+# k-point meshes) are only streamed to the file, so that they are never held in memory
+BLOCK_CACHE_MAX_BLOCK_BYTES = 1024 * 1024
+
+BlockCacheInfo = namedtuple(
+    "BlockCacheInfo", ("hits", "misses", "maxbytes", "currbytes", "currsize")
+)
+
+
+class _BlockCache:
+    """Least-recently-used cache of the lines of the blocks formatted from stored nodes.
+
+    Many calculations (e.g. in a parameter sweep) share the same structure, k-points
+    and projections nodes: since stored nodes are immutable, the lines of their blocks
+    are keyed on the node UUID (and ``BLOCK_FORMAT_VERSION``), and reused by all the
+    calculations prepared in the same process, e.g. by a daemon worker.
+
+    The blocks are still streamed while they are formatted, and only those not larger
+    than ``max_block_bytes`` are stored, as a single string; the least recently used
+    blocks are evicted when the total size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes, max_block_bytes):
+        self.max_bytes = max_bytes
+        self.max_block_bytes = max_block_bytes
+        self._blocks = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._currbytes = 0
+
+    def get(self, name, node, format_function):
+        """Return an iterable of the lines of a block formatted from a node, from the cache if possible.
+
+        :param name: the name of the block.
+        :param node: the node from which the block is formatted; only stored nodes
+            are cached, since unstored nodes can still be modified.
+        :param format_function: a function returning the lines of the block from the node.
+            It is called immediately (so that its validation errors are raised), while
+            its lines are consumed lazily.
+        :return: an iterable of lines, where a cached block is a single string of
+            the lines joined by newlines.
+        """
+        if not getattr(node, "is_stored", False):
+            return format_function(node)
+
+        key = (name, node.uuid, BLOCK_FORMAT_VERSION)
+        with self._lock:
+            if key in self._blocks:
+                self._hits += 1
+                self._blocks.move_to_end(key)
+                block = self._blocks[key]
+                return (block,) if block else ()
+            self._misses += 1
+        return self._iter_and_store(key, format_function(node))
+
+    def _iter_and_store(self, key, lines):
+        """Yield the lines, and store the block at the end if it is small enough."""
+        cached, size = [], 0
+        for line in lines:
+            if cached is not None:
+                size += len(line) + 1
+                if size > self.max_block_bytes:
+                    cached = None
+                else:
+                    cached.append(line)
+            yield line
+        if cached is None:
+            return
+
+        block = "\n".join(cached)
+        with self._lock:
+            if key in self._blocks:
+                return
+            self._blocks[key] = block
+            self._currbytes += len(block)
+            while self._currbytes > self.max_bytes:
+                _, evicted = self._blocks.popitem(last=False)
+                self._currbytes -= len(evicted)
+
+    def info(self):
+        """Return the hits, misses, maximum and current size in characters, and number of blocks of the cache."""
+        with self._lock:
+            return BlockCacheInfo(
+                self._hits,
+                self._misses,
+                self.max_bytes,
+                self._currbytes,
+                len(self._blocks),
+            )
+
+    def clear(self):
+        """Empty the cache and reset its statistics."""
+        with self._lock:
+            self._blocks.clear()
+            self._hits = 0
+            self._misses = 0
+            self._currbytes = 0
+
+
+_BLOCK_CACHE = _BlockCache(BLOCK_CACHE_MAX_BYTES, BLOCK_CACHE_MAX_BLOCK_BYTES)
+
+
+def win_block_cache_info():
+    """Return the statistics of the cache of the blocks of the ``.win`` files.
+
+    :return: a ``BlockCacheInfo`` named tuple with the number of ``hits`` and ``misses``,
+        the maximum ``maxbytes`` and current ``currbytes`` total size of the cached blocks
+        (in characters), and their number ``currsize``.
+    """
+    return _BLOCK_CACHE.info()
+
+
+def clear_win_block_cache():
+    """Empty the cache of the blocks of the ``.win`` files, and reset its statistics."""
+    _BLOCK_CACHE.clear()
 
 
 def write_win(  # pylint: disable=too-many-arguments
@@ -58,18 +188,19 @@ def write_win(  # pylint: disable=too-many-arguments
     enables random projections completion
     :type random_projections: aiida.orm.nodes.data.bool.Bool
     """
+    lines = _iter_win_lines(
+        parameters=parameters,
+        structure=structure,
+        kpoints=kpoints,
+        kpoint_path=kpoint_path,
+        bands_kpoints=bands_kpoints,
+        projections=projections,
+        random_projections=random_projections,
+    )
+    # The lines are written as they are generated, so that the whole content
+    # of the file is never in memory
     with open(filename, "w", encoding="utf-8") as file:
-        file.write(
-            _create_win_string(
-                parameters=parameters,
-                structure=structure,
-                kpoints=kpoints,
-                kpoint_path=kpoint_path,
-                bands_kpoints=bands_kpoints,
-                projections=projections,
-                random_projections=random_projections,
-            )
-        )
+        file.writelines(lines)
 
 
 def _create_win_string(  # pylint: disable=too-many-arguments
@@ -82,18 +213,44 @@ def _create_win_string(  # pylint: disable=too-many-arguments
     random_projections=False,
 ):
     """Generate a string with the content of a .win file."""
+    return "".join(
+        _iter_win_lines(
+            parameters=parameters,
+            kpoints=kpoints,
+            structure=structure,
+            kpoint_path=kpoint_path,
+            bands_kpoints=bands_kpoints,
+            projections=projections,
+            random_projections=random_projections,
+        )
+    )
+
+
+def _iter_win_lines(  # pylint: disable=too-many-arguments
+    parameters,
+    kpoints,
+    structure=None,
+    kpoint_path=None,
+    bands_kpoints=None,
+    projections=None,
+    random_projections=False,
+):
+    """Return a generator of the lines of a .win file, each terminated by a newline.
+
+    The inputs are validated when this function is called, while the long blocks
+    (k-points, atoms) are formatted only when they are reached, a chunk of rows at a time.
+    """
     from aiida.orm import List
     from aiida.plugins import DataFactory
 
     # prepare the main input text
-    input_file_lines = []
     if isinstance(parameters, DataFactory("core.dict")):
         parameters = parameters.get_dict()
     try:
         parameters.setdefault("mp_grid", kpoints.get_kpoints_mesh()[0])
     except AttributeError:
         pass
-    input_file_lines += _format_parameters(parameters)
+    parameter_lines = _format_parameters(parameters)
 
     block_inputs = {}
     if projections is None:
@@ -117,24 +274,37 @@ def _create_win_string(  # pylint: disable=too-many-arguments
             )
         block_inputs["projections"] = projections.get_list()
     else:
-        block_inputs["projections"] = _format_all_projections(
-            projections, random_projections=True
+        block_inputs["projections"] = _BLOCK_CACHE.get(
+            "projections",
+            projections,
+            lambda node: _format_all_projections(node, random_projections=True),
         )
 
     if structure is not None:
-        block_inputs["unit_cell_cart"] = _format_unit_cell(structure)
-        block_inputs["atoms_cart"] = _format_atoms_cart(structure)
+        block_inputs["unit_cell_cart"] = _BLOCK_CACHE.get(
+            "unit_cell_cart", structure, _format_unit_cell
+        )
+        block_inputs["atoms_cart"] = _BLOCK_CACHE.get(
+            "atoms_cart", structure, _format_atoms_cart
+        )
     if kpoints is not None:
-        block_inputs["kpoints"] = _format_kpoints(kpoints)
+        block_inputs["kpoints"] = _BLOCK_CACHE.get("kpoints", kpoints, _format_kpoints)
     if kpoint_path is not None:
-        block_inputs["kpoint_path"] = _format_kpoint_path(kpoint_path)
+        block_inputs["kpoint_path"] = _BLOCK_CACHE.get(
+            "kpoint_path", kpoint_path, _format_kpoint_path
+        )
     elif bands_kpoints is not None:
-        kpath, labels = _format_explicit_kpoint_path(bands_kpoints)
-        block_inputs["explicit_kpath"] = kpath
-        block_inputs["explicit_kpath_labels"] = labels
-    input_file_lines += _format_block_inputs(block_inputs)
+        for index, name in enumerate(("explicit_kpath", "explicit_kpath_labels")):
+            block_inputs[name] = _BLOCK_CACHE.get(
+                name,
+                bands_kpoints,
+                lambda node, index=index: _format_explicit_kpoint_path(node)[index],
+            )
 
-    return "\n".join(input_file_lines) + "\n"
+    return (
+        line + "\n"
+        for line in itertools.chain(parameter_lines, _format_block_inputs(block_inputs))
+    )
 
 
 def _format_parameters(parameters_dict):
@@ -284,19 +454,48 @@ def _format_unit_cell(structure):
     ]
 
 
-def _format_atoms_cart(structure):
-    """Generate site locations and cell dimensions that can be used by the wannier90 input script."""
+def _format_rows(row_format, values, num_rows):
+    """Format a table with the same printf-style format for each row, returning its lines.
 
-    def list2str(list_item):
-        """Convert an input list item into a str."""
-        list_item = copy.deepcopy(list_item)
-        if isinstance(list_item, str):
-            return list_item
-        return " " + " ".join([f"{_:18.10f}" for _ in list_item]) + " "
+    The whole table is formatted with a single ``%`` operation, that is much faster
+    than formatting each row in a Python loop for large tables (e.g. dense k-point
+    meshes or large supercells). The ``%`` conversions give the same output as the
+    corresponding format specifications (e.g. ``%18.10f`` and ``{:18.10f}``).
 
-    return ["ang"] + [
-        f"{site.kind_name}  {list2str(site.position)}" for site in structure.sites
-    ]
+    :param row_format: the format of a row, e.g. ``'%18.10f %18.10f %18.10f'``
+    :param values: the flat sequence of the values of all the rows
+    :param num_rows: the number of rows
+    """
+    if not num_rows:
+        return []
+    return ("\n".join([row_format] * num_rows) % tuple(values)).split("\n")
+
+
+def _format_vectors(vectors):
+    """Yield the formatted rows of a (N x 3) array of vectors, with the ``18.10f`` format.
+
+    The rows are formatted ``FORMAT_CHUNK_ROWS`` at a time.
+    """
+    vectors = np.asarray(vectors, dtype=float).reshape(-1, 3)
+    for start in range(0, len(vectors), FORMAT_CHUNK_ROWS):
+        chunk = vectors[start : start + FORMAT_CHUNK_ROWS]
+        yield from _format_rows(
+            "%18.10f %18.10f %18.10f", chunk.ravel().tolist(), len(chunk)
+        )
+
+
+def _format_atoms_cart(structure):
+    """Generate site locations and cell dimensions that can be used by the wannier90 input script."""
+    # The raw sites avoid creating a `Site` object for each site
+    sites = structure.base.attributes.get("sites", [])
+    yield "ang"
+    for start in range(0, len(sites), FORMAT_CHUNK_ROWS):
+        chunk = sites[start : start + FORMAT_CHUNK_ROWS]
+        values = []
+        for site in chunk:
+            values.append(site["kind_name"])
+            values.extend(site["position"])
+        yield from _format_rows("%s   %18.10f %18.10f %18.10f ", values, len(chunk))
 
 
 def _format_kpoints(kpoints):
@@ -306,7 +505,7 @@ def _format_kpoints(kpoints):
     # KpointsData was set with set_kpoints
     except AttributeError:
         all_kpoints = kpoints.get_kpoints()
-    return [f"{k[0]:18.10f} {k[1]:18.10f} {k[2]:18.10f}" for k in all_kpoints]
+    return _format_vectors(all_kpoints)
 
 
 def _format_kpoint_path(kpoint_path):
@@ -344,7 +543,7 @@ def _format_explicit_kpoint_path(bands_kpoints: orm.KpointsData) -> ty.Tuple:
     """Prepare the lines for the Wannier90 input file related to the `explicit_kpath` and `explicit_kpath_labels`.
 
     :param bands_kpoints: a KpointsData which must contain labels.
-    :return: a tuple of list of strings to be added to the input file, for the `explicit_kpath`
+    :return: a tuple with the lines to be added to the input file, for the `explicit_kpath`
     and `explicit_kpath_labels` blocks.
     """
     if "mesh" in bands_kpoints.base.attributes.all:
@@ -364,9 +563,7 @@ def _format_explicit_kpoint_path(bands_kpoints: orm.KpointsData) -> ty.Tuple:
     # In Wannier90 (from the user guide): Values are in
     # fractional coordinates with respect to the primitive
     # reciprocal lattice vectors.
-    explicit_kpath = []
-    for kpt in kpoints:
-        explicit_kpath.append(f"{kpt[0]:18.10f} {kpt[1]:18.10f} {kpt[2]:18.10f}")
+    explicit_kpath = _format_vectors(kpoints)
 
     explicit_kpath_labels = []
     for idx, lab in labels:
@@ -378,10 +575,13 @@ def _format_explicit_kpoint_path(bands_kpoints: orm.KpointsData) -> ty.Tuple:
 
 
 def _format_block_inputs(block_inputs):
-    res = []
+    """Yield the lines of the blocks, sorted by name.
+
+    :param block_inputs: a dictionary with the name of each block and an iterable
+        of its lines.
+    """
     for name, lines in sorted(block_inputs.items()):
-        res.append("")
-        res.append(f"begin {name}")
-        res.extend(lines)
-        res.append(f"end {name}")
-    return res
+        yield ""
+        yield f"begin {name}"
+        yield from lines
+        yield f"end {name}"
@@ -0,0 +1,195 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Checks on the stdout of Wannier90 and postw90, shared by the parsers."""
+import collections
+import io
+import os
+import re
+
+__all__ = (
+    "STDOUT_ERROR_SIGNATURES",
+    "StdoutErrors",
+    "find_stdout_errors",
+    "check_stdout_tail",
+    "read_tail_lines",
+)
+
+# Number of bytes read from the end of the stdout to decide whether it is complete.
+# Wannier90 stops right after printing the error message, so this is enough
+# to contain the message and its context.
+STDOUT_TAIL_BYTES = 8192
+
+
+# Known messages printed by Wannier90 and postw90 on errors, with the name of the
+# corresponding exit code. To detect a new error, just add its message here.
+# ``Exiting......`` is printed before any error message, so it is only reported
+# by the parsers if no more specific error is found.
+STDOUT_ERROR_SIGNATURES = (
+    ("Exiting......", "ERROR_EXITING_MESSAGE_IN_STDOUT"),
+    ("Unable to satisfy B1", "ERROR_BVECTORS"),
+    ("kmesh_get_bvector: Not enough bvectors found", "ERROR_BVECTORS"),
+    (
+        "kmesh_get: something wrong, found too many nearest neighbours",
+        "ERROR_BVECTORS",
+    ),
+    (
+        "Energy window contains fewer states than number of target WFs, "
+        "consider reducing dis_proj_min/increasing dis_win_max?",
+        "ERROR_DISENTANGLEMENT_NOT_ENOUGH_STATES",
+    ),
+    (
+        "Error plotting WF cube. Try one of the following:",
+        "ERROR_PLOT_WF_CUBE",
+    ),
+)
+
+# All the messages are matched at once by a single regex
+_STDOUT_ERROR_EXIT_CODES = dict(STDOUT_ERROR_SIGNATURES)
+_STDOUT_ERROR_REGEX = re.compile(
+    "|".join(re.escape(message) for message, _ in STDOUT_ERROR_SIGNATURES)
+)
+
+# Number of characters read at once when scanning the stdout
+STDOUT_CHUNK_SIZE = 1024 * 1024
+
+
+def find_stdout_errors(text):
+    """Return the names of the exit codes for the error messages in (a portion of) the stdout.
+
+    :param text: a string with one or more lines of the stdout.
+    :return: a tuple with the names of the exit codes, in the order in which
+        the messages appear in the text (empty if there are no known error messages).
+    """
+    # Most of the stdout contains no error at all: a single search over the
+    # text is enough to rule it out, without collecting the matches
+    if _STDOUT_ERROR_REGEX.search(text) is None:
+        return ()
+    return tuple(
+        _STDOUT_ERROR_EXIT_CODES[match.group(0)]
+        for match in _STDOUT_ERROR_REGEX.finditer(text)
+    )
+
+
+class StdoutErrors:
+    """Collect the errors found while scanning the stdout."""
+
+    def __init__(self):
+        """Construct the collector."""
+        # The name of the exit code of the first error found, if any
+        self.error = None
+        # Whether ``Exiting......`` was printed
+        self.exiting = False
+
+    def scan(self, text):
+        """Look for known error messages in one or more lines of the stdout."""
+        for exit_code in find_stdout_errors(text):
+            if exit_code == "ERROR_EXITING_MESSAGE_IN_STDOUT":
+                self.exiting = True
+            elif self.error is None:
+                self.error = exit_code
+
+    def iter_lines(self, handle, chunk_size=STDOUT_CHUNK_SIZE):
+        """Iterate over the lines of the stdout, looking for errors along the way.
+
+        The file is read in chunks of complete lines, that are scanned for errors
+        all at once before being split into lines, so that the memory usage does
+        not depend on the size of the file.
+
+        :param handle: the stdout file handle, opened in text mode, or any iterable of lines.
+        :param chunk_size: the number of characters read at once.
+        :return: a generator over the lines of the stdout, including the line terminators.
+        """
+        if not hasattr(handle, "read"):
+            for line in handle:
+                self.scan(line)
+                yield line
+            return
+
+        remainder = ""
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                break
+            chunk = remainder + chunk
+            # Only complete lines are processed, the rest goes with the next chunk
+            end = chunk.rfind("\n") + 1
+            chunk, remainder = chunk[:end], chunk[end:]
+            self.scan(chunk)
+            yield from chunk.splitlines(keepends=True)
+        if remainder:
+            self.scan(remainder)
+            yield remainder
+
+
+def read_tail_lines(handle, num_bytes=STDOUT_TAIL_BYTES):
+    """Return the lines at the end of a file, without reading the whole file.
+
+    :param handle: a file handle opened in binary mode.
+    :param num_bytes: the maximum number of bytes to read from the end of the file.
+    :return: a list of the (decoded) lines contained in the last ``num_bytes`` bytes.
+        A line that is only partially contained in them is not returned.
+    """
+    try:
+        handle.seek(0, os.SEEK_END)
+        size = handle.tell()
+        handle.seek(max(size - num_bytes, 0))
+        tail = handle.read()
+    except (OSError, io.UnsupportedOperation):
+        # Not seekable, fall back to reading through the stream
+        size = None
+        tail = b"".join(collections.deque(handle, maxlen=num_bytes // 80 + 1))
+    lines = tail.decode("utf-8", errors="replace").splitlines()
+    if size is not None and size > num_bytes and lines:
+        # The first line was truncated by the seek
+        lines = lines[1:]
+    return lines
+
+
+def check_stdout_tail(handle, completed_lines):
+    """Check whether the stdout is complete, only looking at its end.
+
+    When the calculation is killed (e.g. by the scheduler) or stops with an error,
+    the final line of the stdout is not one of the messages printed on success.
+    Since Wannier90 stops right after printing the error message, the error
+    can also be identified from the last lines of the file.
+
+    If no known error message is found at the end of an incomplete stdout, the
+    whole file is scanned, so that an error printed earlier (e.g. before the output
+    of other MPI processes) is still reported instead of the generic exit code.
+    This only costs time for the calculations that did not complete.
+
+    :param handle: the stdout file handle, opened in binary mode.
+    :param completed_lines: the possible (stripped) last lines of a complete stdout.
+    :return: the name of the exit code if the stdout is incomplete, ``None`` if it is complete.
+    """
+    tail_lines = read_tail_lines(handle)
+    if tail_lines and tail_lines[-1].strip() in completed_lines:
+        return None
+    stdout_errors = StdoutErrors()
+    for line in tail_lines:
+        stdout_errors.scan(line)
+    if stdout_errors.error is None:
+        _scan_whole_stdout(handle, stdout_errors)
+    if stdout_errors.error is not None:
+        return stdout_errors.error
+    return "ERROR_OUTPUT_STDOUT_INCOMPLETE"
+
+
+def _scan_whole_stdout(handle, stdout_errors):
+    """Scan the whole stdout for errors, in chunks, if the file can be read again."""
+    try:
+        handle.seek(0)
+    except (OSError, io.UnsupportedOperation):
+        return
+    text = io.TextIOWrapper(handle, encoding="utf-8", errors="replace")
+    try:
+        collections.deque(stdout_errors.iter_lines(text), maxlen=0)
+    finally:
+        # Do not close the handle together with the wrapper
+        text.detach()
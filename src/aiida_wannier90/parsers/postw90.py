@@ -7,7 +7,12 @@
 # For further information on the license, see the LICENSE.txt file             #
 ################################################################################
 """Parser for the `Postw90Calculation`."""
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import functools
+import os
 from pathlib import Path
+import re
 import typing as ty
 
 import numpy as np
@@ -15,6 +20,9 @@ import numpy as np
 from aiida.common import exceptions as exc
 from aiida.parsers import Parser
 
+from ..io._read_utils import read_numbers
+from ._stdout import StdoutErrors, check_stdout_tail
+
 __all__ = ("Postw90Parser",)
 
 
@@ -48,6 +56,148 @@ class Postw90Parser(Parser):
             "so I don't know how to get the seedname"
         )
 
+    def _get_parser_options(self):
+        """Return the ``parser_options`` in the input ``settings``, or an empty dictionary."""
+        if "settings" not in self.node.inputs:
+            return {}
+        return self.node.inputs.settings.get_dict().get("parser_options", {})
+
+    def _get_boltzwann_arrays(self, table, column_names, attrs, layout):
+        """Return the arrays and the attributes of the output node of a BoltzWann table.
+
+        If the tensor layout cannot be built (e.g. the rows do not form a regular grid),
+        a warning is logged and the flat layout is used.
+        """
+        if layout == "tensor":
+            try:
+                arrays = _get_table_tensors(table, column_names)
+            except ValueError as exception:
+                self.logger.warning(
+                    f"Storing the flat BoltzWann columns instead of tensors: {exception}"
+                )
+            else:
+                # The units of the axes follow their names, e.g. `Temp_unit` -> `temperature_unit`
+                attrs = {
+                    (
+                        f"{_get_axis_name(key[:-len('_unit')])}_unit"
+                        if key.endswith("_unit")
+                        else key
+                    ): value
+                    for key, value in attrs.items()
+                }
+                return arrays, dict(attrs, layout="tensor")
+
+        arrays = {
+            name: np.ascontiguousarray(table[:, index])
+            for index, name in enumerate(column_names)
+        }
+        return arrays, dict(attrs, layout="flat")
+
+    def _get_boltzwann_node(self, link_label, result, layout):
+        """Return the output node of a BoltzWann file, from the result of its raw parser."""
+        from aiida.orm import ArrayData, XyData
+
+        if link_label == _BOLTZDOS_FILE[2]:
+            energy_dos, attrs = result
+            boltzdos_dat = XyData()
+            boltzdos_dat.set_x(energy_dos[:, 0], "Energy", "eV")
+            boltzdos_dat.set_y(energy_dos[:, 1], "Dos", "states/eV")
+            boltzdos_dat.base.attributes.set_many(attrs)
+            return boltzdos_dat
+
+        arrays, attrs = self._get_boltzwann_arrays(*result, layout)
+        table_dat = ArrayData()
+        for name, array in arrays.items():
+            table_dat.set_array(name, array)
+        table_dat.base.attributes.set_many(attrs)
+        return table_dat
+
+    def _parse_berry_and_gyrotropic(self, seedname, folder, filenames):
+        """Parse the outputs of the berry and gyrotropic modules found in the temporary folder.
+
+        These files are only written for some tasks and parameters (e.g. the -fermiscan.dat
+        files only for several Fermi energies), so the missing ones are skipped. The files
+        that cannot be parsed are reported in the log.
+        """
+        from aiida.orm import ArrayData
+
+        # The link label, the name of the file(s) and a function that returns the arrays
+        readers = []
+        for suffix, raw_parser, link_label in _BERRY_FILES:
+            if f"{seedname}{suffix}" in filenames:
+                readers.append(
+                    (
+                        link_label,
+                        f"{seedname}{suffix}",
+                        functools.partial(
+                            _read_dat_file, folder / f"{seedname}{suffix}", raw_parser
+                        ),
+                    )
+                )
+
+        kubo_filenames = [f"{seedname}-kubo_{name}.dat" for name in _KUBO_COMPONENTS]
+        num_kubo_files = sum(filename in filenames for filename in kubo_filenames)
+        if num_kubo_files == len(kubo_filenames):
+            readers.append(
+                (
+                    "berry.kubo",
+                    f"{seedname}-kubo_*.dat",
+                    functools.partial(
+                        _read_kubo_files,
+                        folder,
+                        seedname,
+                        f"{seedname}-jdos.dat" in filenames,
+                    ),
+                )
+            )
+        elif num_kubo_files:
+            self.logger.warning(
+                f"Found only {num_kubo_files} of the {len(kubo_filenames)} -kubo_*.dat files"
+            )
+
+        regex = re.compile(rf"{re.escape(seedname)}-gyrotropic-(\w+)\.dat")
+        for filename in sorted(filenames):
+            match = regex.fullmatch(filename)
+            if match is not None:
+                readers.append(
+                    (
+                        f"gyrotropic.{match.group(1)}",
+                        filename,
+                        functools.partial(
+                            _read_dat_file,
+                            folder / filename,
+                            functools.partial(
+                                raw_gyrotropic_dat_parser, quantity=match.group(1)
+                            ),
+                        ),
+                    )
+                )
+
+        parameters = self.node.inputs.parameters.get_dict()
+        for link_label, filename, read in readers:
+            try:
+                arrays, attrs = read()
+            except (ValueError, IndexError) as exception:
+                self.logger.warning(f"Could not parse the {filename} file: {exception}")
+                continue
+            if link_label.startswith("berry.shc"):
+                # The component of the spin Hall conductivity tensor, 1-based
+                attrs.update(
+                    {
+                        key: parameters.get(key, default)
+                        for key, default in (
+                            ("shc_alpha", 1),
+                            ("shc_beta", 2),
+                            ("shc_gamma", 3),
+                        )
+                    }
+                )
+            array_data = ArrayData()
+            for name, array in arrays.items():
+                array_data.set_array(name, array)
+            array_data.base.attributes.set_many(attrs)
+            self.out(link_label, array_data)
+
     def parse(self, **kwargs):  # pylint: disable=inconsistent-return-statements
         """Parse the datafolder, stores results.
 
@@ -55,9 +205,7 @@ class Postw90Parser(Parser):
         representing the file of forces in real space.
         """
         # pylint: disable=too-many-return-statements,too-many-statements
-        import re
-
-        from aiida.orm import ArrayData, Dict, XyData
+        from aiida.orm import Dict
 
         # None if unset
         # temporary_folder = kwargs.get("retrieved_temporary_folder")
@@ -75,42 +223,31 @@ class Postw90Parser(Parser):
         except exc.NotExistent:
             return self.exit_codes.ERROR_NO_RETRIEVED_FOLDER
 
-        exiting_in_stdout = False
         try:
-            with out_folder.base.repository.open(output_file_name) as handle:
-                out_file = handle.readlines()
-            # Wannier90 doesn't always write the .werr file on error
-            for line in out_file:
-                if "Exiting......" in line:
-                    exiting_in_stdout = True
-                if "Unable to satisfy B1" in line:
-                    return self.exit_codes.ERROR_BVECTORS
-                if "kmesh_get_bvector: Not enough bvectors found" in line:
-                    return self.exit_codes.ERROR_BVECTORS
-                if (
-                    "kmesh_get: something wrong, found too many nearest neighbours"
-                    in line
-                ):
-                    return self.exit_codes.ERROR_BVECTORS
-                err_msg = (
-                    "Energy window contains fewer states than number of target WFs, "
-                    "consider reducing dis_proj_min/increasing dis_win_max?"
+            # Check first only the end of the stdout, to avoid reading
+            # a possibly huge file if the calculation did not complete
+            with out_folder.base.repository.open(output_file_name, "rb") as handle:
+                stdout_error = check_stdout_tail(
+                    handle,
+                    completed_lines=(
+                        f"Exiting... {seedname}.nnkp written.",
+                        "All done: postw90 exiting",
+                    ),
                 )
-                if err_msg in line:
-                    return self.exit_codes.ERROR_DISENTANGLEMENT_NOT_ENOUGH_STATES
-                if "Error plotting WF cube. Try one of the following:" in line:
-                    return self.exit_codes.ERROR_PLOT_WF_CUBE
-            if len(out_file) == 0:
-                return self.exit_codes.ERROR_OUTPUT_STDOUT_INCOMPLETE
-            if out_file[-1].strip() not in (
-                f"Exiting... {seedname}.nnkp written.",
-                "All done: postw90 exiting",
-            ):
-                return self.exit_codes.ERROR_OUTPUT_STDOUT_INCOMPLETE
+            if stdout_error is not None:
+                return self.exit_codes[stdout_error]
+            with out_folder.base.repository.open(output_file_name) as handle:
+                # Errors and the parsed data are collected in a single pass
+                stdout_errors = StdoutErrors()
+                wout_dictionary = raw_wpout_parser(stdout_errors.iter_lines(handle))
         except OSError:
             self.logger.error("Standard output file could not be found.")
             return self.exit_codes.ERROR_OUTPUT_STDOUT_MISSING
 
+        # Wannier90 doesn't always write the .werr file on error
+        if stdout_errors.error is not None:
+            return self.exit_codes[stdout_errors.error]
+
         # Checks for error output files
         # This is after the check of stdout, since stdout might give more verbose exit code.
         if error_file_name in out_folder.base.repository.list_object_names():
@@ -130,12 +267,10 @@ class Postw90Parser(Parser):
                 )
                 return self.exit_codes.ERROR_WERR_FILE_PRESENT
 
-        # Parse the stdout an return the parsed data
-        wout_dictionary = raw_wpout_parser(out_file)
         output_data = Dict(wout_dictionary)
         self.out("output_parameters", output_data)
 
-        if exiting_in_stdout:
+        if stdout_errors.exiting:
             return self.exit_codes.ERROR_EXITING_MESSAGE_IN_STDOUT
 
         params = self.node.inputs.parameters.get_dict()
@@ -153,103 +288,51 @@ class Postw90Parser(Parser):
                 _.name for _ in retrieved_temporary_folder.iterdir()
             ]
 
+        if retrieved_tmp_filenames is not None:
+            self._parse_berry_and_gyrotropic(
+                seedname, retrieved_temporary_folder, retrieved_tmp_filenames
+            )
+
         if params.get("boltzwann", False):
             if retrieved_tmp_filenames is None:
                 return self.exit_codes.ERROR_NO_RETRIEVED_TEMPORARY_FOLDER
 
+            files = list(_BOLTZWANN_TABLES)
             if params.get("boltz_calc_also_dos", False):
-                filename = retrieved_temporary_folder / f"{seedname}_boltzdos.dat"
-                if filename.name in retrieved_tmp_filenames:
-                    with open(filename, encoding="utf-8") as handle:
-                        energy_dos, attrs = raw_boltzdos_dat_parser(handle)
-                    boltzdos_dat = XyData()
-                    boltzdos_dat.set_x(energy_dos[:, 0], "Energy", "eV")
-                    boltzdos_dat.set_y(energy_dos[:, 1], "Dos", "states/eV")
-                    boltzdos_dat.base.attributes.set_many(attrs)
-                    self.out("boltzwann.boltzdos", boltzdos_dat)
-                else:
-                    self.logger.error(
-                        f"Did not find {filename} in temporary retrieved files"
-                    )
-                    return self.exit_codes.ERROR_OUTPUT_FILE_MISSING
-
-            filename = retrieved_temporary_folder / f"{seedname}_elcond.dat"
-            if filename.name in retrieved_tmp_filenames:
-                with open(filename, encoding="utf-8") as handle:
-                    elcond, column_names, attrs = raw_elcond_dat_parser(handle)
-                elcond_dat = ArrayData()
-                for i, name in enumerate(column_names):
-                    col = elcond[:, i]
-                    elcond_dat.set_array(name, np.array(col))
-                elcond_dat.base.attributes.set_many(attrs)
-                self.out("boltzwann.elcond", elcond_dat)
-            else:
-                self.logger.error(
-                    f"Did not find {filename} in temporary retrieved files"
-                )
-                return self.exit_codes.ERROR_OUTPUT_FILE_MISSING
-
-            filename = retrieved_temporary_folder / f"{seedname}_kappa.dat"
-            if filename.name in retrieved_tmp_filenames:
-                with open(filename, encoding="utf-8") as handle:
-                    kappa, column_names, attrs = raw_kappa_dat_parser(handle)
-                kappa_dat = ArrayData()
-                for i, name in enumerate(column_names):
-                    col = kappa[:, i]
-                    kappa_dat.set_array(name, np.array(col))
-                kappa_dat.base.attributes.set_many(attrs)
-                self.out("boltzwann.kappa", kappa_dat)
-            else:
-                self.logger.error(
-                    f"Did not find {filename} in temporary retrieved files"
-                )
-                return self.exit_codes.ERROR_OUTPUT_FILE_MISSING
-
-            filename = retrieved_temporary_folder / f"{seedname}_seebeck.dat"
-            if filename.name in retrieved_tmp_filenames:
-                with open(filename, encoding="utf-8") as handle:
-                    seebeck, column_names, attrs = raw_seebeck_dat_parser(handle)
-                seebeck_dat = ArrayData()
-                for i, name in enumerate(column_names):
-                    col = seebeck[:, i]
-                    seebeck_dat.set_array(name, np.array(col))
-                seebeck_dat.base.attributes.set_many(attrs)
-                self.out("boltzwann.seebeck", seebeck_dat)
-            else:
-                self.logger.error(
-                    f"Did not find {filename} in temporary retrieved files"
-                )
-                return self.exit_codes.ERROR_OUTPUT_FILE_MISSING
+                files.insert(0, _BOLTZDOS_FILE)
+            filepaths = [
+                retrieved_temporary_folder / f"{seedname}{suffix}"
+                for suffix, _, _ in files
+            ]
+            missing = [
+                filepath
+                for filepath in filepaths
+                if filepath.name not in retrieved_tmp_filenames
+            ]
+            # The outputs of the files before the first missing one are still attached
+            num_found = filepaths.index(missing[0]) if missing else len(filepaths)
 
-            filename = retrieved_temporary_folder / f"{seedname}_sigmas.dat"
-            if filename.name in retrieved_tmp_filenames:
-                with open(filename, encoding="utf-8") as handle:
-                    sigmas, column_names, attrs = raw_sigmas_dat_parser(handle)
-                sigmas_dat = ArrayData()
-                for i, name in enumerate(column_names):
-                    col = sigmas[:, i]
-                    sigmas_dat.set_array(name, np.array(col))
-                sigmas_dat.base.attributes.set_many(attrs)
-                self.out("boltzwann.sigmas", sigmas_dat)
-            else:
-                self.logger.error(
-                    f"Did not find {filename} in temporary retrieved files"
+            parser_options = self._get_parser_options()
+            layout = parser_options.get("boltzwann_layout", "flat")
+            num_workers = parser_options.get(
+                "boltzwann_workers", min(num_found, os.cpu_count() or 1)
+            )
+            # The files are parsed concurrently (the bulk parsing of the numbers releases
+            # the GIL), and the outputs are attached in order
+            with ThreadPoolExecutor(max_workers=max(num_workers, 1)) as executor:
+                results = executor.map(
+                    _read_dat_file,
+                    filepaths[:num_found],
+                    [raw_parser for _, raw_parser, _ in files[:num_found]],
                 )
-                return self.exit_codes.ERROR_OUTPUT_FILE_MISSING
+                for (_, _, link_label), result in zip(files, results):
+                    self.out(
+                        link_label, self._get_boltzwann_node(link_label, result, layout)
+                    )
 
-            filename = retrieved_temporary_folder / f"{seedname}_tdf.dat"
-            if filename.name in retrieved_tmp_filenames:
-                with open(filename, encoding="utf-8") as handle:
-                    tdf, column_names, attrs = raw_tdf_dat_parser(handle)
-                tdf_dat = ArrayData()
-                for i, name in enumerate(column_names):
-                    col = tdf[:, i]
-                    tdf_dat.set_array(name, np.array(col))
-                tdf_dat.base.attributes.set_many(attrs)
-                self.out("boltzwann.tdf", tdf_dat)
-            else:
+            if missing:
                 self.logger.error(
-                    f"Did not find {filename} in temporary retrieved files"
+                    f"Did not find {missing[0]} in temporary retrieved files"
                 )
                 return self.exit_codes.ERROR_OUTPUT_FILE_MISSING
 
@@ -259,11 +342,9 @@ def raw_wpout_parser(
 ):  # pylint: disable=too-many-locals,too-many-statements
     """Parse a .wpout file and return certain key parameters.
 
-    :param out_file: the .wpout file, as a list of strings
+    :param wann_out_file: the .wpout file, as an iterable of strings
     :return out: a dictionary of parameters that can be stored as parameter data
     """
-    import re
-
     regex = re.compile(
         r"Time for BoltzWann \(Boltzmann transport\) *([+-]?(?:[0-9]*[.])?[0-9]+) \(sec\)"
     )
@@ -300,6 +381,173 @@ def raw_wpout_parser(
     return out
 
 
+# A line of column names in the header of the postw90 files, e.g.
+# `Mu(eV) Temp(K) (Sigma*S)_xx ...`: words made only of letters, digits, underscores,
+# parentheses and asterisks (unlike the lines of free text, that contain punctuation)
+_COLUMN_NAMES_LINE_REGEX = re.compile(r"[A-Za-z(][\w()*]*(\s+[A-Za-z(][\w()*]*)+")
+# A unit at the end of a column name, e.g. `(eV)` in `Mu(eV)`
+_COLUMN_UNIT_REGEX = re.compile(r"(?<=\w)\([^)]*\)$")
+
+
+def _get_column_name(word):
+    """Return a valid array name from a column name of the header, without its unit.
+
+    E.g. ``Mu(eV)`` becomes ``Mu`` and ``(Sigma*S)_xx`` becomes ``SigmaS_xx``.
+    """
+    return re.sub(r"\W", "", _COLUMN_UNIT_REGEX.sub("", word))
+
+
+def _load_dat_table(
+    handle: ty.TextIO, column_names: ty.Sequence[str]
+) -> ty.Tuple[np.ndarray, ty.List[str]]:
+    """Load a postw90 output table, i.e. a header of comment lines followed by numeric columns.
+
+    The header is read line by line, and the columns are named from its line of column
+    names (e.g. ``# Mu(eV) Temp(K) ElCond_xx ...``), or from ``column_names`` if no such
+    line is found. The numeric block is then parsed in bulk, in chunks, without creating
+    a Python object per row. Extra columns beyond the named ones are named ``column_<index>``.
+
+    :param handle: the file, opened in text mode.
+    :param column_names: the default names of the columns.
+    :return: a tuple with the 2D array of the table and the list of column names.
+    :raise ValueError: if the table cannot be parsed, or has fewer columns than names.
+    """
+    header_lines = []
+    position = handle.tell()
+    line = handle.readline()
+    while line.lstrip().startswith("#"):
+        header_lines.append(line.lstrip()[1:].strip())
+        position = handle.tell()
+        line = handle.readline()
+    # Go back to the first row, to parse it with the others
+    handle.seek(position)
+
+    for header_line in reversed(header_lines):
+        if _COLUMN_NAMES_LINE_REGEX.fullmatch(header_line):
+            names = [_get_column_name(word) for word in header_line.split()]
+            break
+    else:
+        names = list(column_names)
+
+    num_columns = len(line.split())
+    if not num_columns:
+        return np.empty((0, len(names))), names
+    if num_columns < len(names):
+        raise ValueError(
+            f"Found {num_columns} columns, but {len(names)} column names: {names}"
+        )
+    names += [f"column_{index}" for index in range(len(names), num_columns)]
+    return read_numbers(handle).reshape(-1, num_columns), names
+
+
+# The names of the axes of the postw90 tables in the tensor layout
+_TABLE_AXES = {
+    "Mu": "mu",
+    "Temp": "temperature",
+    "Energy": "energy",
+    "EFERMI": "fermi_energy",
+    "omega": "omega",
+}
+# The indices of the Cartesian components of the tensors, e.g. `xy` -> (0, 1)
+_TENSOR_COMPONENTS = {
+    first + second: (i, j)
+    for i, first in enumerate("xyz")
+    for j, second in enumerate("xyz")
+}
+
+
+def _get_axis_name(name):
+    """Return the name of an axis in the tensor layout, e.g. ``temperature`` for ``Temp``."""
+    return _TABLE_AXES.get(name, name)
+
+
+def _get_grid(table, first_index, second_index):
+    """Reshape the rows of a table to a regular grid of the values of two of its columns.
+
+    E.g. BoltzWann writes the chemical potential in the inner loop and the temperature
+    in the outer one, but the order of the two loops is detected from the data.
+
+    :param table: the 2D array of the table.
+    :param first_index: the index of the column of the first axis.
+    :param second_index: the index of the column of the second axis.
+    :return: a 3D array of shape ``(n_first, n_second, num_columns)``.
+    :raise ValueError: if the rows do not form a regular grid.
+    """
+    num_rows = len(table)
+    first_inner = num_rows > 1 and table[1, first_index] != table[0, first_index]
+    inner_index, outer_index = (
+        (first_index, second_index) if first_inner else (second_index, first_index)
+    )
+    changes = np.flatnonzero(table[:, outer_index] != table[0, outer_index])
+    num_inner = changes[0] if len(changes) else num_rows
+    if num_inner == 0 or num_rows % num_inner:
+        raise ValueError(f"{num_rows} rows do not form a regular grid")
+
+    grid = table.reshape(num_rows // num_inner, num_inner, -1)
+    if np.any(grid[:, :, inner_index] != grid[:1, :, inner_index]) or np.any(
+        grid[:, :, outer_index] != grid[:, :1, outer_index]
+    ):
+        raise ValueError("The rows do not form a regular grid")
+    return grid.swapaxes(0, 1) if first_inner else grid
+
+
+def _get_table_tensors(
+    table: np.ndarray, column_names: ty.Sequence[str]
+) -> ty.Dict[str, np.ndarray]:
+    """Return the arrays of a postw90 table in the tensor layout.
+
+    The columns of the axes (e.g. ``Mu`` and ``Temp``) become 1D arrays (e.g. ``mu`` and
+    ``temperature``), and the components ``<name>_xx``, ``<name>_xy``, ... of each
+    quantity are gathered in a dense ``<name>`` tensor, e.g. of shape ``(n_mu, n_T, 3, 3)``.
+    Tables with a single axis (e.g. the ``Energy`` of the ``_tdf.dat`` file) give tensors
+    of shape ``(n_energy, 3, 3)``; if no column is a known axis, the first one is used.
+    The components that are not in the file are taken from the transposed ones, i.e. the
+    tensors written with only 6 components are symmetric. The other columns (if any) are
+    reshaped to the grid.
+
+    :param table: the 2D array of the table.
+    :param column_names: the names of the columns.
+    :return: a dictionary with the arrays.
+    :raise ValueError: if there are two axes, and the rows do not form a regular grid.
+    """
+    axis_names = [name for name in column_names if name in _TABLE_AXES][:2] or list(
+        column_names[:1]
+    )
+    axis_indices = [column_names.index(name) for name in axis_names]
+    if len(axis_names) == 2:
+        grid = _get_grid(table, *axis_indices)
+        axes = (grid[:, 0, axis_indices[0]], grid[0, :, axis_indices[1]])
+    else:
+        grid = table
+        axes = (table[:, axis_indices[0]],)
+    arrays = {
+        _get_axis_name(name): np.ascontiguousarray(axis)
+        for name, axis in zip(axis_names, axes)
+    }
+
+    components = {}
+    for index, name in enumerate(column_names):
+        if name in axis_names:
+            continue
+        quantity, _, component = name.rpartition("_")
+        if quantity and component in _TENSOR_COMPONENTS:
+            components.setdefault(quantity, []).append(
+                (index,) + _TENSOR_COMPONENTS[component]
+            )
+        else:
+            arrays[name] = np.ascontiguousarray(grid[..., index])
+
+    for quantity, indices in components.items():
+        columns, rows, cols = (list(values) for values in zip(*indices))
+        tensor = np.full(grid.shape[:-1] + (3, 3), np.nan)
+        values = grid[..., columns]
+        # The missing components are taken from the transposed ones
+        tensor[..., cols, rows] = values
+        tensor[..., rows, cols] = values
+        arrays[quantity] = tensor
+    return arrays
+
+
 def raw_boltzdos_dat_parser(handle: ty.TextIO) -> ty.Union[np.ndarray, dict]:
     """Parse boltzdos.dat file."""
     # useless header
@@ -362,123 +610,102 @@ def raw_boltzdos_dat_parser(handle: ty.TextIO) -> ty.Union[np.ndarray, dict]:
                 "fixed_smearing_width_unit": "eV",
             }
         )
-    energy_dos = np.loadtxt(handle)
+    energy_dos, _ = _load_dat_table(handle, ["Energy", "DOS"])
     return energy_dos, attrs
 
 
 def raw_elcond_dat_parser(handle: ty.TextIO) -> ty.Union[np.ndarray, list, dict]:
     """Parse elcond.dat file."""
-    # useless header
+    # Header:
     # Written by the BoltzWann module of the Wannier90 code.
-    handle.readline()
     # [Electrical conductivity in SI units, i.e. in 1/Ohm/m]
-    line = handle.readline()
-    assert (
-        line.strip() == "# [Electrical conductivity in SI units, i.e. in 1/Ohm/m]"
-    ), line
     # Mu(eV) Temp(K) ElCond_xx ElCond_xy ElCond_yy ElCond_xz ElCond_yz ElCond_zz
-    handle.readline()
-
     attrs = {
         "Mu_unit": "eV",
         "Temp_unit": "K",
         "ElCond_unit": "1/Ohm/m",
     }
-    elcond = np.loadtxt(handle)
-    column_names = [
-        "Mu",
-        "Temp",
-        "ElCond_xx",
-        "ElCond_xy",
-        "ElCond_yy",
-        "ElCond_xz",
-        "ElCond_yz",
-        "ElCond_zz",
-    ]
+    elcond, column_names = _load_dat_table(
+        handle,
+        [
+            "Mu",
+            "Temp",
+            "ElCond_xx",
+            "ElCond_xy",
+            "ElCond_yy",
+            "ElCond_xz",
+            "ElCond_yz",
+            "ElCond_zz",
+        ],
+    )
     return elcond, column_names, attrs
 
 
 def raw_kappa_dat_parser(handle: ty.TextIO) -> ty.Union[np.ndarray, list, dict]:
     """Parse kappa.dat file."""
-    # useless header
+    # Header:
     # Written by the BoltzWann module of the Wannier90 code.
-    handle.readline()
     # [K coefficient in SI units, i.e. in W/m/K]
-    line = handle.readline()
-    assert line.strip() == "# [K coefficient in SI units, i.e. in W/m/K]"
     # [the K coefficient is defined in the documentation, and is an ingredient of
     #  the thermal conductivity. See the docs for further information.]
-    handle.readline()
-    handle.readline()
     # Mu(eV) Temp(K) Kappa_xx Kappa_xy Kappa_yy Kappa_xz Kappa_yz Kappa_zz
-    handle.readline()
-
     attrs = {
         "Mu_unit": "eV",
         "Temp_unit": "K",
         "ElCond_unit": "W/m/K",
     }
-    kappa = np.loadtxt(handle)
-    column_names = [
-        "Mu",
-        "Temp",
-        "Kappa_xx",
-        "Kappa_xy",
-        "Kappa_yy",
-        "Kappa_xz",
-        "Kappa_yz",
-        "Kappa_zz",
-    ]
+    kappa, column_names = _load_dat_table(
+        handle,
+        [
+            "Mu",
+            "Temp",
+            "Kappa_xx",
+            "Kappa_xy",
+            "Kappa_yy",
+            "Kappa_xz",
+            "Kappa_yz",
+            "Kappa_zz",
+        ],
+    )
     return kappa, column_names, attrs
 
 
 def raw_seebeck_dat_parser(handle: ty.TextIO) -> ty.Union[np.ndarray, list, dict]:
     """Parse seebeck.dat file."""
-    # useless header
+    # Header:
     # Written by the BoltzWann module of the Wannier90 code.
-    handle.readline()
     # [Seebeck coefficient in SI units, i.e. in V/K]
-    line = handle.readline()
-    assert line.strip() == "# [Seebeck coefficient in SI units, i.e. in V/K]"
     # Mu(eV) Temp(K) Seebeck_xx Seebeck_xy Seebeck_xz Seebeck_yx Seebeck_yy Seebeck_yz Seebeck_zx Seebeck_zy Seebeck_zz
-    handle.readline()
-
     attrs = {
         "Mu_unit": "eV",
         "Temp_unit": "K",
         "Seebeck_unit": "V/K",
     }
-    seebeck = np.loadtxt(handle)
-    column_names = [
-        "Mu",
-        "Temp",
-        "Seebeck_xx",
-        "Seebeck_xy",
-        "Seebeck_xz",
-        "Seebeck_yx",
-        "Seebeck_yy",
-        "Seebeck_yz",
-        "Seebeck_zx",
-        "Seebeck_zy",
-        "Seebeck_zz",
-    ]
+    seebeck, column_names = _load_dat_table(
+        handle,
+        [
+            "Mu",
+            "Temp",
+            "Seebeck_xx",
+            "Seebeck_xy",
+            "Seebeck_xz",
+            "Seebeck_yx",
+            "Seebeck_yy",
+            "Seebeck_yz",
+            "Seebeck_zx",
+            "Seebeck_zy",
+            "Seebeck_zz",
+        ],
+    )
     return seebeck, column_names, attrs
 
 
 def raw_sigmas_dat_parser(handle: ty.TextIO) -> ty.Union[np.ndarray, list, dict]:
     """Parse sigmas.dat file."""
-    # useless header
+    # Header:
     # Written by the BoltzWann module of the Wannier90 code.
-    handle.readline()
     # [(Electrical conductivity * Seebeck coefficient) in SI units, i.e. in Ampere/m/K]
-    line = handle.readline()
-    assert (
-        line.strip()
-        == "# [(Electrical conductivity * Seebeck coefficient) in SI units, i.e. in Ampere/m/K]"
-    )
     # Mu(eV) Temp(K) (Sigma*S)_xx (Sigma*S)_xy (Sigma*S)_yy (Sigma*S)_xz (Sigma*S)_yz (Sigma*S)_zz
-    handle.readline()
-
     attrs = {
         "Mu_unit": "eV",
         "Temp_unit": "K",
@@ -486,50 +713,279 @@ def raw_sigmas_dat_parser(handle: ty.TextIO) -> ty.Union[np.ndarray, list, dict]
         # "(Sigma*S)_unit": "V/K",
         "SigmaS_unit": "V/K",
     }
-    sigmas = np.loadtxt(handle)
-    column_names = [
-        "Mu",
-        "Temp",
-        "SigmaS_xx",  # "(Sigma*S)_xx",
-        "SigmaS_xy",  # "(Sigma*S)_xy",
-        "SigmaS_yy",  # "(Sigma*S)_yy",
-        "SigmaS_xz",  # "(Sigma*S)_xz",
-        "SigmaS_yz",  # "(Sigma*S)_yz",
-        "SigmaS_zz",  # "(Sigma*S)_zz",
-    ]
+    # The `(Sigma*S)_xx` columns are named `SigmaS_xx`
+    sigmas, column_names = _load_dat_table(
+        handle,
+        [
+            "Mu",
+            "Temp",
+            "SigmaS_xx",
+            "SigmaS_xy",
+            "SigmaS_yy",
+            "SigmaS_xz",
+            "SigmaS_yz",
+            "SigmaS_zz",
+        ],
+    )
     return sigmas, column_names, attrs
 
 
 def raw_tdf_dat_parser(handle: ty.TextIO) -> ty.Union[np.ndarray, list, dict]:
-    """Parse tdf.dat file."""
-    # useless header
+    """Parse tdf.dat file.
+
+    If the spin decomposition is written, the 12 further columns are named
+    ``TDF_up_xx``, ... ``TDF_down_zz``, and the ``spin_decomposition`` attribute is ``True``.
+    """
+    # Header:
     # Written by the BoltzWann module of the Wannier90 code.
-    handle.readline()
     # Transport distribution function (in units of 1/hbar^2 * eV * fs / angstrom) vs energy in eV
-    line = handle.readline()
-    assert (
-        line.strip()
-        == "# Transport distribution function (in units of 1/hbar^2 * eV * fs / angstrom) vs energy in eV"
-    )
     # Content of the columns:
     # Energy TDF_xx TDF_xy TDF_yy TDF_xz TDF_yz TDF_zz
     #   (if spin decomposition is required, 12 further columns are provided, with the 6
     #    components of the TDF for the spin up, followed by those for the spin down)
-    for _ in range(4):
-        handle.readline()
-
     attrs = {
         "Energy_unit": "eV",
         "TDF_unit": "1/hbar^2 * eV * fs / angstrom",
     }
-    tdf = np.loadtxt(handle)
-    column_names = [
-        "Energy",
-        "TDF_xx",
-        "TDF_xy",
-        "TDF_yy",
-        "TDF_xz",
-        "TDF_yz",
-        "TDF_zz",
+    components = ["xx", "xy", "yy", "xz", "yz", "zz"]
+    tdf, column_names = _load_dat_table(
+        handle, ["Energy"] + [f"TDF_{component}" for component in components]
+    )
+    # The 12 spin-decomposed columns are not named in the header
+    spin_names = [
+        f"TDF_{spin}_{component}" for spin in ("up", "down") for component in components
     ]
+    attrs["spin_decomposition"] = column_names[7:] == [
+        f"column_{index}" for index in range(7, 7 + len(spin_names))
+    ]
+    if attrs["spin_decomposition"]:
+        column_names[7:] = spin_names
     return tdf, column_names, attrs
+
+
+# The Levi-Civita symbol, to build an antisymmetric tensor from its pseudovector:
+# `tensor[i, j] = sum_k epsilon[i, j, k] vector[k]`, e.g. `tensor[x, y] = vector[z]`
+_LEVI_CIVITA = np.zeros((3, 3, 3))
+_LEVI_CIVITA[[0, 1, 2], [1, 2, 0], [2, 0, 1]] = 1
+_LEVI_CIVITA[[0, 1, 2], [2, 0, 1], [1, 2, 0]] = -1
+
+
+def _load_fermiscan(handle: ty.TextIO, quantity: str) -> np.ndarray:
+    """Load a ``-fermiscan.dat`` table of the berry module, without header.
+
+    :return: the 2D array with the Fermi energies and the x, y, z components of ``quantity``.
+    :raise ValueError: if the table does not have 4 columns.
+    """
+    table, column_names = _load_dat_table(
+        handle, ["EFERMI"] + [f"{quantity}_{axis}" for axis in "xyz"]
+    )
+    if len(column_names) != 4:
+        raise ValueError(f"Found {len(column_names)} columns instead of 4")
+    return table
+
+
+def raw_ahc_fermiscan_dat_parser(handle: ty.TextIO) -> ty.Tuple[dict, dict]:
+    """Parse the -ahc-fermiscan.dat file of the berry module (``berry_task = ahc``).
+
+    Each row contains a Fermi energy and the x, y, z components of the anomalous Hall
+    conductivity pseudovector, i.e. sigma_yz, sigma_zx and sigma_xy.
+
+    :return: a tuple with the dictionary of the arrays ``fermi_energy`` (n_EF) and ``ahc``
+        (the antisymmetric tensor, n_EF x 3 x 3), and the dictionary of the units.
+    """
+    table = _load_fermiscan(handle, "AHC")
+    arrays = {
+        "fermi_energy": np.ascontiguousarray(table[:, 0]),
+        "ahc": np.einsum("ijk,nk->nij", _LEVI_CIVITA, table[:, 1:]),
+    }
+    attrs = {"fermi_energy_unit": "eV", "ahc_unit": "S/cm"}
+    return arrays, attrs
+
+
+def raw_morb_fermiscan_dat_parser(handle: ty.TextIO) -> ty.Tuple[dict, dict]:
+    """Parse the -morb-fermiscan.dat file of the berry module (``berry_task = morb``).
+
+    Each row contains a Fermi energy and the x, y, z components of the orbital magnetisation.
+
+    :return: a tuple with the dictionary of the arrays ``fermi_energy`` (n_EF) and ``morb``
+        (n_EF x 3), and the dictionary of the units.
+    """
+    table = _load_fermiscan(handle, "Morb")
+    arrays = {
+        "fermi_energy": np.ascontiguousarray(table[:, 0]),
+        "morb": np.ascontiguousarray(table[:, 1:]),
+    }
+    attrs = {"fermi_energy_unit": "eV", "morb_unit": "bohr_magneton/cell"}
+    return arrays, attrs
+
+
+def raw_kubo_dat_parser(
+    handles: ty.Mapping[str, ty.TextIO], jdos_handle: ty.Optional[ty.TextIO] = None
+) -> ty.Tuple[dict, dict]:
+    """Parse the -kubo_S_<ab>.dat and -kubo_A_<ab>.dat files of the berry module (``berry_task = kubo``).
+
+    Each file contains the frequency and the real and imaginary parts of a component of
+    the symmetric (``S``) or antisymmetric (``A``) part of the optical conductivity;
+    if ``spin_decomp``, followed by those of the spin up and spin down contributions.
+
+    :param handles: the files, opened in text mode, by the part and the component of
+        the conductivity they contain, i.e. ``S_xx``, ``S_yy``, ``S_zz``, ``S_xy``,
+        ``S_xz``, ``S_yz``, ``A_yz``, ``A_zx`` and ``A_xy``.
+    :param jdos_handle: the -jdos.dat file (if any), opened in text mode.
+    :return: a tuple with the dictionary of the arrays ``omega`` (n_omega) and the complex
+        ``sigma_symmetric`` and ``sigma_antisymmetric`` tensors (n_omega x 3 x 3), and if
+        ``spin_decomp`` also ``sigma_symmetric_up``, ``sigma_symmetric_down``, ...
+        (and ``jdos``, ``jdos_up``, ``jdos_down`` if the -jdos.dat file is given);
+        and the dictionary of the units.
+    :raise ValueError: if a file cannot be parsed.
+    """
+    arrays = {}
+    for name, handle in handles.items():
+        part, component = name.split("_")
+        table, column_names = _load_dat_table(handle, ["omega", "Re", "Im"])
+        if len(column_names) not in (3, 7):
+            raise ValueError(f"Found {len(column_names)} columns in the {name} file")
+        arrays.setdefault("omega", np.ascontiguousarray(table[:, 0]))
+        # The total, and the spin up and down contributions (if any)
+        values = table[:, 1::2] + 1j * table[:, 2::2]
+        i, j = _TENSOR_COMPONENTS[component]
+        sign = 1 if part == "S" else -1
+        prefix = "sigma_symmetric" if part == "S" else "sigma_antisymmetric"
+        for index, suffix in enumerate(("", "_up", "_down")[: values.shape[1]]):
+            tensor = arrays.setdefault(
+                prefix + suffix, np.zeros((len(table), 3, 3), dtype=complex)
+            )
+            tensor[:, i, j] = values[:, index]
+            tensor[:, j, i] = sign * values[:, index]
+
+    if jdos_handle is not None:
+        table, _ = _load_dat_table(jdos_handle, ["omega", "jdos"])
+        for index, suffix in enumerate(("", "_up", "_down")[: table.shape[1] - 1]):
+            arrays[f"jdos{suffix}"] = np.ascontiguousarray(table[:, 1 + index])
+
+    attrs = {
+        "omega_unit": "eV",
+        "sigma_symmetric_unit": "S/cm",
+        "sigma_antisymmetric_unit": "S/cm",
+    }
+    return arrays, attrs
+
+
+def raw_gyrotropic_dat_parser(handle: ty.TextIO, quantity: str) -> ty.Tuple[dict, dict]:
+    """Parse a -gyrotropic-<quantity>.dat file of the gyrotropic module.
+
+    The columns are named from the header, e.g. ``# EFERMI(eV) omega(eV) xx yy zz xy xz yz``:
+    the ``EFERMI`` and ``omega`` (if any) columns become the ``fermi_energy`` and ``omega``
+    axes, and the components of the tensor are gathered in a dense ``<quantity>`` tensor of
+    shape ``(n_EF, n_omega, 3, 3)`` (or ``(n_EF, 3, 3)``), symmetric if only 6 components
+    are written. Other columns, e.g. the ``x``, ``y``, ``z`` components of the
+    antisymmetric part, are stored as ``<quantity>_x``, ... with the shape of the grid.
+
+    :param handle: the file, opened in text mode.
+    :param quantity: the quantity in the name of the file, e.g. ``K_orb``.
+    :return: a tuple with the dictionary of the arrays, and the dictionary of the units.
+    :raise ValueError: if the table cannot be parsed.
+    """
+    table, column_names = _load_dat_table(handle, ["EFERMI"])
+    column_names = [
+        (
+            f"{quantity}_{name}"
+            if name in _TENSOR_COMPONENTS or name in ("x", "y", "z")
+            else name
+        )
+        for name in column_names
+    ]
+    arrays = _get_table_tensors(table, column_names)
+    attrs = {
+        f"{name}_unit": "eV" for name in ("fermi_energy", "omega") if name in arrays
+    }
+    return arrays, attrs
+
+
+def raw_shc_fermiscan_dat_parser(handle: ty.TextIO) -> ty.Tuple[dict, dict]:
+    """Parse the -shc-fermiscan.dat file of the berry module (``berry_task = shc``).
+
+    :return: a tuple with the dictionary of the arrays ``fermi_energy`` and ``shc``
+        (n_EF), and the dictionary of the units.
+    """
+    # No.  Fermi energy(eV)  SHC((hbar/e)*S/cm)
+    table, _ = _load_dat_table(handle, ["index", "EFERMI", "SHC"])
+    arrays = {
+        "fermi_energy": np.ascontiguousarray(table[:, 1]),
+        "shc": np.ascontiguousarray(table[:, 2]),
+    }
+    attrs = {"fermi_energy_unit": "eV", "shc_unit": "(hbar/e)*S/cm"}
+    return arrays, attrs
+
+
+def raw_shc_freqscan_dat_parser(handle: ty.TextIO) -> ty.Tuple[dict, dict]:
+    """Parse the -shc-freqscan.dat file of the berry module (``shc_freq_scan = .true.``).
+
+    :return: a tuple with the dictionary of the arrays ``omega`` and the complex ``shc``
+        (n_omega), and the dictionary of the units.
+    """
+    # No.  Frequency(eV)  Re(sigma)((hbar/e)*S/cm)  Im(sigma)((hbar/e)*S/cm)
+    table, _ = _load_dat_table(handle, ["index", "omega", "Re", "Im"])
+    arrays = {
+        "omega": np.ascontiguousarray(table[:, 1]),
+        "shc": table[:, 2] + 1j * table[:, 3],
+    }
+    attrs = {"omega_unit": "eV", "shc_unit": "(hbar/e)*S/cm"}
+    return arrays, attrs
+
+
+def _read_dat_file(filepath, raw_parser):
+    """Open a postw90 output file and return the result of its raw parser."""
+    with open(filepath, encoding="utf-8") as handle:
+        return raw_parser(handle)
+
+
+def _read_kubo_files(folder, seedname, read_jdos):
+    """Open the -kubo_*.dat (and -jdos.dat) files and return the result of `raw_kubo_dat_parser`."""
+    with contextlib.ExitStack() as stack:
+        handles = {
+            name: stack.enter_context(
+                open(folder / f"{seedname}-kubo_{name}.dat", encoding="utf-8")
+            )
+            for name in _KUBO_COMPONENTS
+        }
+        jdos_handle = None
+        if read_jdos:
+            jdos_handle = stack.enter_context(
+                open(folder / f"{seedname}-jdos.dat", encoding="utf-8")
+            )
+        return raw_kubo_dat_parser(handles, jdos_handle)
+
+
+# The BoltzWann DOS file (only written if `boltz_calc_also_dos`): the suffix of the file,
+# its parser and the link label of the output
+_BOLTZDOS_FILE = ("_boltzdos.dat", raw_boltzdos_dat_parser, "boltzwann.boltzdos")
+# The BoltzWann output tables: the suffix of the file, its parser and the link label of the output
+_BOLTZWANN_TABLES = (
+    ("_elcond.dat", raw_elcond_dat_parser, "boltzwann.elcond"),
+    ("_kappa.dat", raw_kappa_dat_parser, "boltzwann.kappa"),
+    ("_seebeck.dat", raw_seebeck_dat_parser, "boltzwann.seebeck"),
+    ("_sigmas.dat", raw_sigmas_dat_parser, "boltzwann.sigmas"),
+    ("_tdf.dat", raw_tdf_dat_parser, "boltzwann.tdf"),
+)
+
+# The outputs of the berry module, parsed if the files are found: the suffix of the file,
+# its parser and the link label of the output
+_BERRY_FILES = (
+    ("-ahc-fermiscan.dat", raw_ahc_fermiscan_dat_parser, "berry.ahc"),
+    ("-morb-fermiscan.dat", raw_morb_fermiscan_dat_parser, "berry.morb"),
+    ("-shc-fermiscan.dat", raw_shc_fermiscan_dat_parser, "berry.shc_fermiscan"),
+    ("-shc-freqscan.dat", raw_shc_freqscan_dat_parser, "berry.shc_freqscan"),
+)
+# The parts and components of the optical conductivity in the -kubo_*.dat files
+_KUBO_COMPONENTS = (
+    "S_xx",
+    "S_yy",
+    "S_zz",
+    "S_xy",
+    "S_xz",
+    "S_yz",
+    "A_yz",
+    "A_zx",
+    "A_xy",
+)
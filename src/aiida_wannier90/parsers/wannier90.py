@@ -8,16 +8,56 @@
 ################################################################################
 """Parser for the `Wannier90Calculation`."""
 import os
+import re
+
+import numpy as np
 
 from aiida.common import exceptions as exc
 from aiida.parsers import Parser
 
+from ..io import (
+    read_bxsf,
+    read_centres_xyz,
+    read_chk,
+    read_cube,
+    read_hr,
+    read_nnkp,
+    read_tb,
+    read_u_mat,
+    read_wsvec,
+    read_xsf,
+)
+from ._stdout import StdoutErrors, check_stdout_tail
+
 __all__ = (
     "Wannier90Parser",
     "band_parser",
     "raw_wout_parser",
 )
 
+# Output files parsed into ``ArrayData`` output nodes: the suffix of the file,
+# the reader from ``aiida_wannier90.io``, the link label of the output, and the
+# keyword arguments of the reader that can be set in the ``parser_options``
+# (mapped to the name of the corresponding parser option).
+_ARRAY_OUTPUT_FILES = (
+    ("_hr.dat", read_hr, "real_space_hamiltonian", {}),
+    ("_tb.dat", read_tb, "tight_binding", {}),
+    ("_wsvec.dat", read_wsvec, "ws_vectors", {}),
+    ("_u.mat", read_u_mat, "u_matrix", {}),
+    ("_u_dis.mat", read_u_mat, "u_dis_matrix", {}),
+    (".nnkp", read_nnkp, "nnkp", {}),
+    ("_centres.xyz", read_centres_xyz, "wannier_centres", {}),
+    (".bxsf", read_bxsf, "fermi_surface", {"dtype": "fermi_surface_dtype"}),
+)
+
+# Readers of the plots of the Wannier functions (`wannier_plot = .true.`), that are
+# written to `{seedname}_{index:05d}.xsf` or `.cube` depending on `wannier_plot_format`
+_WANNIER_PLOT_READERS = {"xsf": read_xsf, "cube": read_cube}
+
+_WF_LINE_REGEX = re.compile(
+    r"WF centre and spread\s+(\d+)\s+\(([^,]*),([^,]*),([^)]*)\)\s*(\S+)"
+)
+
 
 class Wannier90Parser(Parser):
     """Wannier90 output parser.
@@ -53,6 +93,124 @@ class Wannier90Parser(Parser):
             "so I don't know how to get the seedname"
         )
 
+    def _get_parser_options(self):
+        """Return the ``parser_options`` in the input ``settings``, or an empty dictionary."""
+        if "settings" not in self.node.inputs:
+            return {}
+        return self.node.inputs.settings.get_dict().get("parser_options", {})
+
+    def _open_output_file(self, filename, temporary_folder, mode="r"):
+        """Open an output file, or return ``None`` if it is not present.
+
+        The file is looked for in the ``retrieved`` folder first, and then in the
+        temporary folder (for the files in the ``retrieve_temporary_list``).
+
+        :param mode: the mode to open the file with, ``"r"`` (text) or ``"rb"`` (binary).
+        """
+        if filename in self.retrieved.base.repository.list_object_names():
+            return self.retrieved.base.repository.open(filename, mode)
+        if temporary_folder is not None:
+            filepath = os.path.join(temporary_folder, filename)
+            if os.path.isfile(filepath):
+                encoding = None if "b" in mode else "utf-8"
+                return open(  # pylint: disable=consider-using-with
+                    filepath, mode, encoding=encoding
+                )
+        return None
+
+    def _parse_array_outputs(self, seedname, temporary_folder):
+        """Parse the output files in ``_ARRAY_OUTPUT_FILES`` into ``ArrayData`` outputs.
+
+        :return: a list of warnings for the files that could not be parsed.
+        """
+        parser_options = self._get_parser_options()
+        warnings = []
+        for suffix, reader, link_label, reader_options in _ARRAY_OUTPUT_FILES:
+            filename = f"{seedname}{suffix}"
+            handle = self._open_output_file(filename, temporary_folder)
+            if handle is None:
+                continue
+            kwargs = {
+                key: parser_options[option]
+                for key, option in reader_options.items()
+                if option in parser_options
+            }
+            try:
+                with handle as stream:
+                    arrays = reader(stream, **kwargs)
+            except (ValueError, IndexError) as exception:
+                warnings.append(f"Could not parse the {filename} file: {exception}")
+                continue
+            self.out(link_label, _get_array_data(arrays))
+        return warnings
+
+    def _list_output_files(self, temporary_folder):
+        """Return the names of the files in the ``retrieved`` and in the temporary folder."""
+        filenames = set(self.retrieved.base.repository.list_object_names())
+        if temporary_folder is not None and os.path.isdir(temporary_folder):
+            filenames.update(os.listdir(temporary_folder))
+        return sorted(filenames)
+
+    def _parse_wannier_plots(self, seedname, temporary_folder):
+        """Parse the plots of the Wannier functions into the ``wannier_plots`` outputs.
+
+        The ``wannier_plot_dtype`` and ``wannier_plot_stride`` parser options set the
+        dtype of the grids and their downsampling, see :func:`aiida_wannier90.io.read_xsf`.
+
+        :return: a list of warnings for the files that could not be parsed.
+        """
+        parser_options = self._get_parser_options()
+        kwargs = {
+            "dtype": parser_options.get("wannier_plot_dtype", float),
+            "stride": parser_options.get("wannier_plot_stride", 1),
+        }
+        regex = re.compile(
+            rf"{re.escape(seedname)}_(\d+)\.({'|'.join(_WANNIER_PLOT_READERS)})"
+        )
+        warnings = []
+        wannier_plots = {}
+        for filename in self._list_output_files(temporary_folder):
+            match = regex.fullmatch(filename)
+            if match is None:
+                continue
+            handle = self._open_output_file(filename, temporary_folder)
+            try:
+                with handle as stream:
+                    arrays = _WANNIER_PLOT_READERS[match.group(2)](stream, **kwargs)
+            except (ValueError, IndexError) as exception:
+                warnings.append(f"Could not parse the {filename} file: {exception}")
+                continue
+            wannier_plots[f"wf_{match.group(1)}"] = _get_array_data(arrays)
+        if wannier_plots:
+            self.out("wannier_plots", wannier_plots)
+        return warnings
+
+    def _parse_checkpoint(self, seedname, temporary_folder):
+        """Parse the ``.chk`` file, retrieved with ``retrieve_checkpoint``, into the ``checkpoint`` output.
+
+        The file is read from the temporary folder, so that its matrices are memory-mapped
+        rather than loaded in memory. The overlap matrices ``m_matrix`` are not stored.
+
+        :return: a list of warnings if the file could not be parsed.
+        """
+        if temporary_folder is None:
+            return []
+        filepath = os.path.join(temporary_folder, f"{seedname}.chk")
+        if not os.path.isfile(filepath):
+            return []
+        try:
+            arrays = read_chk(filepath)
+        except (ValueError, IndexError) as exception:
+            return [f"Could not parse the {seedname}.chk file: {exception}"]
+        # The integers and the checkpoint string are stored as 0-d arrays
+        self.out(
+            "checkpoint",
+            _get_array_data(
+                {name: np.asarray(value) for name, value in arrays.items()}
+            ),
+        )
+        return []
+
     def parse(self, **kwargs):  # pylint: disable=inconsistent-return-statements
         """Parse the datafolder, stores results.
 
@@ -60,8 +218,6 @@ class Wannier90Parser(Parser):
         representing the file of forces in real space.
         """
         # pylint: disable=too-many-return-statements,too-many-statements
-        import re
-
         from aiida.orm import Dict, SinglefileData
 
         # None if unset
@@ -77,49 +233,50 @@ class Wannier90Parser(Parser):
         # select the folder object
         # Check that the retrieved folder is there
         try:
-            out_folder = self.retrieved
+            self.retrieved  # pylint: disable=pointless-statement
         except exc.NotExistent:
             return self.exit_codes.ERROR_NO_RETRIEVED_FOLDER
 
-        exiting_in_stdout = False
+        # The stdout, the .werr and the band files are also parsed if they
+        # were only retrieved temporarily, see `temporary_retrieve_list`
+        handle = self._open_output_file(output_file_name, temporary_folder, "rb")
+        if handle is None:
+            self.logger.error("Standard output file could not be found.")
+            return self.exit_codes.ERROR_OUTPUT_STDOUT_MISSING
         try:
-            with out_folder.base.repository.open(output_file_name) as handle:
-                out_file = handle.readlines()
-            # Wannier90 doesn't always write the .werr file on error
-            for line in out_file:
-                if "Exiting......" in line:
-                    exiting_in_stdout = True
-                if "Unable to satisfy B1" in line:
-                    return self.exit_codes.ERROR_BVECTORS
-                if "kmesh_get_bvector: Not enough bvectors found" in line:
-                    return self.exit_codes.ERROR_BVECTORS
-                if (
-                    "kmesh_get: something wrong, found too many nearest neighbours"
-                    in line
-                ):
-                    return self.exit_codes.ERROR_BVECTORS
-                err_msg = (
-                    "Energy window contains fewer states than number of target WFs, "
-                    "consider reducing dis_proj_min/increasing dis_win_max?"
+            # Check first only the end of the stdout, to avoid reading
+            # a possibly huge file if the calculation did not complete
+            with handle as stream:
+                stdout_error = check_stdout_tail(
+                    stream,
+                    completed_lines=(
+                        f"Exiting... {seedname}.nnkp written.",
+                        "All done: wannier90 exiting",
+                    ),
                 )
-                if err_msg in line:
-                    return self.exit_codes.ERROR_DISENTANGLEMENT_NOT_ENOUGH_STATES
-                if "Error plotting WF cube. Try one of the following:" in line:
-                    return self.exit_codes.ERROR_PLOT_WF_CUBE
-            if len(out_file) == 0:
-                return self.exit_codes.ERROR_OUTPUT_STDOUT_INCOMPLETE
-            if out_file[-1].strip() not in (
-                f"Exiting... {seedname}.nnkp written.",
-                "All done: wannier90 exiting",
-            ):
-                return self.exit_codes.ERROR_OUTPUT_STDOUT_INCOMPLETE
+            if stdout_error is not None:
+                return self.exit_codes[stdout_error]
+            with self._open_output_file(output_file_name, temporary_folder) as handle:
+                # Errors and the parsed data are collected in a single pass,
+                # so that the (possibly huge) stdout is never loaded in memory
+                (
+                    wout_dictionary,
+                    wannier_functions,
+                    convergence,
+                    stdout_errors,
+                ) = _parse_wout_stream(handle)
         except OSError:
             self.logger.error("Standard output file could not be found.")
             return self.exit_codes.ERROR_OUTPUT_STDOUT_MISSING
 
+        # Wannier90 doesn't always write the .werr file on error
+        if stdout_errors.error is not None:
+            return self.exit_codes[stdout_errors.error]
+
         # Checks for error output files
         # This is after the check of stdout, since stdout might give more verbose exit code.
-        if error_file_name in out_folder.base.repository.list_object_names():
+        output_filenames = self._list_output_files(temporary_folder)
+        if error_file_name in output_filenames:
             self.logger.error(
                 "Errors were found please check the retrieved "
                 f"{error_file_name} file"
@@ -129,7 +286,7 @@ class Wannier90Parser(Parser):
         # Some times the error files are aiida.node_XXXXX.werr, ...
         # The XXXXX are 5-digit index of processor
         error_file_name = re.compile(seedname + r".+?\.werr")
-        for filename in out_folder.base.repository.list_object_names():
+        for filename in output_filenames:
             if error_file_name.match(filename):
                 self.logger.error(
                     f"Errors were found please check the retrieved {filename} file"
@@ -144,23 +301,22 @@ class Wannier90Parser(Parser):
                     self.out("nnkp_file", node)
 
         # Tries to parse the bands
-        try:
-            with out_folder.base.repository.open(f"{seedname}_band.dat") as fil:
-                band_dat = fil.readlines()
-            with out_folder.base.repository.open(f"{seedname}_band.kpt") as fil:
-                band_kpt = fil.readlines()
-        except OSError:
-            # IOError: _band.* files not present
-            pass
-        else:
+        band_handles = [
+            self._open_output_file(f"{seedname}{suffix}", temporary_folder)
+            for suffix in ("_band.dat", "_band.kpt")
+        ]
+        if None not in band_handles:
+            # The files are read as a whole and parsed in bulk, see `_load_table`
+            with band_handles[0] as fil:
+                band_dat = fil.read()
+            with band_handles[1] as fil:
+                band_kpt = fil.read()
             structure = self.node.inputs.structure
             ## TODO: should we catch exceptions here?
-            try:
-                with out_folder.base.repository.open(
-                    f"{seedname}_band.labelinfo.dat"
-                ) as fil:
-                    band_labelinfo = fil.readlines()
-            except OSError:  # use legacy parser for wannier90 < 3.0
+            handle = self._open_output_file(
+                f"{seedname}_band.labelinfo.dat", temporary_folder
+            )
+            if handle is None:  # use legacy parser for wannier90 < 3.0
                 try:
                     kpoint_path = self.node.inputs.kpoint_path
                     special_points = kpoint_path.get_dict()
@@ -174,13 +330,51 @@ class Wannier90Parser(Parser):
                     )
                     self.out("interpolated_bands", output_bandsdata)
             else:
+                with handle as stream:
+                    band_labelinfo = stream.readlines()
                 output_bandsdata, band_warnings = band_parser(
                     band_dat, band_kpt, band_labelinfo, structure
                 )
                 self.out("interpolated_bands", output_bandsdata)
 
-        # Parse the stdout an return the parsed data
-        wout_dictionary = raw_wout_parser(out_file)
+            # Written with `bands_plot_project`, in the same format as the _band.dat file
+            handle = self._open_output_file(
+                f"{seedname}_band_proj.dat", temporary_folder
+            )
+            if handle is not None:
+                with handle as stream:
+                    band_proj = stream.read()
+                projections = _get_band_projections(
+                    band_proj,
+                    num_kpoints=int(band_kpt.partition("\n")[0]),
+                    dtype=self._get_parser_options().get(
+                        "band_projections_dtype", float
+                    ),
+                )
+                self.out(
+                    "band_projections", _get_array_data({"projections": projections})
+                )
+
+        if convergence:
+            self.out("convergence", _get_array_data(convergence))
+
+        if self._get_parser_options().get("wannier_functions_as_array", False):
+            # Only the scalar quantities are kept in the output parameters
+            if wannier_functions:
+                self.out("wannier_functions", _get_array_data(wannier_functions))
+        else:
+            wout_dictionary.update(_get_wannier_functions_lists(wannier_functions))
+
+        wout_dictionary["warnings"].extend(
+            self._parse_array_outputs(seedname, temporary_folder)
+        )
+        wout_dictionary["warnings"].extend(
+            self._parse_wannier_plots(seedname, temporary_folder)
+        )
+        wout_dictionary["warnings"].extend(
+            self._parse_checkpoint(seedname, temporary_folder)
+        )
+
         try:
             wout_dictionary["warnings"].extend(band_warnings)
         except (KeyError, NameError):
@@ -190,27 +384,74 @@ class Wannier90Parser(Parser):
         output_data = Dict(wout_dictionary)
         self.out("output_parameters", output_data)
 
-        if exiting_in_stdout:
+        if stdout_errors.exiting:
             return self.exit_codes.ERROR_EXITING_MESSAGE_IN_STDOUT
 
 
-def raw_wout_parser(
-    wann_out_file,
-):  # pylint: disable=too-many-locals,too-many-statements
+def _get_array_data(arrays):
+    """Return an ``ArrayData`` with the given dictionary of numpy arrays."""
+    from aiida.orm import ArrayData
+
+    array_data = ArrayData()
+    for name, array in arrays.items():
+        array_data.set_array(name, array)
+    return array_data
+
+
+def raw_wout_parser(wann_out_file):
     """Parse a .wout file and return certain key parameters.
 
     E.g., the centers and spreads of the
     wannier90 functions, the Im/Re ratios, certain warnings,
     and labels indicating output files produced.
 
-    :param out_file: the .wout file, as a list of strings
+    :param wann_out_file: the .wout file, either as an open file handle or as
+        any other iterable of strings (e.g. a list of lines)
     :return out: a dictionary of parameters that can be stored as parameter data
     """
+    out, wannier_functions, _, _ = _parse_wout_stream(wann_out_file)
+    out.update(_get_wannier_functions_lists(wannier_functions))
+    return out
+
+
+def _parse_wout_stream(wann_out_file):  # pylint: disable=too-many-statements
+    """Parse a .wout file line by line, in a single pass.
+
+    The file is never loaded in memory as a whole: the parser is a small state
+    machine that knows in which section of the output (MAIN and WANNIERISE
+    parameters, Initial/Final State blocks, final spreads) the current line is.
+    Besides the parsed parameters, also the error messages of the stdout are
+    collected in the same pass.
+
+    :param wann_out_file: the .wout file, as an iterable of strings
+    :return: a tuple with the dictionary of parsed parameters (see :func:`raw_wout_parser`),
+        a dictionary of numpy arrays with the ids, centres, spreads and Im/Re ratios of the
+        initial and final Wannier functions (see :func:`_parse_wf_block`),
+        a dictionary of numpy arrays with the convergence of the disentanglement
+        and wannierisation iterations (see :func:`_parse_iterations`),
+        and a ``StdoutErrors`` with the error messages found in the stdout.
+    """
     w90_conv = False  # Used to assess convergence of MLWF procedure use conv_tol and conv_window>1
     w90_restart = False
+    im_re_ratios = {}
+    stdout_errors = StdoutErrors()
+    # Name of the section of the output being parsed, `None` if outside known sections
+    section = None
+    wf_block = []
+    wannier_functions = {}
+    # Rows of the disentanglement (`<-- DIS`) and wannierisation (`<-- CONV`) iterations
+    iteration_lines = {"DIS": [], "CONV": []}
     out = {}
     out.update({"warnings": []})
-    for i, line in enumerate(wann_out_file):
+    # Wannier90 doesn't always write the .werr file on error
+    for line in stdout_errors.iter_lines(wann_out_file):
+        if "<-- " in line:
+            tag = line.rsplit("<-- ", 1)[1].strip()
+            # Only the rows with the iterations, not the table headers
+            if tag in iteration_lines and line.split(None, 1)[0].isdigit():
+                iteration_lines[tag].append(line)
+                continue
+
         # checks for any warnings
         if "Warning" in line:
             # Certain warnings get a special flag
@@ -223,62 +464,84 @@ def raw_wout_parser(
         # not directly provided, e.g. unconvergerged wannierization needs
         # some logic in AiiDa to determine whether it met the convergence
         # target or not...
+        if section == "MAIN":
+            # Parses some of the MAIN parameters
+            if "Number of Wannier Functions" in line:
+                out.update({"number_wfs": int(line.split()[-2])})
+            if "Length Unit" in line:
+                out.update({"length_units": line.split()[-2]})
+                if out["length_units"] != "Ang":
+                    out["warnings"].append("Units not Ang, be sure this is OK!")
+            if "Output verbosity (1=low, 5=high)" in line:
+                out.update({"output_verbosity": int(line.split()[-2])})
+                if out["output_verbosity"] != 1:
+                    out["warnings"].append(
+                        "Parsing is only supported if output verbosity is set to 1"
+                    )
+            if "Post-processing" in line:
+                out.update({"preprocess_only": line.split()[-2]})
+            if "-----" in line:
+                section = None
+            continue
 
-        # Parses some of the MAIN parameters
-        if "MAIN" in line:
-            i += 1
-            line = wann_out_file[i]
-            while "-----" not in line:
-                line = wann_out_file[i]
-                if "Number of Wannier Functions" in line:
-                    out.update({"number_wfs": int(line.split()[-2])})
-                if "Length Unit" in line:
-                    out.update({"length_units": line.split()[-2]})
-                    if out["length_units"] != "Ang":
-                        out["warnings"].append("Units not Ang, be sure this is OK!")
-
-                if "Output verbosity (1=low, 5=high)" in line:
-                    out.update({"output_verbosity": int(line.split()[-2])})
-                    if out["output_verbosity"] != 1:
-                        out["warnings"].append(
-                            "Parsing is only supported "
-                            "if output verbosity is set to 1"
-                        )
-                if "Post-processing" in line:
-                    out.update({"preprocess_only": line.split()[-2]})
-                i += 1
-
-        # Parses some of the WANNIERISE parameters
-        if "WANNIERISE" in line:
-            i += 1
-            line = wann_out_file[i]
-            while "-----" not in line:
-                line = wann_out_file[i]
-                if "Convergence tolerence" in line:
-                    out.update({"convergence_tolerance": float(line.split()[-2])})
-                if "Write r^2_nm to file" in line:
-                    out.update({"r2mn_writeout": line.split()[-2]})
-                    if out["r2mn_writeout"] != "F":
-                        out["warnings"].append(
-                            "The r^2_nm file has been selected "
-                            "to be written, but this is not yet supported!"
-                        )
-
-                if "Write xyz WF centres to file" in line:
-                    out.update({"xyz_writeout": line.split()[-2]})
-                    if out["xyz_writeout"] != "F":
-                        out["warnings"].append(
-                            "The xyz_WF_center file has "
-                            "been selected to be written, but this is not "
-                            "yet supported!"
-                        )
-
-                i += 1
-        if "Wannierisation convergence criteria satisfied" in line:
-            w90_conv = True
+        if section == "WANNIERISE":
+            # Parses some of the WANNIERISE parameters
+            if "Convergence tolerence" in line:
+                out.update({"convergence_tolerance": float(line.split()[-2])})
+            if "Write r^2_nm to file" in line:
+                out.update({"r2mn_writeout": line.split()[-2]})
+                if out["r2mn_writeout"] != "F":
+                    out["warnings"].append(
+                        "The r^2_nm file has been selected "
+                        "to be written, but this is not yet supported!"
+                    )
+            if "Write xyz WF centres to file" in line:
+                out.update({"xyz_writeout": line.split()[-2]})
+                if out["xyz_writeout"] != "F":
+                    out["warnings"].append(
+                        "The xyz_WF_center file has "
+                        "been selected to be written, but this is not "
+                        "yet supported!"
+                    )
+            if "-----" in line:
+                section = None
+            continue
+
+        if section in ("Initial State", "Final State"):
+            if "WF centre and spread" in line:
+                wf_block.append(line)
+                continue
+            # The block of Wannier functions is over
+            if section == "Initial State":
+                wannier_functions.update(_parse_wf_block(wf_block, prefix="initial_"))
+                section = None
+            else:
+                wannier_functions.update(_parse_wf_block(wf_block))
+                # The final spreads follow the final centres
+                section = "Final spreads"
+            wf_block = []
+
+        if section == "Final spreads":
+            if "Omega I" in line:
+                out.update({"Omega_I": float(line.split()[-1])})
+            if "Omega D" in line:
+                out.update({"Omega_D": float(line.split()[-1])})
+            if "Omega OD" in line:
+                out.update({"Omega_OD": float(line.split()[-1])})
+            if "Omega Total" in line:
+                out.update({"Omega_total": float(line.split()[-1])})
+                section = None
+            if "-----" in line:
+                section = None
+            continue
 
-        # Reading the final WF, also checks to see if they converged or not
-        if "Final State" in line:
+        if "MAIN" in line:
+            section = "MAIN"
+        elif "WANNIERISE" in line:
+            section = "WANNIERISE"
+        elif "Initial State" in line:
+            section = "Initial State"
+        elif "Final State" in line:
             # Originally wanted to implement automatic convergence check
             # but parsing this using the version below fails depending
             # on the convergence settings used in the aiida.win file
@@ -289,124 +552,219 @@ def raw_wout_parser(
             #     if abs(Final_Delta) > out['convergence_tolerance']:
             #         out['Warnings'] += ['Wannierization not converged within '
             #         'specified tolerance!']
-            num_wf = out["number_wfs"]
-            wf_out = []
-            end_wf_loop = i + num_wf + 1
-            for i in range(i + 1, end_wf_loop):  # pylint: disable=redefined-outer-name
-                line = wann_out_file[i]
-                wf_out_i = {"wf_ids": "", "wf_centres": "", "wf_spreads": ""}
-                # wf_out_i['wf_ids'] = int(line.split()[-7])
-                wf_out_i["wf_ids"] = int(line.split("(")[0].split()[-1])
-                wf_out_i["wf_spreads"] = float(line.split(")")[1].strip())
-                # wf_out_i['wf_spreads'] = float(line.split()[-1])
-                try:
-                    x = float(line.split("(")[1].split(")")[0].split(",")[0].strip())
-                except (ValueError, IndexError):
-                    # To avoid that the crasher completely fails, we set None as a fallback
-                    x = None
-                try:
-                    y = float(line.split("(")[1].split(")")[0].split(",")[1].strip())
-                except (ValueError, IndexError):
-                    y = None
-                try:
-                    z = float(line.split("(")[1].split(")")[0].split(",")[2].strip())
-                except (ValueError, IndexError):
-                    z = None
-                coord = (x, y, z)
-                wf_out_i["wf_centres"] = coord
-                wf_out.append(wf_out_i)
-            out.update({"wannier_functions_output": wf_out})
-            for i in range(i + 2, i + 6):  # pylint: disable=redefined-outer-name
-                line = wann_out_file[i]
-                if "Omega I" in line:
-                    out.update({"Omega_I": float(line.split()[-1])})
-                if "Omega D" in line:
-                    out.update({"Omega_D": float(line.split()[-1])})
-                if "Omega OD" in line:
-                    out.update({"Omega_OD": float(line.split()[-1])})
-                if "Omega Total" in line:
-                    out.update({"Omega_total": float(line.split()[-1])})
-
-        # Reading the initial WF
-        if "Initial State" in line:
-            num_wf = out["number_wfs"]
-            wf_out = []
-            end_wf_loop = i + num_wf + 1
-            for j in range(i + 1, end_wf_loop):
-                line = wann_out_file[j]
-                wf_out_i = {"wf_ids": "", "wf_centres": "", "wf_spreads": ""}
-                # wf_out_i['wf_ids'] = int(line.split()[-7])
-                wf_out_i["wf_ids"] = int(line.split("(")[0].split()[-1])
-                wf_out_i["wf_spreads"] = float(line.split(")")[1].strip())
-                # wf_out_i['wf_spreads'] = float(line.split()[-1])
-                try:
-                    x = float(line.split("(")[1].split(")")[0].split(",")[0].strip())
-                except (ValueError, IndexError):
-                    # To avoid that the crasher completely fails, we set None as a fallback
-                    x = None
-                try:
-                    y = float(line.split("(")[1].split(")")[0].split(",")[1].strip())
-                except (ValueError, IndexError):
-                    y = None
-                try:
-                    z = float(line.split("(")[1].split(")")[0].split(",")[2].strip())
-                except (ValueError, IndexError):
-                    z = None
-                coord = (x, y, z)
-                wf_out_i["wf_centres"] = coord
-                wf_out.append(wf_out_i)
-            out.update({"wannier_functions_initial": wf_out})
+            section = "Final State"
+
+        if "Wannierisation convergence criteria satisfied" in line:
+            w90_conv = True
 
         if "Reading restart information from file" in line:
             w90_restart = True
-            # When restart for plotting WFs, there might be no `out['wannier_functions_output']`
-            wann_functions = []
 
         if " Maximum Im/Re Ratio" in line:
-            wann_id = int(line.split()[3])
-            wann_ratio = float(line.split()[-1])
-            if w90_restart:
-                wann_functions.append({"wf_ids": wann_id, "im_re_ratio": wann_ratio})
-            else:
-                wann_functions = out["wannier_functions_output"]
-                wann_function = wann_functions[wann_id - 1]
-                wann_function.update({"im_re_ratio": wann_ratio})
-    if w90_restart:
-        if "wannier_functions_output" not in out and len(wann_functions) > 0:
-            out["wannier_functions_output"] = wann_functions
-        else:
-            for wann_function in wann_functions:
-                wann_id = wann_function["wf_ids"]
-                wann_out = out["wannier_functions_output"][wann_id - 1]
-                if wann_out["wf_ids"] != wann_id:
-                    raise ValueError(
-                        f"Failed to parse `wannier_functions_output` for wf_ids = {wann_id}"
-                    )
-                wann_out.update(wann_functions)
+            im_re_ratios[int(line.split()[3])] = float(line.split()[-1])
+
+    # The file might end in the middle of a block of Wannier functions
+    if section == "Initial State":
+        wannier_functions.update(_parse_wf_block(wf_block, prefix="initial_"))
+    elif section == "Final State":
+        wannier_functions.update(_parse_wf_block(wf_block))
+
+    if im_re_ratios:
+        if "wf_ids" not in wannier_functions:
+            # When restart for plotting WFs, there might be no final Wannier functions
+            wannier_functions["wf_ids"] = np.array(list(im_re_ratios), dtype=int)
+        wannier_functions["im_re_ratio"] = np.array(
+            [
+                im_re_ratios.get(wann_id, np.nan)
+                for wann_id in wannier_functions["wf_ids"].tolist()
+            ]
+        )
     if not w90_restart and not w90_conv:
         out["warnings"].append("Wannierisation finished because num_iter was reached.")
+
+    convergence = {}
+    convergence.update(
+        _parse_iterations(
+            iteration_lines["DIS"],
+            ("iteration", "omega_i_previous", "omega_i", "delta", "time"),
+            prefix="dis_",
+        )
+    )
+    convergence.update(
+        _parse_iterations(
+            iteration_lines["CONV"],
+            ("iteration", "delta", "rms_gradient", "spread", "time"),
+            prefix="wannierise_",
+        )
+    )
+
+    return out, wannier_functions, convergence, stdout_errors
+
+
+def _parse_iterations(lines, columns, prefix):
+    """Parse the rows of a table of iterations, e.g. ``<-- CONV`` or ``<-- DIS``.
+
+    :param lines: the rows of the table, e.g.
+        ``      1    -0.940E+01     1.6567832715       49.5208508372       0.13  <-- CONV``
+    :param columns: the names of the numeric columns; the first one is the iteration index.
+    :param prefix: a prefix for the keys of the returned dictionary.
+    :return: a dictionary with a numpy array for each column, or an empty dictionary if
+        there are no rows. Values that cannot be parsed are set to NaN.
+    """
+    if not lines:
+        return {}
+    rows = np.array([line.split()[: len(columns)] for line in lines], dtype=str)
+    values = _strings_to_floats(rows)
+    convergence = {f"{prefix}{columns[0]}": rows[:, 0].astype(int)}
+    for idx, column in enumerate(columns[1:], start=1):
+        convergence[f"{prefix}{column}"] = values[:, idx]
+    return convergence
+
+
+def _parse_wf_block(lines, prefix=""):
+    """Parse a block of lines with the centres and spreads of the Wannier functions.
+
+    All the lines are parsed at once with a single regex, rather than line by line.
+
+    :param lines: the lines of the Initial/Final State blocks of the .wout file, e.g.
+        ``WF centre and spread    1  ( -0.866604,  1.973396,  1.973396 )     1.11712902``
+    :param prefix: a prefix for the keys of the returned dictionary.
+    :return: a dictionary with the numpy arrays ``wf_ids`` (N), ``centres`` (N x 3)
+        and ``spreads`` (N). Values that cannot be parsed are set to NaN.
+    """
+    rows = np.array(_WF_LINE_REGEX.findall("".join(lines)), dtype=str).reshape(-1, 5)
+    return {
+        f"{prefix}wf_ids": rows[:, 0].astype(int),
+        f"{prefix}centres": _strings_to_floats(rows[:, 1:4]),
+        f"{prefix}spreads": _strings_to_floats(rows[:, 4]),
+    }
+
+
+def _strings_to_floats(strings):
+    """Convert an array of strings to floats, setting NaN for the values that cannot be parsed.
+
+    E.g. Fortran prints asterisks for values that do not fit the format.
+    """
+    try:
+        return strings.astype(float)
+    except ValueError:
+
+        def _to_float(string):
+            try:
+                return float(string)
+            except ValueError:
+                return np.nan
+
+        return np.vectorize(_to_float, otypes=[float])(strings)
+
+
+def _get_wannier_functions_lists(wannier_functions):
+    """Convert the arrays of the Wannier functions to lists of dictionaries.
+
+    :param wannier_functions: the dictionary of arrays returned by :func:`_parse_wout_stream`.
+    :return: a dictionary with the ``wannier_functions_initial`` and ``wannier_functions_output``
+        lists (if available), where each Wannier function is a dictionary with its
+        ``wf_ids``, ``wf_centres``, ``wf_spreads`` and, if available, ``im_re_ratio``.
+    """
+    out = {}
+    for prefix, key in (
+        ("initial_", "wannier_functions_initial"),
+        ("", "wannier_functions_output"),
+    ):
+        if f"{prefix}wf_ids" not in wannier_functions:
+            continue
+        wf_out = [
+            {"wf_ids": wf_id} for wf_id in wannier_functions[f"{prefix}wf_ids"].tolist()
+        ]
+        if f"{prefix}centres" in wannier_functions:
+            for wf_out_i, centre, spread in zip(
+                wf_out,
+                wannier_functions[f"{prefix}centres"].tolist(),
+                wannier_functions[f"{prefix}spreads"].tolist(),
+            ):
+                # To avoid that the crasher completely fails, we set None as a fallback
+                wf_out_i["wf_centres"] = [None if np.isnan(x) else x for x in centre]
+                wf_out_i["wf_spreads"] = None if np.isnan(spread) else spread
+        if f"{prefix}im_re_ratio" in wannier_functions:
+            for wf_out_i, ratio in zip(
+                wf_out, wannier_functions[f"{prefix}im_re_ratio"].tolist()
+            ):
+                if not np.isnan(ratio):
+                    wf_out_i["im_re_ratio"] = ratio
+        out[key] = wf_out
     return out
 
 
+def _load_table(data, num_columns, skip_header=0):
+    """Load a whitespace-separated table of floats, keeping its first columns.
+
+    The whole content is parsed in a single call to ``np.fromstring`` and reshaped
+    with the number of columns of the first row, without creating a Python object
+    per line. Empty lines (e.g. between the bands in the _band.dat file) are ignored,
+    and columns beyond ``num_columns`` are dropped. If some value cannot be parsed
+    (e.g. Fortran asterisks), falls back to ``np.genfromtxt``, that sets it to NaN.
+
+    :param data: the content of the file, as a str or as a list of lines
+    :param num_columns: the number of columns to keep
+    :param skip_header: the number of lines to skip at the beginning
+    :return: a 2D numpy array with ``num_columns`` columns
+    :raise ValueError: if the table has less than ``num_columns`` columns
+    """
+    import warnings
+
+    if not isinstance(data, str):
+        data = "".join(data)
+    for _ in range(skip_header):
+        data = data.partition("\n")[2]
+
+    # The number of columns of the first non-empty row
+    start = 0
+    while True:
+        end = data.find("\n", start)
+        first_row = data[start:] if end < 0 else data[start:end]
+        if first_row.strip() or end < 0:
+            break
+        start = end + 1
+    file_columns = len(first_row.split())
+    if not file_columns:
+        return np.empty((0, num_columns))
+    if file_columns < num_columns:
+        raise ValueError(
+            f"Expected at least {num_columns} columns, but the first row has "
+            f"{file_columns}: {first_row.strip()!r}"
+        )
+
+    try:
+        with warnings.catch_warnings():
+            # Older numpy versions only emit a DeprecationWarning for unparsable data
+            warnings.simplefilter("error", DeprecationWarning)
+            values = np.fromstring(data, sep=" ")
+        return values.reshape(-1, file_columns)[:, :num_columns]
+    except (ValueError, DeprecationWarning):
+        return np.genfromtxt(
+            data.splitlines(), usecols=range(num_columns), ndmin=2
+        ).reshape(-1, num_columns)
+
+
 def band_parser(band_dat, band_kpt, band_labelinfo, structure):
     """Parser the bands output data to construct a BandsData object.
 
     Used for wannier90 >= 3.0
 
-    :param band_dat: list of str with each str stores one line of aiida_band.dat file
-    :param band_kpt: list of str with each str stores one line of aiida_band.kpt file
+    :param band_dat: content of the aiida_band.dat file, either as a str
+        or as a list of str with each str storing one line
+    :param band_kpt: content of the aiida_band.kpt file, either as a str
+        or as a list of str with each str storing one line
     :param band_labelinfo: list of str with each str stores one line in aiida_band.labelinfo.dat file
     :return: BandsData object constructed from the input params
     """
-    import numpy as np
-
     from aiida.orm import BandsData, KpointsData
 
     warnings = []
 
     # imports the data
-    out_kpt = np.genfromtxt(band_kpt, skip_header=1, usecols=(0, 1, 2))
-    out_dat = np.genfromtxt(band_dat, usecols=1)
+    out_kpt = _load_table(band_kpt, num_columns=4, skip_header=1)[:, :3]
+    out_dat = _load_table(band_dat, num_columns=2)[:, 1]
 
     # reshaps the output bands
     out_dat = out_dat.reshape(len(out_kpt), (len(out_dat) // len(out_kpt)), order="F")
@@ -451,6 +809,44 @@ def band_parser(band_dat, band_kpt, band_labelinfo, structure):
     return bands, warnings
 
 
+def _get_band_projections(band_proj, num_kpoints, dtype=float):
+    """Parse the content of the _band_proj.dat file.
+
+    The file has the same layout as the _band.dat file, with a third column containing
+    the projection of each interpolated band onto the Wannier functions listed in
+    ``bands_plot_project``.
+
+    :param band_proj: content of the _band_proj.dat file, either as a str
+        or as a list of str with each str storing one line
+    :param num_kpoints: the number of k-points of the path
+    :param dtype: the dtype of the returned array
+    :return: a (num_kpoints x num_bands) numpy array with the projections
+    """
+    projections = _load_table(band_proj, num_columns=3)[:, 2]
+    return projections.reshape(num_kpoints, -1, order="F").astype(dtype)
+
+
+def _find_special_points(kpoints, point_coords, atol=1.0e-5):
+    """Find the indices of the k-points that coincide with the special points.
+
+    Each special point is compared with all the k-points at once, rather than
+    one (label, k-point) pair at a time.
+
+    :param kpoints: a (N x 3) array with the k-points of the path
+    :param point_coords: a dictionary with the coordinates of each label
+    :param atol: absolute tolerance on each coordinate
+        (1e-5 because in the kpt file the coords are printed with fixed precision)
+    :return: a sorted list of ``(index, label)`` tuples
+    """
+    kpoints = np.asarray(kpoints)
+    labels = []
+    for label, coords in point_coords.items():
+        matches = np.all(np.abs(kpoints - np.asarray(coords)) <= atol, axis=1)
+        labels.extend((idx, label) for idx in np.flatnonzero(matches).tolist())
+    labels.sort()
+    return labels
+
+
 def band_parser_legacy(
     band_dat, band_kpt, special_points, structure
 ):  # pylint: disable=too-many-locals
@@ -460,15 +856,15 @@ def band_parser_legacy(
     from the input kpoints to construct a BandsData object which is then
     returned. Cannot handle discontinuities in the kpath, if two points are
     assigned to same spot only one will be passed. Used for wannier90 < 3.0
-    :param band_dat: list of str with each str stores one line of aiida_band.dat file
-    :param band_kpt: list of str with each str stores one line of aiida_band.kpt file
+    :param band_dat: content of the aiida_band.dat file, either as a str
+        or as a list of str with each str storing one line
+    :param band_kpt: content of the aiida_band.kpt file, either as a str
+        or as a list of str with each str storing one line
     :param special_points: special points to add labels to the bands a dictionary in
         the form expected in the input as described in the wannier90 documentation
     :return: BandsData object constructed from the input params,
         and a list contains warnings.
     """
-    import numpy as np
-
     from aiida.orm import BandsData, KpointsData
 
     warnings = []
@@ -484,8 +880,8 @@ def band_parser_legacy(
     )
 
     # imports the data
-    out_kpt = np.genfromtxt(band_kpt, skip_header=1, usecols=(0, 1, 2))
-    out_dat = np.genfromtxt(band_dat, usecols=1)
+    out_kpt = _load_table(band_kpt, num_columns=4, skip_header=1)[:, :3]
+    out_dat = _load_table(band_dat, num_columns=2)[:, 1]
 
     # reshaps the output bands
     out_dat = out_dat.reshape(len(out_kpt), (len(out_dat) // len(out_kpt)), order="F")
@@ -499,15 +895,7 @@ def band_parser_legacy(
     ]
 
     # finds the special points
-    special_points_dict = special_points["point_coords"]
-    # We set atol to 1e-5 because in the kpt file the coords are printed with fixed precision
-    labels = [
-        (i, k)
-        for k in special_points_dict
-        for i in range(len(out_kpt))
-        if all(np.isclose(special_points_dict[k], out_kpt[i], rtol=0, atol=1.0e-5))
-    ]
-    labels.sort()
+    labels = _find_special_points(out_kpt, special_points["point_coords"])
 
     # Checks and appends labels if discontinuity
     appends = []
@@ -10,6 +10,8 @@
 # pylint: disable=redefined-outer-name
 """Tests for the `PwCalculation` class."""
 
+import io
+
 import pytest
 
 from aiida import orm
@@ -91,6 +93,8 @@ def test_default(
             ".bxsf",
             "_w.xsf",
             "_w.cube",
+            "_[0-9]*.xsf",
+            "_[0-9]*.cube",
             "_centres.xyz",
             "_hr.dat",
             "_tb.dat",
@@ -177,6 +181,8 @@ def test_default_plot(
             ".bxsf",
             "_w.xsf",
             "_w.cube",
+            "_[0-9]*.xsf",
+            "_[0-9]*.cube",
             "_centres.xyz",
             "_hr.dat",
             "_tb.dat",
@@ -263,6 +269,114 @@ def test_werr_retrieved_with_custom_seedname(
     assert "test3.werr" in calc_info.retrieve_list
 
 
+def test_temporary_retrieve_list(
+    fixture_sandbox, generate_calc_job, generate_common_inputs_gaas
+):
+    """Test that the files in `temporary_retrieve_list` are only retrieved temporarily."""
+    inputs = generate_common_inputs_gaas(inputfolder_seedname="aiida")
+    inputs["settings"] = orm.Dict({"temporary_retrieve_list": ["*_hr.dat"]})
+
+    calc_info = generate_calc_job(
+        folder=fixture_sandbox, entry_point_name=ENTRY_POINT_NAME, inputs=inputs
+    )
+
+    assert "aiida_hr.dat" not in calc_info.retrieve_list
+    assert "aiida_tb.dat" in calc_info.retrieve_list
+    assert calc_info.retrieve_temporary_list == ["aiida_hr.dat"]
+
+
+@pytest.mark.parametrize(
+    "parameters, message",
+    (
+        ({"num_wann": 3}, "num_proj is 3 in the inputs, but 4 in the .amn file"),
+        ({"num_bands": 6}, "num_bands is 6 in the inputs, but 4 in the .mmn file"),
+        ({"mp_grid": [3, 3, 3]}, "mp_grid [3, 3, 3] has 27 k-points"),
+    ),
+)
+def test_input_headers_mismatch(
+    fixture_sandbox, generate_calc_job, generate_common_inputs_gaas, parameters, message
+):
+    """Test that a mismatch with the headers of the input matrices is detected before submitting."""
+    inputs = generate_common_inputs_gaas(inputfolder_seedname="aiida")
+    inputs["parameters"] = orm.Dict({**inputs["parameters"].get_dict(), **parameters})
+
+    with pytest.raises(InputValidationError) as excinfo:
+        generate_calc_job(
+            folder=fixture_sandbox, entry_point_name=ENTRY_POINT_NAME, inputs=inputs
+        )
+    assert message in str(excinfo.value)
+
+    inputs["settings"] = orm.Dict({"check_input_headers": False})
+    generate_calc_job(
+        folder=fixture_sandbox, entry_point_name=ENTRY_POINT_NAME, inputs=inputs
+    )
+
+
+def test_input_headers_cache(
+    fixture_sandbox, generate_calc_job, generate_common_inputs_gaas
+):
+    """Test that the headers of the input files are cached by checksum."""
+    from aiida_wannier90.calculations import _input_headers
+
+    _input_headers._HEADER_CACHE.clear()  # pylint: disable=protected-access
+    inputs = generate_common_inputs_gaas(inputfolder_seedname="aiida")
+    folder = inputs["local_input_folder"]
+    folder.base.repository.put_object_from_filelike(
+        io.BytesIO(b"    1    1   -5.6\n    4    8    6.2\n"), "aiida.eig"
+    )
+    # The checksums are those of the files in the stored repository
+    folder.store()
+    headers = _input_headers.get_input_headers("aiida", local_folder=folder)
+
+    assert headers == {
+        ".amn": {"num_bands": 4, "num_kpts": 8, "num_proj": 4},
+        ".mmn": {"num_bands": 4, "num_kpts": 8, "nntot": 8},
+        ".eig": {"num_bands": 4, "num_kpts": 8},
+    }
+    assert len(_input_headers._HEADER_CACHE) == 3  # pylint: disable=protected-access
+    generate_calc_job(
+        folder=fixture_sandbox, entry_point_name=ENTRY_POINT_NAME, inputs=inputs
+    )
+    assert len(_input_headers._HEADER_CACHE) == 3  # pylint: disable=protected-access
+
+
+def test_input_headers_skip_unparsable(generate_common_inputs_gaas, caplog):
+    """Test that a file whose header cannot be parsed does not prevent checking the others."""
+    import logging
+
+    from aiida_wannier90.calculations import _input_headers
+
+    inputs = generate_common_inputs_gaas(inputfolder_seedname="aiida")
+    folder = inputs["local_input_folder"]
+    folder.base.repository.put_object_from_filelike(
+        io.BytesIO(b"not an eig file\n"), "aiida.eig"
+    )
+    folder.store()
+    logger = logging.getLogger("test_input_headers")
+    with caplog.at_level(logging.WARNING, logger="test_input_headers"):
+        headers = _input_headers.get_input_headers(
+            "aiida", local_folder=folder, logger=logger
+        )
+
+    assert sorted(headers) == [".amn", ".mmn"]
+    assert "aiida.eig" in caplog.text
+
+
+def test_retrieve_checkpoint(
+    fixture_sandbox, generate_calc_job, generate_common_inputs_gaas
+):
+    """Test that the .chk file is retrieved temporarily with `retrieve_checkpoint`."""
+    inputs = generate_common_inputs_gaas(inputfolder_seedname="aiida")
+    inputs["settings"] = orm.Dict({"retrieve_checkpoint": True})
+
+    calc_info = generate_calc_job(
+        folder=fixture_sandbox, entry_point_name=ENTRY_POINT_NAME, inputs=inputs
+    )
+
+    assert "aiida.chk" not in calc_info.retrieve_list
+    assert calc_info.retrieve_temporary_list == ["aiida.chk"]
+
+
 def test_no_projections(
     fixture_sandbox, generate_calc_job, generate_common_inputs_gaas, file_regression
 ):
@@ -290,6 +404,8 @@ def test_no_projections(
             ".bxsf",
             "_w.xsf",
             "_w.cube",
+            "_[0-9]*.xsf",
+            "_[0-9]*.cube",
             "_centres.xyz",
             "_hr.dat",
             "_tb.dat",
@@ -355,6 +471,8 @@ def test_list_projections(
             ".bxsf",
             "_w.xsf",
             "_w.cube",
+            "_[0-9]*.xsf",
+            "_[0-9]*.cube",
             "_centres.xyz",
             "_hr.dat",
             "_tb.dat",
@@ -0,0 +1,40 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Tests for the `Postw90Calculation` class."""
+import pytest
+
+from aiida import orm
+
+
+@pytest.mark.parametrize(
+    "layout, valid", (("flat", True), ("tensor", True), ("columns", False))
+)
+def test_boltzwann_layout(layout, valid):
+    """Test the validation of the `boltzwann_layout` parser option."""
+    from aiida_wannier90.calculations.postw90 import validate_inputs
+
+    inputs = {
+        "parameters": orm.Dict({"boltzwann": True}),
+        "settings": orm.Dict({"parser_options": {"boltzwann_layout": layout}}),
+    }
+    assert (validate_inputs(inputs) is None) == valid
+
+
+@pytest.mark.parametrize(
+    "num_workers, valid", ((1, True), (4, True), (0, False), (1.5, False))
+)
+def test_boltzwann_workers(num_workers, valid):
+    """Test the validation of the `boltzwann_workers` parser option."""
+    from aiida_wannier90.calculations.postw90 import validate_inputs
+
+    inputs = {
+        "parameters": orm.Dict({"boltzwann": True}),
+        "settings": orm.Dict({"parser_options": {"boltzwann_workers": num_workers}}),
+    }
+    assert (validate_inputs(inputs) is None) == valid
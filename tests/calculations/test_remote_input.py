@@ -90,6 +90,8 @@ def test_default_remote(
             ".bxsf",
             "_w.xsf",
             "_w.cube",
+            "_[0-9]*.xsf",
+            "_[0-9]*.cube",
             "_centres.xyz",
             "_hr.dat",
             "_tb.dat",
@@ -187,6 +189,8 @@ def test_unk_symlink(
             ".bxsf",
             "_w.xsf",
             "_w.cube",
+            "_[0-9]*.xsf",
+            "_[0-9]*.cube",
             "_centres.xyz",
             "_hr.dat",
             "_tb.dat",
@@ -228,3 +232,24 @@ def test_unk_symlink(
     # Checks on the files written to the sandbox folder as raw input
     assert sorted(fixture_sandbox.get_content_list()) == sorted([f"{seedname}.win"])
     file_regression.check(input_written, encoding="utf-8", extension=".win")
+
+
+def test_input_headers_mismatch_remote(
+    fixture_sandbox, generate_calc_job, generate_common_inputs_gaas_remotedata
+):
+    """Test that the headers of the remote input matrices can be checked through the transport."""
+    from aiida.common.exceptions import InputValidationError
+    from aiida.orm import Dict
+
+    inputs = generate_common_inputs_gaas_remotedata()
+    inputs["parameters"] = Dict({**inputs["parameters"].get_dict(), "num_bands": 6})
+    # The headers of the remote files are not checked by default
+    generate_calc_job(
+        folder=fixture_sandbox, entry_point_name=ENTRY_POINT_NAME, inputs=inputs
+    )
+
+    inputs["settings"] = Dict({"check_remote_input_headers": True})
+    with pytest.raises(InputValidationError, match="num_bands is 6 in the inputs"):
+        generate_calc_job(
+            folder=fixture_sandbox, entry_point_name=ENTRY_POINT_NAME, inputs=inputs
+        )
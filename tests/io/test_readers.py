@@ -0,0 +1,330 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Test the readers of the Wannier90 output files."""
+import io
+
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("chunk_size", (5, 1024))
+def test_read_numbers(chunk_size):
+    """Test reading numbers in chunks, with and without the expected number of values."""
+    from aiida_wannier90.io._read_utils import read_numbers
+
+    content = "  1  2.5\n\n -3.0E+01 4\n 5"
+    np.testing.assert_array_equal(
+        read_numbers(io.StringIO(content), chunk_size=chunk_size),
+        [1, 2.5, -30, 4, 5],
+    )
+    np.testing.assert_array_equal(
+        read_numbers(io.StringIO(content), num_values=5, chunk_size=chunk_size),
+        [1, 2.5, -30, 4, 5],
+    )
+    with pytest.raises(ValueError):
+        read_numbers(io.StringIO(content), num_values=4, chunk_size=chunk_size)
+    with pytest.raises(ValueError):
+        read_numbers(io.StringIO(content), num_values=6, chunk_size=chunk_size)
+    with pytest.raises(ValueError):
+        read_numbers(io.StringIO("1 2\n 3 ****\n"), chunk_size=chunk_size)
+
+
+def test_read_hr(shared_datadir):
+    """Test reading a _hr.dat file."""
+    from aiida_wannier90.io import read_hr
+
+    with open(shared_datadir / "aiida_hr.dat", encoding="utf-8") as handle:
+        hamiltonian = read_hr(handle)
+
+    np.testing.assert_array_equal(
+        hamiltonian["r_vectors"], [[-1, 0, 0], [0, 0, 0], [1, 0, 0]]
+    )
+    np.testing.assert_array_equal(hamiltonian["degeneracies"], [2, 1, 2])
+    assert hamiltonian["hamiltonian"].shape == (3, 2, 2)
+    assert hamiltonian["hamiltonian"].dtype == complex
+    # Line `-1 0 0 2 1 0.150000 -0.010000`
+    assert hamiltonian["hamiltonian"][0, 1, 0] == 0.15 - 0.01j
+    # Line `1 0 0 1 2 0.200000 -0.010000`
+    assert hamiltonian["hamiltonian"][2, 0, 1] == 0.2 - 0.01j
+
+
+def test_read_tb(shared_datadir):
+    """Test reading a _tb.dat file."""
+    from aiida_wannier90.io import read_tb
+
+    with open(shared_datadir / "aiida_tb.dat", encoding="utf-8") as handle:
+        tight_binding = read_tb(handle)
+
+    np.testing.assert_allclose(
+        tight_binding["lattice"], [[0, 2.8, 2.8], [2.8, 0, 2.8], [2.8, 2.8, 0]]
+    )
+    np.testing.assert_array_equal(
+        tight_binding["r_vectors"], [[-1, 0, 0], [0, 0, 0], [1, 0, 0]]
+    )
+    np.testing.assert_array_equal(tight_binding["degeneracies"], [2, 1, 2])
+    assert tight_binding["hamiltonian"].shape == (3, 2, 2)
+    # Line `2    1    0.15000000E+00 -0.10000000E-01`
+    assert tight_binding["hamiltonian"][0, 1, 0] == 0.15 - 0.01j
+    assert tight_binding["position"].shape == (3, 2, 2, 3)
+    np.testing.assert_array_equal(tight_binding["position"][1, 0, 0], [0.5, 1.0, 1.5])
+    np.testing.assert_array_equal(
+        tight_binding["position"][0, 1, 0], [-0.001j, -0.002j, -0.003j]
+    )
+
+
+def test_read_wsvec(shared_datadir):
+    """Test reading a _wsvec.dat file."""
+    from aiida_wannier90.io import read_wsvec
+
+    with open(shared_datadir / "aiida_wsvec.dat", encoding="utf-8") as handle:
+        ws_vectors = read_wsvec(handle)
+
+    assert ws_vectors["r_vectors"].shape == (12, 3)
+    np.testing.assert_array_equal(ws_vectors["r_vectors"][-1], [1, 0, 0])
+    np.testing.assert_array_equal(
+        ws_vectors["wf_indices"][:4], [[1, 1], [1, 2], [2, 1], [2, 2]]
+    )
+    np.testing.assert_array_equal(
+        ws_vectors["multiplicities"], [1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 1]
+    )
+    assert ws_vectors["shifts"].shape == (12, 2, 3)
+    np.testing.assert_array_equal(ws_vectors["shifts"][9], [[0, 0, 0], [-1, 0, 1]])
+    np.testing.assert_array_equal(ws_vectors["shifts"][8], [[0, 0, 0], [0, 0, 0]])
+
+
+@pytest.mark.parametrize(
+    "filename, shape", (("aiida_u.mat", (2, 2, 2)), ("aiida_u_dis.mat", (2, 3, 2)))
+)
+def test_read_u_mat(shared_datadir, filename, shape):
+    """Test reading the _u.mat and _u_dis.mat files."""
+    from aiida_wannier90.io import read_u_mat
+
+    with open(shared_datadir / filename, encoding="utf-8") as handle:
+        u_mat = read_u_mat(handle)
+
+    np.testing.assert_array_equal(u_mat["kpoints"], [[0, 0, 0], [0, 0, 0.5]])
+    assert u_mat["u_matrix"].shape == shape
+    # The first column of the matrix at the second k-point
+    np.testing.assert_allclose(
+        u_mat["u_matrix"][1, :, 0], [0.5, 0.01 + 0.1j, 0.02 + 0.1j][: shape[1]]
+    )
+
+
+def test_read_nnkp(shared_datadir):
+    """Test reading a .nnkp file."""
+    from aiida_wannier90.io import read_nnkp
+
+    with open(shared_datadir / "aiida.nnkp", encoding="utf-8") as handle:
+        nnkp = read_nnkp(handle)
+
+    assert nnkp["real_lattice"].shape == (3, 3)
+    np.testing.assert_array_equal(nnkp["recip_lattice"][1], [1.1114637] * 3)
+    np.testing.assert_array_equal(nnkp["kpoints"], [[0, 0, 0], [0, 0, 0.5]])
+    np.testing.assert_array_equal(nnkp["projection_centres"][1], [0.25] * 3)
+    np.testing.assert_array_equal(nnkp["projection_l"], [0, 1])
+    np.testing.assert_array_equal(nnkp["projection_mr"], [1, 3])
+    np.testing.assert_array_equal(nnkp["projection_r"], [1, 2])
+    np.testing.assert_array_equal(nnkp["projection_zona"], [1.0, 2.0])
+    assert "projection_spin" not in nnkp
+    assert nnkp["nnkpts"].dtype == int
+    np.testing.assert_array_equal(
+        nnkp["nnkpts"], [[[2, 0, 0, 0], [2, 0, 0, -1]], [[1, 0, 0, 0], [1, 0, 0, 1]]]
+    )
+    np.testing.assert_array_equal(nnkp["exclude_bands"], [1, 2])
+
+
+def test_read_nnkp_spinor(shared_datadir):
+    """Test reading a .nnkp file with spinor projections and no excluded bands."""
+    from aiida_wannier90.io import read_nnkp
+
+    with open(shared_datadir / "spinor.nnkp", encoding="utf-8") as handle:
+        nnkp = read_nnkp(handle)
+
+    assert "recip_lattice" not in nnkp
+    np.testing.assert_array_equal(nnkp["projection_spin"], [1, -1])
+    np.testing.assert_array_equal(nnkp["projection_spin_axis"], [[0, 0, 1]] * 2)
+    assert nnkp["nnkpts"].shape == (1, 1, 4)
+    assert nnkp["exclude_bands"].shape == (0,)
+
+
+def test_read_next_numbers():
+    """Test reading a given number of values without reading past them."""
+    from aiida_wannier90.io._read_utils import read_next_numbers
+
+    handle = io.StringIO(" 1 2 3\n 4 5 6\n 7\n BAND: 2\n")
+    np.testing.assert_array_equal(
+        read_next_numbers(handle, 7, batch_lines=1), [1, 2, 3, 4, 5, 6, 7]
+    )
+    assert handle.readline() == " BAND: 2\n"
+    with pytest.raises(ValueError):
+        read_next_numbers(io.StringIO(" 1 2 3\n 4 5 6\n"), 5)
+    with pytest.raises(ValueError):
+        read_next_numbers(io.StringIO(" 1 2 3\n"), 4)
+
+
+def test_read_centres_xyz(shared_datadir):
+    """Test reading a _centres.xyz file."""
+    from aiida_wannier90.io import read_centres_xyz
+
+    with open(shared_datadir / "aiida_centres.xyz", encoding="utf-8") as handle:
+        centres = read_centres_xyz(handle)
+
+    np.testing.assert_array_equal(
+        centres["centres"], [[0.7066, 0.7066, 0.7066], [-0.7066, 0.7066, 2.1199]]
+    )
+    np.testing.assert_array_equal(
+        centres["atom_positions"], [[0, 0, 0], [-1.41325, 1.41325, 1.41325]]
+    )
+
+
+@pytest.mark.parametrize("dtype", (float, np.float32))
+def test_read_bxsf(shared_datadir, dtype):
+    """Test reading a .bxsf file."""
+    from aiida_wannier90.io import read_bxsf
+
+    with open(shared_datadir / "aiida.bxsf", encoding="utf-8") as handle:
+        fermi_surface = read_bxsf(handle, dtype=dtype)
+
+    assert fermi_surface["fermi_energy"] == 5.25
+    np.testing.assert_array_equal(fermi_surface["origin"], [0, 0, 0])
+    np.testing.assert_array_equal(
+        fermi_surface["reciprocal_vectors"][0], [-1.111464, -1.111464, 1.111464]
+    )
+    energies = fermi_surface["energies"]
+    assert energies.dtype == dtype
+    assert energies.shape == (2, 3, 3, 2)
+    # The last index runs fastest
+    np.testing.assert_array_equal(energies[0, 0, 1], [1.0, 1.5])
+    assert energies[1, 2, 2, 1] == 18.5
+
+
+@pytest.mark.parametrize("filename", ("aiida_00001.xsf", "aiida_00001.cube"))
+def test_read_volumetric(shared_datadir, filename):
+    """Test reading the plot of a Wannier function from a .xsf or .cube file."""
+    from aiida_wannier90.io import read_cube, read_xsf
+
+    reader = read_xsf if filename.endswith(".xsf") else read_cube
+    with open(shared_datadir / filename, encoding="utf-8") as handle:
+        plot = reader(handle)
+    # The values of the synthetic grid are `(i * 6 + j * 2 + k) / 10 - 1`
+    expected = np.arange(24).reshape(4, 3, 2) / 10 - 1
+    np.testing.assert_allclose(plot["data"], expected)
+    np.testing.assert_array_equal(plot["origin"], [0, 0, 0])
+
+    with open(shared_datadir / filename, encoding="utf-8") as handle:
+        plot = reader(handle, dtype=np.float16, stride=2)
+    assert plot["data"].dtype == np.float16
+    np.testing.assert_allclose(plot["data"], expected[::2, ::2, ::2], atol=1e-3)
+
+
+def test_read_volumetric_vectors(shared_datadir):
+    """Test the vectors of the downsampled grids."""
+    from aiida_wannier90.io import read_cube, read_xsf
+
+    with open(shared_datadir / "aiida_00001.xsf", encoding="utf-8") as handle:
+        plot = read_xsf(handle, stride=2)
+    # 4 points along the first direction: the points 0 and 2 are kept
+    np.testing.assert_allclose(
+        plot["spanning_vectors"],
+        [[-5.653 * 2 / 3, 0, 5.653 * 2 / 3], [0, 5.653, 5.653], [0, 0, 0]],
+    )
+
+    with open(shared_datadir / "aiida_00001.cube", encoding="utf-8") as handle:
+        plot = read_cube(handle, stride=2)
+    np.testing.assert_array_equal(plot["voxel_vectors"], np.eye(3))
+    np.testing.assert_array_equal(plot["atomic_numbers"], [31, 33])
+    np.testing.assert_array_equal(
+        plot["atom_positions"][1], [-2.67065, 2.67065, 2.67065]
+    )
+
+
+@pytest.mark.parametrize("filename", ("aiida.chk", "aiida.chk.fmt"))
+def test_read_chk(shared_datadir, filename):
+    """Test reading an unformatted and a formatted checkpoint file."""
+    from aiida_wannier90.io import read_chk
+
+    chk = read_chk(shared_datadir / filename, read_m_matrix=True)
+
+    assert chk["num_bands"] == 3
+    assert chk["num_wann"] == 2
+    assert chk["nntot"] == 2
+    assert chk["checkpoint"] == "postwann"
+    np.testing.assert_array_equal(chk["exclude_bands"], [1])
+    np.testing.assert_array_equal(chk["real_lattice"][2], [2.5, 2.5, 0.5])
+    np.testing.assert_array_equal(chk["recip_lattice"][2], [1.5, 1.5, -1.5])
+    np.testing.assert_array_equal(chk["mp_grid"], [1, 1, 2])
+    np.testing.assert_array_equal(chk["kpoints"], [[0, 0, 0], [0, 0, 0.5]])
+    assert chk["omega_invariant"] == 7.25
+    np.testing.assert_array_equal(chk["lwindow"], [[True, True, False], [True] * 3])
+    np.testing.assert_array_equal(chk["ndimwin"], [2, 3])
+    # The synthetic elements are `i + 10 * j (+ 100 * nn) + 1j * nkp`, with 1-based indices
+    assert chk["u_matrix_opt"].shape == (2, 3, 2)
+    assert chk["u_matrix_opt"][1, 2, 0] == 13 + 2j
+    assert chk["u_matrix"].shape == (2, 2, 2)
+    assert chk["u_matrix"][0, 1, 0] == 12 + 1j
+    assert chk["m_matrix"].shape == (2, 2, 2, 2)
+    assert chk["m_matrix"][1, 0, 0, 1] == 121 + 2j
+    np.testing.assert_array_equal(chk["wannier_centres"][1], [1.1, 1.2, 1.3])
+    np.testing.assert_array_equal(chk["wannier_spreads"], [1.5, 2.5])
+
+    assert "m_matrix" not in read_chk(shared_datadir / filename)
+
+
+def test_iter_amn(shared_datadir):
+    """Test reading a .amn file one k-point at a time."""
+    from aiida_wannier90.io import iter_amn
+
+    with open(shared_datadir / "aiida.amn", encoding="utf-8") as handle:
+        matrices = list(iter_amn(handle, dtype=np.complex64))
+
+    assert len(matrices) == 2
+    assert matrices[1].shape == (3, 2)
+    assert matrices[1].dtype == np.complex64
+    # The band index runs fastest
+    np.testing.assert_allclose(
+        matrices[1][:, 0], [0.4 - 0.04j, 0.5 - 0.05j, 0.6 - 0.06j]
+    )
+    np.testing.assert_allclose(matrices[0][:, 1], [-0.1, -0.2, -0.3])
+
+
+def test_iter_mmn(shared_datadir):
+    """Test reading a .mmn file one k-point at a time."""
+    from aiida_wannier90.io import iter_mmn
+
+    with open(shared_datadir / "aiida.mmn", encoding="utf-8") as handle:
+        blocks = iter_mmn(handle)
+        neighbours, overlaps = next(blocks)
+        np.testing.assert_array_equal(neighbours, [[2, 0, 0, 0], [2, 0, 0, -1]])
+        assert overlaps.shape == (2, 2, 2)
+        # The matrices are written in column-major order
+        np.testing.assert_allclose(
+            overlaps[1], [[0.7, 0.04 + 0.2j], [0.03 + 0.1j, 0.6]]
+        )
+        neighbours, overlaps = next(blocks)
+        np.testing.assert_array_equal(neighbours[:, 0], [1, 1])
+        assert overlaps[0, 1, 0] == 0.01 - 0.1j
+        with pytest.raises(StopIteration):
+            next(blocks)
+
+    with pytest.raises(ValueError):
+        list(iter_mmn(io.StringIO(" comment\n 2 2 1\n 1 2 0 0 0\n 1.0 0.0\n")))
+
+
+def test_read_eig(shared_datadir):
+    """Test reading a .eig file."""
+    from aiida_wannier90.io import read_eig
+
+    with open(shared_datadir / "aiida.eig", encoding="utf-8") as handle:
+        energies = read_eig(handle)
+
+    np.testing.assert_array_equal(
+        energies, [[-5.648143, 6.25, 6.25], [-3.5, -0.75, 4.125]]
+    )
+    with pytest.raises(ValueError):
+        read_eig(io.StringIO("    1    1   -5.6\n    2    2    6.2\n"))
@@ -41,3 +41,98 @@ def test_exclude_bands(generate_kpoints_mesh, file_regression):
     parameters = {"exclude_bands": range(-1, 1)}
     with pytest.raises(InputValidationError):
         _create_win_string(parameters, generate_kpoints_mesh(2))
+
+
+def test_format_vectors():
+    """Test that the bulk formatting of the vectors matches the per-row formatting."""
+    import numpy as np
+
+    from aiida_wannier90.io._write_win import _format_rows, _format_vectors
+
+    rng = np.random.default_rng(0)
+    vectors = np.concatenate(
+        [rng.normal(scale=100, size=(50, 3)), [[-0.0, 1e-12, -5e-11], [1e10, 0, -1]]]
+    )
+    assert list(_format_vectors(vectors)) == [
+        f"{vec[0]:18.10f} {vec[1]:18.10f} {vec[2]:18.10f}" for vec in vectors
+    ]
+    assert not list(_format_vectors(np.zeros((0, 3))))
+    assert _format_rows("%s   %18.10f", ["Ga%1", 0.5], 1) == [f"Ga%1   {0.5:18.10f}"]
+
+
+def test_write_win(generate_win_params_gaas, tmp_path):
+    """Test that `write_win` streams the same content as `_create_win_string`."""
+    from aiida_wannier90.io import write_win
+    from aiida_wannier90.io._write_win import _create_win_string
+
+    inputs = generate_win_params_gaas()
+    write_win(tmp_path / "aiida.win", **inputs)
+    assert (tmp_path / "aiida.win").read_text(encoding="utf-8") == _create_win_string(
+        **inputs
+    )
+
+    # The inputs are validated before the file is opened
+    with pytest.raises(InputValidationError):
+        write_win(
+            tmp_path / "invalid.win", {"exclude_bands": [1, 1]}, inputs["kpoints"]
+        )
+    assert not (tmp_path / "invalid.win").exists()
+
+
+def test_block_cache(generate_win_params_gaas):
+    """Test that the blocks formatted from stored nodes are cached by UUID."""
+    from aiida_wannier90.io import clear_win_block_cache, win_block_cache_info
+    from aiida_wannier90.io._write_win import _create_win_string
+
+    clear_win_block_cache()
+    inputs = generate_win_params_gaas()
+    expected = _create_win_string(**inputs)
+    # Unstored nodes are not cached
+    assert win_block_cache_info().currsize == 0
+
+    for key in ("structure", "kpoints", "projections"):
+        inputs[key].store()
+    assert _create_win_string(**inputs) == expected
+    info = win_block_cache_info()
+    # unit_cell_cart, atoms_cart, kpoints and projections
+    assert (info.hits, info.misses, info.currsize) == (0, 4, 4)
+    assert _create_win_string(**inputs) == expected
+    assert win_block_cache_info().hits == 4
+
+    clear_win_block_cache()
+    assert win_block_cache_info() == (0, 0, info.maxbytes, 0, 0)
+
+
+def test_block_cache_eviction():
+    """Test that the least recently used blocks are evicted, and large blocks are not cached."""
+    from aiida import orm
+
+    from aiida_wannier90.io._write_win import _BlockCache
+
+    # Room for two blocks of 4 characters
+    cache = _BlockCache(max_bytes=8, max_block_bytes=8)
+    nodes = [orm.Dict({"index": index}).store() for index in range(4)]
+
+    def format_function(node):
+        # 2 lines (4 characters), or 5 lines for the last node
+        return iter([str(node["index"])] * (5 if node["index"] == 3 else 2))
+
+    def get(node):
+        return list(cache.get("block", node, format_function))
+
+    assert get(nodes[0]) == ["0", "0"]
+    assert get(nodes[0]) == ["0\n0"]
+    get(nodes[1])
+    get(nodes[0])
+    get(nodes[2])
+    # The node 1 was the least recently used one
+    assert cache.info().currsize == 2
+    assert cache.info().currbytes == 6
+    get(nodes[1])
+    assert cache.info().hits == 2
+    assert cache.info().misses == 4
+
+    # A block larger than `max_block_bytes` is streamed, but not cached
+    assert get(nodes[3]) == ["3"] * 5
+    assert get(nodes[3]) == ["3"] * 5
+    assert cache.info().misses == 6
@@ -151,6 +151,41 @@ def test_band_parser(
         ]
 
 
+def test_band_parser_temporary(
+    fixture_localhost,
+    generate_calc_job_node,
+    generate_parser,
+    generate_win_params_o2sr,
+    shared_datadir,
+    tmp_path,
+):
+    """Check that the band files are parsed when only retrieved temporarily, e.g. with `["*.dat"]`."""
+    import shutil
+
+    source = shared_datadir / "o2sr" / "band_new"
+    retrieved = shared_datadir / "o2sr" / "band_temporary"
+    retrieved.mkdir()
+    shutil.copy(source / "aiida.wout", retrieved)
+    for filename in ("aiida_band.dat", "aiida_band.labelinfo.dat"):
+        shutil.copy(source / filename, tmp_path)
+    shutil.copy(source / "aiida_band.kpt", retrieved)
+
+    node = generate_calc_job_node(
+        entry_point_name=ENTRY_POINT_CALC_JOB,
+        computer=fixture_localhost,
+        test_name="o2sr/band_temporary",
+        inputs=generate_win_params_o2sr(),
+    )
+    parser = generate_parser(ENTRY_POINT_PARSER)
+    results, calcfunction = parser.parse_from_node(
+        node, store_provenance=False, retrieved_temporary_folder=str(tmp_path)
+    )
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    # The legacy parser, used without a _band.labelinfo.dat file, finds 604 k-points
+    assert results["interpolated_bands"].get_bands().shape == (607, 21)
+
+
 def test_bvectors_not_enough(
     fixture_localhost,
     generate_calc_job_node,
@@ -296,3 +331,412 @@ def test_restart(
             "output_parameters": results["output_parameters"].get_dict(),
         }
     )
+
+
+def test_raw_wout_parser_stream(shared_datadir):
+    """Check that parsing a .wout from a file handle or from a list of lines gives the same result."""
+    from aiida_wannier90.parsers.wannier90 import raw_wout_parser
+
+    filepath = shared_datadir / "o2sr" / "band_new" / "aiida.wout"
+    with open(filepath, encoding="utf-8") as handle:
+        from_handle = raw_wout_parser(handle)
+    with open(filepath, encoding="utf-8") as handle:
+        from_lines = raw_wout_parser(handle.readlines())
+
+    assert from_handle == from_lines
+    assert len(from_handle["wannier_functions_initial"]) == 21
+    assert len(from_handle["wannier_functions_output"]) == 21
+
+
+def test_wannier_functions_as_array(
+    fixture_localhost,
+    generate_calc_job_node,
+    generate_parser,
+    generate_win_params_gaas,
+):
+    """Check the `wannier_functions` ArrayData output against the list-based output parameters."""
+    import numpy as np
+
+    inputs = generate_win_params_gaas()
+    node_lists = generate_calc_job_node(
+        entry_point_name=ENTRY_POINT_CALC_JOB,
+        computer=fixture_localhost,
+        test_name="gaas/seedname_aiida",
+        inputs=inputs,
+    )
+    inputs["settings"] = orm.Dict(
+        {"parser_options": {"wannier_functions_as_array": True}}
+    )
+    node_array = generate_calc_job_node(
+        entry_point_name=ENTRY_POINT_CALC_JOB,
+        computer=fixture_localhost,
+        test_name="gaas/seedname_aiida",
+        inputs=inputs,
+    )
+    parser = generate_parser(ENTRY_POINT_PARSER)
+    results_lists, _ = parser.parse_from_node(node_lists, store_provenance=False)
+    results, calcfunction = parser.parse_from_node(node_array, store_provenance=False)
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    assert "wannier_functions" not in results_lists
+    output_parameters = results["output_parameters"].get_dict()
+    assert "wannier_functions_output" not in output_parameters
+    assert "wannier_functions_initial" not in output_parameters
+
+    wannier_functions = results["wannier_functions"]
+    for prefix, key in (
+        ("initial_", "wannier_functions_initial"),
+        ("", "wannier_functions_output"),
+    ):
+        expected = results_lists["output_parameters"][key]
+        np.testing.assert_array_equal(
+            wannier_functions.get_array(f"{prefix}wf_ids"),
+            [wf["wf_ids"] for wf in expected],
+        )
+        np.testing.assert_allclose(
+            wannier_functions.get_array(f"{prefix}centres"),
+            [wf["wf_centres"] for wf in expected],
+        )
+        np.testing.assert_allclose(
+            wannier_functions.get_array(f"{prefix}spreads"),
+            [wf["wf_spreads"] for wf in expected],
+        )
+    assert wannier_functions.get_array("centres").shape == (
+        output_parameters["number_wfs"],
+        3,
+    )
+
+
+def test_convergence(
+    fixture_localhost,
+    generate_calc_job_node,
+    generate_parser,
+    generate_win_params_gaas,
+    data_regression,
+):
+    """Check the `convergence` ArrayData output with the iterations of the wannierisation."""
+    node = generate_calc_job_node(
+        entry_point_name=ENTRY_POINT_CALC_JOB,
+        computer=fixture_localhost,
+        test_name="gaas/seedname_aiida",
+        inputs=generate_win_params_gaas(),
+    )
+    parser = generate_parser(ENTRY_POINT_PARSER)
+    results, calcfunction = parser.parse_from_node(node, store_provenance=False)
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    convergence = results["convergence"]
+    # There is no disentanglement in this calculation
+    assert sorted(convergence.get_arraynames()) == [
+        "wannierise_delta",
+        "wannierise_iteration",
+        "wannierise_rms_gradient",
+        "wannierise_spread",
+        "wannierise_time",
+    ]
+    data_regression.check(
+        {
+            name: convergence.get_array(name).tolist()
+            for name in convergence.get_arraynames()
+        }
+    )
+
+
+def test_convergence_disentanglement(shared_datadir):
+    """Check the parsing of the `<-- DIS` iterations of the disentanglement."""
+    from aiida_wannier90.parsers.wannier90 import _parse_wout_stream
+
+    filepath = shared_datadir / "output_stdout_incomplete" / "aiida.wout"
+    with open(filepath, encoding="utf-8") as handle:
+        _, _, convergence, _ = _parse_wout_stream(handle)
+
+    assert convergence["dis_iteration"].tolist() == list(range(1, 139))
+    assert convergence["dis_omega_i_previous"][0] == 19.76028626
+    assert convergence["dis_omega_i"][0] == 18.70905438
+    assert convergence["dis_delta"][0] == 5.619e-02
+    assert convergence["wannierise_iteration"].tolist() == list(range(29))
+    assert (
+        convergence["wannierise_spread"][-1] == convergence["wannierise_spread"].min()
+    )
+
+
+def test_load_table(shared_datadir):
+    """Check the bulk loader of the band files against ``np.genfromtxt``."""
+    import numpy as np
+
+    from aiida_wannier90.parsers.wannier90 import _load_table
+
+    folder = shared_datadir / "o2sr" / "band_new"
+    with open(folder / "aiida_band.dat", encoding="utf-8") as handle:
+        band_dat = handle.readlines()
+    with open(folder / "aiida_band.kpt", encoding="utf-8") as handle:
+        band_kpt = handle.readlines()
+
+    np.testing.assert_array_equal(
+        _load_table("".join(band_dat), num_columns=2)[:, 1],
+        np.genfromtxt(band_dat, usecols=1),
+    )
+    np.testing.assert_array_equal(
+        _load_table(band_kpt, num_columns=4, skip_header=1)[:, :3],
+        np.genfromtxt(band_kpt, skip_header=1, usecols=(0, 1, 2)),
+    )
+
+    # Values that cannot be parsed are set to NaN
+    table = _load_table("  1.0  2.0\n\n  3.0 ********\n", num_columns=2)
+    np.testing.assert_array_equal(table, [[1.0, 2.0], [3.0, np.nan]])
+
+    # Extra columns are dropped, missing ones are an error
+    table = _load_table("\n  1.0  2.0  5.0\n  3.0  4.0  6.0\n", num_columns=2)
+    np.testing.assert_array_equal(table, [[1.0, 2.0], [3.0, 4.0]])
+    with pytest.raises(ValueError, match="at least 3 columns"):
+        _load_table("  1.0  2.0\n  3.0  4.0\n", num_columns=3)
+
+
+def test_find_special_points(shared_datadir, generate_win_params_o2sr):
+    """Check the matching of the special points against the pairwise comparison."""
+    import numpy as np
+
+    from aiida_wannier90.parsers.wannier90 import _find_special_points, _load_table
+
+    point_coords = generate_win_params_o2sr()["kpoint_path"].get_dict()["point_coords"]
+    with open(
+        shared_datadir / "o2sr" / "band_legacy" / "aiida_band.kpt", encoding="utf-8"
+    ) as handle:
+        kpoints = _load_table(handle.read(), num_columns=4, skip_header=1)[:, :3]
+
+    expected = sorted(
+        (idx, label)
+        for label, coords in point_coords.items()
+        for idx, kpoint in enumerate(kpoints)
+        if all(np.isclose(coords, kpoint, rtol=0, atol=1.0e-5))
+    )
+    labels = _find_special_points(kpoints, point_coords)
+    assert labels == expected
+    assert all(isinstance(idx, int) for idx, _ in labels)
+
+
+def test_real_space_hamiltonian(
+    fixture_localhost,
+    generate_calc_job_node,
+    generate_parser,
+    generate_win_params_gaas,
+    tmp_path,
+):
+    """Check the parsing of the _hr.dat file from the temporary retrieved folder."""
+    (tmp_path / "aiida_hr.dat").write_text(
+        " written on 17Oct2026 at 10:00:00 \n"
+        "           1\n"
+        "           2\n"
+        "    2    2\n"
+        "    0    0    0    1    1   -1.000000    0.000000\n"
+        "    1    0    0    1    1    0.250000    0.125000\n",
+        encoding="utf-8",
+    )
+    node = generate_calc_job_node(
+        entry_point_name=ENTRY_POINT_CALC_JOB,
+        computer=fixture_localhost,
+        test_name="gaas/seedname_aiida",
+        inputs=generate_win_params_gaas(),
+    )
+    parser = generate_parser(ENTRY_POINT_PARSER)
+    results, calcfunction = parser.parse_from_node(
+        node, store_provenance=False, retrieved_temporary_folder=str(tmp_path)
+    )
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    hamiltonian = results["real_space_hamiltonian"]
+    assert hamiltonian.get_array("r_vectors").tolist() == [[0, 0, 0], [1, 0, 0]]
+    assert hamiltonian.get_array("degeneracies").tolist() == [2, 2]
+    assert hamiltonian.get_array("hamiltonian").tolist() == [
+        [[-1.0 + 0.0j]],
+        [[0.25 + 0.125j]],
+    ]
+
+
+def test_nnkp(
+    fixture_localhost,
+    generate_calc_job_node,
+    generate_parser,
+    generate_win_params_gaas,
+    tmp_path,
+):
+    """Check that the .nnkp file in the temporary folder is stored and parsed into arrays."""
+    (tmp_path / "aiida.nnkp").write_text(
+        "File written on 17Oct2026 at 10:00:00\n\n"
+        "begin kpoints\n       1\n   0.00000000   0.00000000   0.00000000\nend kpoints\n\n"
+        "begin nnkpts\n   2\n    1    1      0   0   1\n    1    1      0   0  -1\nend nnkpts\n",
+        encoding="utf-8",
+    )
+    node = generate_calc_job_node(
+        entry_point_name=ENTRY_POINT_CALC_JOB,
+        computer=fixture_localhost,
+        test_name="gaas/seedname_aiida",
+        inputs=generate_win_params_gaas(),
+    )
+    parser = generate_parser(ENTRY_POINT_PARSER)
+    results, calcfunction = parser.parse_from_node(
+        node, store_provenance=False, retrieved_temporary_folder=str(tmp_path)
+    )
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    assert "nnkp_file" in results
+    assert results["nnkp"].get_array("kpoints").tolist() == [[0.0, 0.0, 0.0]]
+    assert results["nnkp"].get_array("nnkpts").tolist() == [
+        [[1, 0, 0, 1], [1, 0, 0, -1]]
+    ]
+
+
+def test_fermi_surface_float32(
+    fixture_localhost,
+    generate_calc_job_node,
+    generate_parser,
+    generate_win_params_gaas,
+    tmp_path,
+):
+    """Check that the `fermi_surface_dtype` parser option is passed to the .bxsf reader."""
+    (tmp_path / "aiida.bxsf").write_text(
+        " BEGIN_INFO\n   Fermi Energy:       5.2500\n END_INFO\n"
+        " BEGIN_BLOCK_BANDGRID_3D\n from_wannier_code\n BEGIN_BANDGRID_3D_fermi\n"
+        "           1\n           2           1           1\n"
+        "  0.0 0.0 0.0\n  1.0 0.0 0.0\n  0.0 1.0 0.0\n  0.0 0.0 1.0\n"
+        " BAND:     1\n  1.00000E+00  2.00000E+00\n"
+        " END_BANDGRID_3D\n END_BLOCK_BANDGRID_3D\n",
+        encoding="utf-8",
+    )
+    inputs = generate_win_params_gaas()
+    inputs["settings"] = orm.Dict(
+        {"parser_options": {"fermi_surface_dtype": "float32"}}
+    )
+    node = generate_calc_job_node(
+        entry_point_name=ENTRY_POINT_CALC_JOB,
+        computer=fixture_localhost,
+        test_name="gaas/seedname_aiida",
+        inputs=inputs,
+    )
+    parser = generate_parser(ENTRY_POINT_PARSER)
+    results, calcfunction = parser.parse_from_node(
+        node, store_provenance=False, retrieved_temporary_folder=str(tmp_path)
+    )
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    energies = results["fermi_surface"].get_array("energies")
+    assert energies.dtype == "float32"
+    assert energies.tolist() == [[[[1.0]], [[2.0]]]]
+
+
+def test_band_projections(
+    fixture_localhost,
+    generate_calc_job_node,
+    generate_parser,
+    generate_win_params_o2sr,
+    shared_datadir,
+    tmp_path,
+):
+    """Check the parsing of the _band_proj.dat file, with the layout of the _band.dat file."""
+    with open(
+        shared_datadir / "o2sr" / "band_new" / "aiida_band.dat", encoding="utf-8"
+    ) as handle:
+        band_dat = handle.readlines()
+    # The weight is the index of the line, modulo 100
+    (tmp_path / "aiida_band_proj.dat").write_text(
+        "".join(
+            f"{line.rstrip()}{(idx % 100) / 100:8.4f}\n" if line.strip() else line
+            for idx, line in enumerate(band_dat)
+        ),
+        encoding="utf-8",
+    )
+    inputs = generate_win_params_o2sr()
+    inputs["settings"] = orm.Dict(
+        {"parser_options": {"band_projections_dtype": "float32"}}
+    )
+    node = generate_calc_job_node(
+        entry_point_name=ENTRY_POINT_CALC_JOB,
+        computer=fixture_localhost,
+        test_name="o2sr/band_new",
+        inputs=inputs,
+    )
+    parser = generate_parser(ENTRY_POINT_PARSER)
+    results, calcfunction = parser.parse_from_node(
+        node, store_provenance=False, retrieved_temporary_folder=str(tmp_path)
+    )
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    projections = results["band_projections"].get_array("projections")
+    assert projections.shape == results["interpolated_bands"].get_bands().shape
+    assert projections.dtype == "float32"
+    # Second k-point of the second band: line 1 of the second block (607 k-points + empty line)
+    assert projections[1, 1] == projections.dtype.type(((607 + 1 + 1) % 100) / 100)
+
+
+def test_wannier_plots(
+    fixture_localhost,
+    generate_calc_job_node,
+    generate_parser,
+    generate_win_params_gaas,
+    tmp_path,
+):
+    """Check the parsing of the plots of the Wannier functions into the `wannier_plots` namespace."""
+    for index in (1, 2):
+        (tmp_path / f"aiida_{index:05d}.xsf").write_text(
+            "      BEGIN_BLOCK_DATAGRID_3D\n        3D_field\n"
+            "        BEGIN_DATAGRID_3D_UNKNOWN\n"
+            "           2           2           1\n"
+            "   0.0 0.0 0.0\n   1.0 0.0 0.0\n   0.0 1.0 0.0\n   0.0 0.0 1.0\n"
+            f"  {index}.0 2.0 3.0 4.0\n"
+            "        END_DATAGRID_3D\n      END_BLOCK_DATAGRID_3D\n",
+            encoding="utf-8",
+        )
+    inputs = generate_win_params_gaas()
+    inputs["settings"] = orm.Dict({"parser_options": {"wannier_plot_dtype": "float32"}})
+    node = generate_calc_job_node(
+        entry_point_name=ENTRY_POINT_CALC_JOB,
+        computer=fixture_localhost,
+        test_name="gaas/seedname_aiida",
+        inputs=inputs,
+    )
+    parser = generate_parser(ENTRY_POINT_PARSER)
+    results, calcfunction = parser.parse_from_node(
+        node, store_provenance=False, retrieved_temporary_folder=str(tmp_path)
+    )
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    assert sorted(results["wannier_plots"]) == ["wf_00001", "wf_00002"]
+    data = results["wannier_plots"]["wf_00002"].get_array("data")
+    assert data.dtype == "float32"
+    # The first index runs fastest in the .xsf files
+    assert data.tolist() == [[[2.0], [3.0]], [[2.0], [4.0]]]
+
+
+def test_checkpoint(
+    fixture_localhost,
+    generate_calc_job_node,
+    generate_parser,
+    generate_win_params_gaas,
+    tmp_path,
+):
+    """Check the parsing of the temporarily retrieved .chk file into the `checkpoint` output."""
+    import pathlib
+    import shutil
+
+    # The same checkpoint file as for the tests of the reader
+    shutil.copy(
+        pathlib.Path(__file__).parent.parent / "io" / "data" / "aiida.chk", tmp_path
+    )
+    node = generate_calc_job_node(
+        entry_point_name=ENTRY_POINT_CALC_JOB,
+        computer=fixture_localhost,
+        test_name="gaas/seedname_aiida",
+        inputs=generate_win_params_gaas(),
+    )
+    parser = generate_parser(ENTRY_POINT_PARSER)
+    results, calcfunction = parser.parse_from_node(
+        node, store_provenance=False, retrieved_temporary_folder=str(tmp_path)
+    )
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    checkpoint = results["checkpoint"]
+    assert "m_matrix" not in checkpoint.get_arraynames()
+    assert checkpoint.get_array("num_wann") == 2
+    assert checkpoint.get_array("checkpoint") == "postwann"
+    assert checkpoint.get_array("u_matrix").shape == (2, 2, 2)
+    assert checkpoint.get_array("wannier_spreads").tolist() == [1.5, 2.5]
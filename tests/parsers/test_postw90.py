@@ -0,0 +1,342 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Tests for the `Postw90Parser`."""
+import io
+
+import numpy as np
+import pytest
+
+from aiida import orm
+
+
+@pytest.mark.parametrize(
+    "suffix, parser_name, column_names",
+    (
+        (
+            "elcond",
+            "raw_elcond_dat_parser",
+            ["Mu", "Temp"] + [f"ElCond_{i}" for i in "xx xy yy xz yz zz".split()],
+        ),
+        (
+            "kappa",
+            "raw_kappa_dat_parser",
+            ["Mu", "Temp"] + [f"Kappa_{i}" for i in "xx xy yy xz yz zz".split()],
+        ),
+        (
+            "seebeck",
+            "raw_seebeck_dat_parser",
+            ["Mu", "Temp"]
+            + [f"Seebeck_{i}" for i in "xx xy xz yx yy yz zx zy zz".split()],
+        ),
+        (
+            "sigmas",
+            "raw_sigmas_dat_parser",
+            ["Mu", "Temp"] + [f"SigmaS_{i}" for i in "xx xy yy xz yz zz".split()],
+        ),
+        (
+            "tdf",
+            "raw_tdf_dat_parser",
+            ["Energy"] + [f"TDF_{i}" for i in "xx xy yy xz yz zz".split()],
+        ),
+    ),
+)
+def test_boltzwann_tables(shared_datadir, suffix, parser_name, column_names):
+    """Test the parsers of the BoltzWann tables against `np.loadtxt`."""
+    from aiida_wannier90.parsers import postw90
+
+    filepath = shared_datadir / "boltzwann" / f"aiida_{suffix}.dat"
+    with open(filepath, encoding="utf-8") as handle:
+        table, names, attrs = getattr(postw90, parser_name)(handle)
+
+    assert names == column_names
+    np.testing.assert_array_equal(table, np.loadtxt(filepath))
+    assert all(key.endswith("_unit") for key in attrs if key != "spin_decomposition")
+
+
+def test_boltzwann_table_columns():
+    """Test the detection of the column names, and the naming of the extra columns."""
+    from aiida_wannier90.parsers.postw90 import _load_dat_table
+
+    content = (
+        "# Written by the BoltzWann module of the Wannier90 code.\n"
+        "# Mu(eV) Temp(K) (Sigma*S)_xx\n"
+        "  0.1E+00  0.3E+03  1.0 2.0\n  0.2E+00  0.3E+03  3.0 4.0\n"
+    )
+    table, names = _load_dat_table(io.StringIO(content), ["A", "B", "C"])
+    assert names == ["Mu", "Temp", "SigmaS_xx", "column_3"]
+    np.testing.assert_array_equal(table[:, 3], [2.0, 4.0])
+
+    # Without a line of column names, the default ones are used
+    table, names = _load_dat_table(
+        io.StringIO("# Some text, without names.\n 1 2 3\n"), ["A", "B", "C"]
+    )
+    assert names == ["A", "B", "C"]
+    assert table.shape == (1, 3)
+
+    with pytest.raises(ValueError):
+        _load_dat_table(io.StringIO("# A B C\n 1 2\n"), ["A", "B", "C"])
+
+
+def test_tdf_spin_decomposition(shared_datadir):
+    """Test the naming of the spin-decomposed columns of the _tdf.dat file, and their tensors."""
+    from aiida_wannier90.parsers.postw90 import _get_table_tensors, raw_tdf_dat_parser
+
+    filepath = shared_datadir / "boltzwann" / "aiida_tdf.dat"
+    with open(filepath, encoding="utf-8") as handle:
+        assert not raw_tdf_dat_parser(handle)[2]["spin_decomposition"]
+
+    # Append the spin up and down components, with values + 100 and + 200
+    header = "".join(
+        line for line in filepath.read_text().splitlines(True) if line.startswith("#")
+    )
+    table = np.loadtxt(filepath)
+    stream = io.StringIO()
+    stream.write(header)
+    np.savetxt(stream, np.hstack((table, table[:, 1:] + 100, table[:, 1:] + 200)))
+    stream.seek(0)
+    tdf, names, attrs = raw_tdf_dat_parser(stream)
+
+    assert attrs["spin_decomposition"]
+    assert tdf.shape == (5, 19)
+    assert names[7:] == [
+        f"TDF_{spin}_{component}"
+        for spin in ("up", "down")
+        for component in ("xx", "xy", "yy", "xz", "yz", "zz")
+    ]
+    arrays = _get_table_tensors(tdf, names)
+    assert sorted(arrays) == ["TDF", "TDF_down", "TDF_up", "energy"]
+    np.testing.assert_allclose(arrays["TDF_up"], arrays["TDF"] + 100)
+    np.testing.assert_allclose(arrays["TDF_down"], arrays["TDF"] + 200)
+
+
+def test_boltzdos(shared_datadir):
+    """Test the parser of the _boltzdos.dat file."""
+    from aiida_wannier90.parsers.postw90 import raw_boltzdos_dat_parser
+
+    with open(
+        shared_datadir / "boltzwann" / "aiida_boltzdos.dat", encoding="utf-8"
+    ) as handle:
+        energy_dos, attrs = raw_boltzdos_dat_parser(handle)
+
+    assert energy_dos.shape == (5, 2)
+    np.testing.assert_array_equal(energy_dos[:, 1], [0, 2, 4, 6, 8])
+    assert attrs["fixed_smearing_width"] == 0.03
+    assert attrs["cell_volume"] == 16.87
+
+
+@pytest.fixture
+def generate_boltzwann_node(fixture_localhost, generate_calc_job_node):
+    """Return a `Postw90Calculation` node with the retrieved BoltzWann outputs."""
+
+    def _generate_boltzwann_node(parser_options=None, parameters=None):
+        inputs = {"parameters": orm.Dict({"boltzwann": True, **(parameters or {})})}
+        if parser_options is not None:
+            inputs["settings"] = orm.Dict({"parser_options": parser_options})
+        node = generate_calc_job_node(
+            entry_point_name="wannier90.postw90",
+            computer=fixture_localhost,
+            test_name="boltzwann",
+            inputs=inputs,
+        )
+        node.set_retrieve_temporary_list(
+            [f"aiida_{suffix}.dat" for suffix in ("boltzdos",) + SUFFIXES]
+        )
+        return node
+
+    return _generate_boltzwann_node
+
+
+SUFFIXES = ("elcond", "kappa", "seebeck", "sigmas", "tdf")
+
+
+def test_boltzwann_flat(shared_datadir, generate_boltzwann_node, generate_parser):
+    """Test the flat layout of the BoltzWann outputs, with one array per column."""
+    parser = generate_parser("wannier90.postw90")
+    results, calcfunction = parser.parse_from_node(
+        generate_boltzwann_node(),
+        store_provenance=False,
+        retrieved_temporary_folder=str(shared_datadir / "boltzwann"),
+    )
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    assert results["output_parameters"]["kmesh_boltzwann"] == [40, 40, 40]
+    elcond = results["boltzwann"]["elcond"]
+    assert elcond.base.attributes.get("layout") == "flat"
+    assert elcond.get_array("ElCond_xy").tolist() == pytest.approx(
+        [2e5, 1.2e6, 2.2e6, 3.2e6, 4.2e6, 5.2e6]
+    )
+    assert "Seebeck_zy" in results["boltzwann"]["seebeck"].get_arraynames()
+
+
+def test_boltzwann_tensor(shared_datadir, generate_boltzwann_node, generate_parser):
+    """Test the tensor layout of the BoltzWann outputs."""
+    parser = generate_parser("wannier90.postw90")
+    results, calcfunction = parser.parse_from_node(
+        generate_boltzwann_node({"boltzwann_layout": "tensor"}),
+        store_provenance=False,
+        retrieved_temporary_folder=str(shared_datadir / "boltzwann"),
+    )
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    elcond = results["boltzwann"]["elcond"]
+    assert elcond.base.attributes.get("layout") == "tensor"
+    assert elcond.base.attributes.get("temperature_unit") == "K"
+    assert elcond.get_array("mu").tolist() == pytest.approx([-0.1, 0, 0.1])
+    assert elcond.get_array("temperature").tolist() == [300, 400]
+    tensor = elcond.get_array("ElCond")
+    assert tensor.shape == (3, 2, 3, 3)
+    # The row of mu = 0.1, T = 400 K, with the components xx xy yy xz yz zz
+    flat_row = 1e5 * (1 + 10 * 5 + np.arange(6))
+    np.testing.assert_allclose(
+        tensor[2, 1][np.triu_indices(3)], flat_row[[0, 1, 3, 2, 4, 5]]
+    )
+    np.testing.assert_array_equal(tensor, tensor.swapaxes(-1, -2))
+
+    seebeck = results["boltzwann"]["seebeck"].get_array("Seebeck")
+    np.testing.assert_allclose(
+        seebeck[0, 1].ravel(), 1e-6 * (1 + 10 * 3 + np.arange(9))
+    )
+
+    tdf = results["boltzwann"]["tdf"]
+    assert tdf.get_array("energy").shape == (5,)
+    assert tdf.get_array("TDF").shape == (5, 3, 3)
+
+
+@pytest.mark.parametrize("num_workers", (1, 3))
+def test_boltzwann_workers(
+    shared_datadir, generate_boltzwann_node, generate_parser, num_workers
+):
+    """Test that the outputs do not depend on the number of workers parsing the files."""
+    parser = generate_parser("wannier90.postw90")
+    node = generate_boltzwann_node(
+        {"boltzwann_workers": num_workers}, {"boltz_calc_also_dos": True}
+    )
+    results, calcfunction = parser.parse_from_node(
+        node,
+        store_provenance=False,
+        retrieved_temporary_folder=str(shared_datadir / "boltzwann"),
+    )
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    # The outputs are attached in the order of the files
+    assert list(results["boltzwann"]) == ["boltzdos", *SUFFIXES]
+    assert results["boltzwann"]["boltzdos"].get_x()[1].tolist() == pytest.approx(
+        np.linspace(-1, 1, 5)
+    )
+
+
+def test_boltzwann_missing_file(
+    shared_datadir, tmp_path, generate_boltzwann_node, generate_parser
+):
+    """Test that the outputs of the files before a missing one are still attached."""
+    for suffix in SUFFIXES[:2]:
+        filename = f"aiida_{suffix}.dat"
+        (tmp_path / filename).write_text(
+            (shared_datadir / "boltzwann" / filename).read_text()
+        )
+    parser = generate_parser("wannier90.postw90")
+    results, calcfunction = parser.parse_from_node(
+        generate_boltzwann_node({"boltzwann_workers": 2}),
+        store_provenance=False,
+        retrieved_temporary_folder=str(tmp_path),
+    )
+
+    assert calcfunction.exit_status == 405
+    assert sorted(results["boltzwann"]) == ["elcond", "kappa"]
+
+
+@pytest.mark.parametrize("mu_inner", (True, False))
+def test_boltzwann_tensors_order(mu_inner):
+    """Test that the order of the loops over Mu and Temp is detected from the data."""
+    from aiida_wannier90.parsers.postw90 import _get_table_tensors
+
+    mu_vals, temp_vals = np.meshgrid([0.0, 0.5, 1.0], [100.0, 200.0], indexing="xy")
+    if not mu_inner:
+        mu_vals, temp_vals = mu_vals.T, temp_vals.T
+    mu_vals, temp_vals = mu_vals.ravel(), temp_vals.ravel()
+    table = np.column_stack((mu_vals, temp_vals, mu_vals * temp_vals))
+    arrays = _get_table_tensors(table, ["Mu", "Temp", "ElCond_xx"])
+
+    assert arrays["mu"].tolist() == [0.0, 0.5, 1.0]
+    assert arrays["temperature"].tolist() == [100.0, 200.0]
+    np.testing.assert_array_equal(
+        arrays["ElCond"][..., 0, 0], np.outer([0.0, 0.5, 1.0], [100.0, 200.0])
+    )
+    # Only the xx component is in the table
+    assert np.isnan(arrays["ElCond"][..., 1, 1]).all()
+
+    with pytest.raises(ValueError):
+        _get_table_tensors(table[:-1], ["Mu", "Temp", "ElCond_xx"])
+
+
+def test_berry_gyrotropic(
+    fixture_localhost, generate_calc_job_node, generate_parser, shared_datadir
+):
+    """Test the parsing of the outputs of the berry and gyrotropic modules."""
+    parameters = {
+        "berry": True,
+        "berry_task": "ahc morb kubo shc",
+        "shc_freq_scan": True,
+        "shc_alpha": 3,
+        "gyrotropic": True,
+    }
+    node = generate_calc_job_node(
+        entry_point_name="wannier90.postw90",
+        computer=fixture_localhost,
+        test_name="berry",
+        inputs={"parameters": orm.Dict(parameters)},
+    )
+    node.set_retrieve_temporary_list(["aiida-*.dat"])
+    parser = generate_parser("wannier90.postw90")
+    results, calcfunction = parser.parse_from_node(
+        node,
+        store_provenance=False,
+        retrieved_temporary_folder=str(shared_datadir / "berry"),
+    )
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    berry = results["berry"]
+    assert sorted(berry) == ["ahc", "kubo", "morb", "shc_fermiscan", "shc_freqscan"]
+
+    ahc = berry["ahc"].get_array("ahc")
+    assert berry["ahc"].get_array("fermi_energy").tolist() == [-0.5, 0, 0.5]
+    assert ahc.shape == (3, 3, 3)
+    # The x, y, z components are sigma_yz, sigma_zx, sigma_xy
+    assert ahc[1, 1, 2] == ahc[1, 2, 0] - 1 == ahc[1, 0, 1] - 2 == 11
+    np.testing.assert_array_equal(ahc, -ahc.swapaxes(1, 2))
+    assert berry["morb"].get_array("morb")[2].tolist() == [21, 22, 23]
+
+    kubo = berry["kubo"]
+    assert kubo.get_array("omega").tolist() == [0, 0.5, 1, 1.5]
+    symmetric = kubo.get_array("sigma_symmetric")
+    antisymmetric = kubo.get_array("sigma_antisymmetric")
+    assert symmetric.shape == antisymmetric.shape == (4, 3, 3)
+    # S_xy is the 4th file, A_xy the 9th, see the fixtures
+    assert symmetric[2, 0, 1] == symmetric[2, 1, 0] == 302 - 302j
+    assert antisymmetric[2, 0, 1] == -antisymmetric[2, 1, 0] == 802 - 802j
+    assert np.all(np.diagonal(antisymmetric, axis1=1, axis2=2) == 0)
+    assert kubo.get_array("jdos").tolist() == [0, 0.25, 0.5, 0.75]
+
+    shc = berry["shc_freqscan"]
+    assert shc.get_array("shc").tolist() == [50, 51 - 1j, 52 - 2j, 53 - 3j]
+    assert shc.base.attributes.get("shc_alpha") == 3
+    assert shc.base.attributes.get("shc_gamma") == 3
+    assert berry["shc_fermiscan"].get_array("shc").tolist() == [100, 101, 102]
+
+    gyrotropic = results["gyrotropic"]
+    assert sorted(gyrotropic) == ["D", "K_orb"]
+    k_orb = gyrotropic["K_orb"]
+    assert k_orb.get_array("fermi_energy").tolist() == [0, 0.1]
+    assert k_orb.get_array("omega").tolist() == [0, 0.5, 1]
+    tensor = k_orb.get_array("K_orb")
+    assert tensor.shape == (2, 3, 3, 3)
+    # The row of EFERMI = 0.1, omega = 0.5, with the components xx yy zz xy xz yz
+    assert tensor[1, 1].tolist() == [[400, 403, 404], [403, 401, 405], [404, 405, 402]]
+    assert k_orb.get_array("K_orb_z")[1, 1] == 408
+    assert gyrotropic["D"].get_array("D").shape == (2, 3, 3)
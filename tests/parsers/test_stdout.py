@@ -0,0 +1,83 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Test the checks on the stdout shared by the parsers."""
+import io
+
+import pytest
+
+from aiida_wannier90.parsers._stdout import check_stdout_tail, read_tail_lines
+
+COMPLETED_LINES = ("Exiting... aiida.nnkp written.", "All done: wannier90 exiting")
+
+
+@pytest.mark.parametrize(
+    "test_name,expected",
+    (
+        ("gaas/seedname_aiida", None),
+        ("restart", None),
+        ("output_stdout_incomplete", "ERROR_OUTPUT_STDOUT_INCOMPLETE"),
+        ("HK", "ERROR_DISENTANGLEMENT_NOT_ENOUGH_STATES"),
+        ("br2fe", "ERROR_BVECTORS"),
+        ("ca4mg8", "ERROR_BVECTORS"),
+        ("plot_wf_cube", "ERROR_PLOT_WF_CUBE"),
+    ),
+)
+def test_check_stdout_tail(shared_datadir, test_name, expected):
+    """Check that the end of the stdout is enough to identify incomplete outputs."""
+    with open(shared_datadir / test_name / "aiida.wout", "rb") as handle:
+        assert check_stdout_tail(handle, COMPLETED_LINES) == expected
+
+
+def test_check_stdout_tail_full_scan():
+    """Check that an error far from the end of an incomplete stdout is still found."""
+    content = (
+        b" kmesh_get_bvector: Not enough bvectors found\n"
+        + b" output of another process\n" * 1000
+    )
+
+    handle = io.BytesIO(content)
+    assert check_stdout_tail(handle, COMPLETED_LINES) == "ERROR_BVECTORS"
+    # The handle is not closed by the scan
+    assert not handle.closed
+
+
+def test_read_tail_lines():
+    """Check that only the complete lines at the end of the file are returned."""
+    content = b"".join(f"line {idx}\n".encode() for idx in range(10000))
+
+    lines = read_tail_lines(io.BytesIO(content), num_bytes=25)
+    assert lines == ["line 9998", "line 9999"]
+
+    assert not read_tail_lines(io.BytesIO(b""))
+
+
+@pytest.mark.parametrize("chunk_size", (7, 1024))
+def test_iter_lines(shared_datadir, chunk_size):
+    """Check that the lines are returned unchanged, and errors are found across chunks."""
+    from aiida_wannier90.parsers._stdout import StdoutErrors
+
+    filepath = shared_datadir / "plot_wf_cube" / "aiida.wout"
+    with open(filepath, encoding="utf-8") as handle:
+        stdout_errors = StdoutErrors()
+        lines = list(stdout_errors.iter_lines(handle, chunk_size=chunk_size))
+    with open(filepath, encoding="utf-8") as handle:
+        assert lines == handle.readlines()
+
+    assert stdout_errors.error == "ERROR_PLOT_WF_CUBE"
+    assert stdout_errors.exiting
+
+
+def test_find_stdout_errors():
+    """Check that the messages are mapped to the exit codes, in order."""
+    from aiida_wannier90.parsers._stdout import find_stdout_errors
+
+    assert not find_stdout_errors("All done: wannier90 exiting\n")
+    assert find_stdout_errors(
+        " Exiting.......\n kmesh_get_bvector: Not enough bvectors found\n"
+    ) == ("ERROR_EXITING_MESSAGE_IN_STDOUT", "ERROR_BVECTORS")
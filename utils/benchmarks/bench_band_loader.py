@@ -0,0 +1,59 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Loading of a large _band.dat file: ``np.genfromtxt`` on the lines vs. the bulk loader."""
+import io
+import time
+
+import numpy as np
+
+from aiida_wannier90.parsers.wannier90 import _load_table
+
+NUM_BANDS = 50
+NUM_KPOINTS = 100_000  # 5M lines in total
+
+
+def make_band_dat():
+    """Return the content of a synthetic _band.dat file, in the format written by Wannier90."""
+    xvals = np.linspace(0, 10, NUM_KPOINTS)
+    stream = io.StringIO()
+    for band_idx in range(NUM_BANDS):
+        energies = np.sin(xvals + band_idx) + band_idx
+        np.savetxt(stream, np.column_stack((xvals, energies)), fmt="%16.8E")
+        stream.write("\n")
+    return stream.getvalue()
+
+
+def load_genfromtxt(content):
+    """Load the bands as done before, from the list of lines."""
+    lines = io.StringIO(content).readlines()
+    return np.genfromtxt(lines, usecols=1)
+
+
+def load_bulk(content):
+    """Load the bands with the bulk loader."""
+    return _load_table(content, num_columns=2)[:, 1]
+
+
+def main():
+    """Run the benchmark."""
+    content = make_band_dat()
+    print(f"{content.count(chr(10))} lines, {len(content) / 1e6:.0f} MB")
+    results = {}
+    for name, function in (
+        ("np.genfromtxt", load_genfromtxt),
+        ("_load_table", load_bulk),
+    ):
+        start = time.perf_counter()
+        results[name] = function(content)
+        print(f"{name:>14}: {time.perf_counter() - start:8.2f} s")
+    np.testing.assert_array_equal(results["np.genfromtxt"], results["_load_table"])
+
+
+if __name__ == "__main__":
+    main()
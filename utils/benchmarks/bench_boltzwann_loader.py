@@ -0,0 +1,81 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Loading of a large BoltzWann _seebeck.dat file: per-line parsing and ``np.loadtxt`` vs. the bulk loader.
+
+Note that ``np.loadtxt`` is implemented in C only since numpy 1.23; with older versions
+it parses the file line by line in Python, as the first function below.
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from aiida_wannier90.parsers.postw90 import raw_seebeck_dat_parser
+
+NUM_MU = 10_000
+NUM_TEMP = 100  # 1M lines, 11 columns
+
+HEADER = """# Written by the BoltzWann module of the Wannier90 code.
+# [Seebeck coefficient in SI units, i.e. in V/K]
+# Mu(eV) Temp(K) Seebeck_xx Seebeck_xy Seebeck_xz Seebeck_yx Seebeck_yy Seebeck_yz Seebeck_zx Seebeck_zy Seebeck_zz
+"""
+
+
+def write_seebeck_dat(filepath):
+    """Write a synthetic _seebeck.dat file, in the format written by BoltzWann."""
+    mu_vals, temp_vals = np.meshgrid(
+        np.linspace(-1, 1, NUM_MU), np.linspace(100, 1000, NUM_TEMP)
+    )
+    components = np.random.default_rng(0).normal(size=(NUM_MU * NUM_TEMP, 9))
+    table = np.column_stack((mu_vals.ravel(), temp_vals.ravel(), components))
+    with open(filepath, "w", encoding="utf-8") as handle:
+        handle.write(HEADER)
+        np.savetxt(handle, table, fmt="%19.10E")
+
+
+def load_lines(filepath):
+    """Load the table line by line, skipping the comment lines."""
+    with open(filepath, encoding="utf-8") as handle:
+        rows = [line.split() for line in handle if not line.startswith("#")]
+    return np.array(rows, dtype=float)
+
+
+def load_loadtxt(filepath):
+    """Load the table with ``np.loadtxt``, skipping the comment lines."""
+    return np.loadtxt(filepath)
+
+
+def load_bulk(filepath):
+    """Load the table with the BoltzWann loader."""
+    with open(filepath, encoding="utf-8") as handle:
+        return raw_seebeck_dat_parser(handle)[0]
+
+
+def main():
+    """Run the benchmark."""
+    with tempfile.TemporaryDirectory() as dirname:
+        filepath = os.path.join(dirname, "aiida_seebeck.dat")
+        write_seebeck_dat(filepath)
+        print(f"{NUM_MU * NUM_TEMP} lines, {os.path.getsize(filepath) / 1e6:.0f} MB")
+        results = {}
+        for name, function in (
+            ("per line", load_lines),
+            ("np.loadtxt", load_loadtxt),
+            ("bulk loader", load_bulk),
+        ):
+            start = time.perf_counter()
+            results[name] = function(filepath)
+            print(f"{name:>12}: {time.perf_counter() - start:8.2f} s")
+    for name in ("per line", "np.loadtxt"):
+        np.testing.assert_array_equal(results[name], results["bulk loader"])
+
+
+if __name__ == "__main__":
+    main()
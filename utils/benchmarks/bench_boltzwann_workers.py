@@ -0,0 +1,60 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Parsing of the five BoltzWann tables of a large grid, with an increasing number of threads."""
+from concurrent.futures import ThreadPoolExecutor
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from aiida_wannier90.parsers.postw90 import _BOLTZWANN_TABLES, _read_boltzwann_file
+
+NUM_MU = 5_000
+NUM_TEMP = 100  # 500k lines per file
+
+
+def write_table(filepath, num_columns):
+    """Write a synthetic BoltzWann table, with a header without column names."""
+    mu_vals, temp_vals = np.meshgrid(
+        np.linspace(-1, 1, NUM_MU), np.linspace(100, 1000, NUM_TEMP)
+    )
+    components = np.random.default_rng(0).normal(
+        size=(NUM_MU * NUM_TEMP, num_columns - 2)
+    )
+    with open(filepath, "w", encoding="utf-8") as handle:
+        handle.write("# Written by the BoltzWann module of the Wannier90 code.\n")
+        np.savetxt(
+            handle,
+            np.column_stack((mu_vals.ravel(), temp_vals.ravel(), components)),
+            fmt="%19.10E",
+        )
+
+
+def main():
+    """Run the benchmark."""
+    with tempfile.TemporaryDirectory() as dirname:
+        filepaths, raw_parsers = [], []
+        for suffix, raw_parser, _ in _BOLTZWANN_TABLES:
+            filepaths.append(os.path.join(dirname, f"aiida{suffix}"))
+            raw_parsers.append(raw_parser)
+            # The _tdf.dat file has a single axis, the others a (Mu, Temp) grid
+            write_table(filepaths[-1], 11 if suffix == "_seebeck.dat" else 8)
+        print(f"{len(filepaths)} files, {NUM_MU * NUM_TEMP} lines each")
+
+        for num_workers in (1, 2, 4, len(filepaths)):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                list(executor.map(_read_boltzwann_file, filepaths, raw_parsers))
+            print(f"{num_workers:>2} workers: {time.perf_counter() - start:8.2f} s")
+    print(f"({os.cpu_count()} CPUs available)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Scaling of the label matching of the legacy band parser with the length of the path."""
+import time
+
+import numpy as np
+
+from aiida_wannier90.parsers.wannier90 import _find_special_points
+
+NUM_LABELS = 12
+
+
+def find_pairwise(kpoints, point_coords):
+    """Match the labels with one ``np.isclose`` per (label, k-point) pair, as done before."""
+    labels = [
+        (i, k)
+        for k in point_coords
+        for i in range(len(kpoints))
+        if all(np.isclose(point_coords[k], kpoints[i], rtol=0, atol=1.0e-5))
+    ]
+    labels.sort()
+    return labels
+
+
+def make_path(num_kpoints):
+    """Return a path through random special points with about ``num_kpoints`` k-points."""
+    rng = np.random.default_rng(42)
+    corners = np.round(rng.random((NUM_LABELS, 3)) - 0.5, 6)
+    point_coords = {f"K{idx}": coords.tolist() for idx, coords in enumerate(corners)}
+    num_segment = num_kpoints // (NUM_LABELS - 1)
+    segments = [
+        np.linspace(start, stop, num_segment, endpoint=False)
+        for start, stop in zip(corners[:-1], corners[1:])
+    ]
+    kpoints = np.round(np.concatenate(segments + [corners[-1:]]), 6)
+    return kpoints, point_coords
+
+
+def main():
+    """Run the benchmark."""
+    for num_kpoints in (1_000, 10_000, 100_000):
+        kpoints, point_coords = make_path(num_kpoints)
+        timings = []
+        for function in (find_pairwise, _find_special_points):
+            if function is find_pairwise and num_kpoints > 10_000:
+                timings.append(float("nan"))
+                continue
+            start = time.perf_counter()
+            labels = function(kpoints, point_coords)
+            timings.append(time.perf_counter() - start)
+        assert len(labels) == NUM_LABELS
+        print(
+            f"{num_kpoints:>8} k-points: pairwise {timings[0]:8.3f} s, "
+            f"vectorized {timings[1]:8.4f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Per-line cost of looking for error messages in the stdout."""
+import io
+import timeit
+
+from aiida_wannier90.parsers._stdout import STDOUT_ERROR_SIGNATURES, StdoutErrors
+
+# A typical line of a verbose .wout, i.e. an iteration of the wannierisation
+LINE = (
+    "    123    -0.940E+01     1.6567832715       49.5208508372       0.13  <-- CONV\n"
+)
+NUM_LINES = 500_000
+
+
+def scan_separate_checks(content):
+    """Look for each message in each line with a separate ``in`` check, as done before the table."""
+    messages = [message for message, _ in STDOUT_ERROR_SIGNATURES]
+    for line in io.StringIO(content):
+        for message in messages:
+            if message in line:
+                break
+
+
+def scan_table(content):
+    """Look for the messages with the table of signatures, while iterating over the lines."""
+    stdout_errors = StdoutErrors()
+    for _ in stdout_errors.iter_lines(io.StringIO(content)):
+        pass
+
+
+def iterate_only(content):
+    """Only iterate over the lines, as a reference."""
+    for _ in io.StringIO(content):
+        pass
+
+
+def main():
+    """Run the benchmark."""
+    content = LINE * NUM_LINES
+    for name, function in (
+        ("line iteration only", iterate_only),
+        ("separate `in` checks", scan_separate_checks),
+        ("signature table", scan_table),
+    ):
+        seconds = min(
+            timeit.repeat(
+                lambda function=function: function(content), number=1, repeat=5
+            )
+        )
+        print(f"{name:>22}: {seconds / NUM_LINES * 1e9:8.1f} ns/line")
+
+
+if __name__ == "__main__":
+    main()
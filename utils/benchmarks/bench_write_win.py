@@ -0,0 +1,123 @@
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+"""Throughput and peak memory of ``write_win`` for dense k-point meshes and large supercells.
+
+The nodes are created in a temporary in-memory profile, so that no configured
+AiiDA profile is needed.
+"""
+import copy
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from aiida import load_profile
+from aiida.storage.sqlite_temp import SqliteTempBackend
+
+NUM_REPETITIONS = 3
+
+
+def format_atoms_cart_per_row(structure):
+    """Format the ``atoms_cart`` block one site at a time, as done before."""
+
+    def list2str(list_item):
+        list_item = copy.deepcopy(list_item)
+        return " " + " ".join([f"{_:18.10f}" for _ in list_item]) + " "
+
+    return ["ang"] + [
+        f"{site.kind_name}  {list2str(site.position)}" for site in structure.sites
+    ]
+
+
+def format_kpoints_per_row(kpoints):
+    """Format the ``kpoints`` block one k-point at a time, as done before."""
+    all_kpoints = kpoints.get_kpoints_mesh(print_list=True)
+    return [f"{k[0]:18.10f} {k[1]:18.10f} {k[2]:18.10f}" for k in all_kpoints]
+
+
+def make_inputs(mesh, supercell):
+    """Return the inputs of ``write_win`` for a GaAs supercell and a k-point mesh."""
+    from aiida.orm import KpointsData, StructureData
+
+    alat = 5.65
+    cell = np.array([[-0.5, 0, 0.5], [0, 0.5, 0.5], [-0.5, 0.5, 0]]) * alat
+    structure = StructureData(cell=(cell * supercell).tolist())
+    for shift in np.ndindex(supercell, supercell, supercell):
+        origin = np.dot(shift, cell)
+        structure.append_atom(position=origin.tolist(), symbols="Ga")
+        structure.append_atom(position=(origin + alat / 4).tolist(), symbols="As")
+    kpoints = KpointsData()
+    kpoints.set_kpoints_mesh([mesh] * 3)
+    return {
+        "parameters": {"num_wann": 8, "num_iter": 100},
+        "structure": structure,
+        "kpoints": kpoints,
+    }
+
+
+def best_time(function, *args, **kwargs):
+    """Return the best time of ``NUM_REPETITIONS`` calls of ``function``."""
+    timings = []
+    for _ in range(NUM_REPETITIONS):
+        start = time.perf_counter()
+        function(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    """Run the benchmark."""
+    from aiida_wannier90.io import win_block_cache_info, write_win
+    from aiida_wannier90.io._write_win import _format_atoms_cart, _format_kpoints
+
+    load_profile(SqliteTempBackend.create_profile(), allow_switch=True)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, "aiida.win")
+        for mesh, supercell in ((4, 1), (10, 5), (20, 8)):
+            inputs = make_inputs(mesh, supercell)
+            assert format_kpoints_per_row(inputs["kpoints"]) == list(
+                _format_kpoints(inputs["kpoints"])
+            )
+            assert format_atoms_cart_per_row(inputs["structure"]) == list(
+                _format_atoms_cart(inputs["structure"])
+            )
+            per_row = best_time(format_kpoints_per_row, inputs["kpoints"]) + best_time(
+                format_atoms_cart_per_row, inputs["structure"]
+            )
+            bulk = best_time(
+                lambda kpoints: list(_format_kpoints(kpoints)), inputs["kpoints"]
+            ) + best_time(
+                lambda structure: list(_format_atoms_cart(structure)),
+                inputs["structure"],
+            )
+            total = best_time(write_win, filename, **inputs)
+            size = os.path.getsize(filename) / 1024**2
+            tracemalloc.start()
+            write_win(filename, **inputs)
+            peak = tracemalloc.get_traced_memory()[1] / 1024**2
+            tracemalloc.stop()
+            # The blocks of stored nodes are reused from the block cache
+            inputs["structure"].store()
+            inputs["kpoints"].store()
+            write_win(filename, **inputs)
+            cached = best_time(write_win, filename, **inputs)
+            print(
+                f"{mesh:>2}^3 k-points, {len(inputs['structure'].sites):>5} atoms: "
+                f"blocks per row {per_row:7.3f} s, in bulk {bulk:7.3f} s; "
+                f"write_win {total:7.3f} s ({size / total:6.1f} MB/s, "
+                f"peak memory {peak:6.2f} MB for a {size:6.2f} MB file), "
+                f"with cached blocks {cached:7.3f} s"
+            )
+        print(win_block_cache_info())
+
+
+if __name__ == "__main__":
+    main()